@@ -0,0 +1,280 @@
+"""
+Микробенчмарки построения и сериализации страниц без обращений к бэкенду
+
+Для каждого случая и размера данных (10 - 100000 строк) измеряется время
+построения компонентов, время сериализации ответа FastUI и пиковый объем
+выделенной памяти (tracemalloc) в пересчете на одну строку.
+
+Запуск: python benchmarks/bench_render.py [--rows 10,100,1000,10000,100000] [--repeat 3]
+
+Проверка регрессий относительно сохраненных результатов:
+    python benchmarks/bench_render.py --save-baseline
+    python benchmarks/bench_render.py --check
+"""
+
+import argparse
+import asyncio
+import functools
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from fastui import components as c
+
+from schemas.models import ScanConfigGetDTO, VulnerGetDTO
+from services.reports import ReportsService, REPORT_AFFECT, REPORT_FIELD, REPORT_PROJECT, report_rows_cache
+from services.scans import ScannerService
+from services.vulners import VulnersService, vulners_cache
+from ui.base import base_page
+from ui.response import FastUIResponse
+from synthetic import CREATED_AT, gen_affected, gen_scan_config, gen_vulner, project_id
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results', 'render-baseline.json')
+REPORT_ID = 1
+CONFIG_ID = 1
+VULNER_ID = 'BDU:2024-00001'
+
+# Количество уязвимостей, из которых выбираются уязвимости отчета.
+REPORT_VULNERS = 5000
+
+# Построение компонентов страницы из n строк: функция подготовки данных
+# возвращает функцию построения, сериализуются только списки компонентов.
+Case = Callable[[int], Callable[[], Awaitable[Any]]]
+
+
+@functools.lru_cache(maxsize=REPORT_VULNERS)
+def report_vulner(index: int) -> dict:
+    return gen_vulner(index)
+
+
+async def report_items(rows: int) -> AsyncIterator[tuple[str, str | int, Any]]:
+    """
+    Функция генерации элементов отчета из одного проекта без сериализации в JSON
+
+    :param rows: Количество затронутых пакетов
+    :return: Элементы отчета, см. iter_report_items
+    """
+
+    scan_config = gen_scan_config(CONFIG_ID, 1)
+    for key, value in dict(id=REPORT_ID, created_at=CREATED_AT, scan_config_id=CONFIG_ID, scan_config=scan_config).items():
+        yield REPORT_FIELD, key, value
+
+    yield REPORT_PROJECT, 0, scan_config['projects'][0]
+    for index in range(rows):
+        vulner_index = index * 7919 % REPORT_VULNERS
+        yield REPORT_AFFECT, 0, dict(affected=gen_affected(vulner_index, index % 3), vulner=report_vulner(vulner_index))
+
+
+def report_rows_case(rows: int) -> Callable[[], Awaitable[Any]]:
+    async def build() -> None:
+        await ReportsService().build_report_rows(report_items(rows))
+
+    return build
+
+
+def report_project_case(rows: int) -> Callable[[], Awaitable[Any]]:
+    report_rows_cache.clear()
+    report_rows_cache.set(REPORT_ID, asyncio.run(ReportsService().build_report_rows(report_items(rows))))
+
+    # Сортировка по имени пакета требует упорядочивания всех строк проекта.
+    return lambda: ReportsService().get_report_project_view(REPORT_ID, project_id(CONFIG_ID, 0), sort='name')
+
+
+def vulner_case(rows: int) -> Callable[[], Awaitable[Any]]:
+    vulners_cache.clear()
+    vulners_cache.set(VULNER_ID, ('', VulnerGetDTO.model_validate(gen_vulner(1, ratings_count=rows))))
+
+    return lambda: VulnersService().get_view_vulner(VULNER_ID)
+
+
+def scan_config_case(rows: int) -> Callable[[], Awaitable[Any]]:
+    scan_config = ScanConfigGetDTO.model_validate(gen_scan_config(CONFIG_ID, rows))
+
+    async def get_scan_config_info(conf_id: int) -> ScanConfigGetDTO:
+        return scan_config
+
+    service = ScannerService()
+    service.get_scan_config_info = get_scan_config_info
+
+    return lambda: service.get_scan_config_view(CONFIG_ID)
+
+
+def base_page_case(rows: int) -> Callable[[], Awaitable[Any]]:
+    async def build() -> list:
+        return base_page(*(c.Paragraph(text=f'Строка {index}') for index in range(rows)), title='Бенчмарк')
+
+    return build
+
+
+CASES: dict[str, Case] = {
+    'report_rows': report_rows_case,
+    'report_project_view': report_project_case,
+    'vulner_view': vulner_case,
+    'scan_config_view': scan_config_case,
+    'base_page': base_page_case,
+}
+
+
+def measure(build: Callable[[], Awaitable[Any]], repeat: int) -> dict[str, float | None]:
+    """
+    Функция измерения построения и сериализации страницы
+
+    :param build: Функция построения компонентов страницы
+    :param repeat: Количество повторов, берется минимальное время
+    :return: Время построения и сериализации в секундах и пиковый объем памяти в байтах
+    """
+
+    loop = asyncio.new_event_loop()
+    build_times, render_times = [], []
+
+    try:
+        for _ in range(repeat):
+            gc.collect()
+            started = time.perf_counter()
+            components = loop.run_until_complete(build())
+            build_times.append(time.perf_counter() - started)
+
+            if components is not None:
+                started = time.perf_counter()
+                FastUIResponse(components)
+                render_times.append(time.perf_counter() - started)
+
+        # Память измеряется отдельным прогоном: tracemalloc замедляет выполнение.
+        gc.collect()
+        tracemalloc.start()
+        components = loop.run_until_complete(build())
+        if components is not None:
+            FastUIResponse(components)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    finally:
+        loop.close()
+
+    return dict(
+        build_s=min(build_times),
+        render_s=min(render_times) if render_times else None,
+        peak_bytes=peak,
+    )
+
+
+def run(cases: list[str], rows_list: list[int], repeat: int) -> list[dict]:
+    """
+    Функция прогона всех случаев и размеров данных
+
+    :param cases: Случаи из CASES
+    :param rows_list: Размеры данных в строках
+    :param repeat: Количество повторов измерения
+    :return: Результаты в пересчете на одну строку
+    """
+
+    print(f'{"Случай":<22} {"Строк":>7} {"Построение, мкс/стр":>20} {"Сериализация, мкс/стр":>22} {"Пик, Б/стр":>11}')
+
+    results = []
+    for case in cases:
+        for rows in rows_list:
+            measured = measure(CASES[case](rows), repeat)
+            result = dict(
+                case=case,
+                rows=rows,
+                build_us_per_row=round(measured['build_s'] / rows * 1e6, 3),
+                render_us_per_row=round(measured['render_s'] / rows * 1e6, 3) if measured['render_s'] is not None else None,
+                peak_bytes_per_row=round(measured['peak_bytes'] / rows, 1),
+            )
+            results.append(result)
+
+            render = f'{result["render_us_per_row"]:>22.2f}' if result['render_us_per_row'] is not None else f'{"-":>22}'
+            print(
+                f'{case:<22} {rows:>7} {result["build_us_per_row"]:>20.2f}{render} {result["peak_bytes_per_row"]:>11.0f}',
+                flush=True,
+            )
+
+    return results
+
+
+def check(results: list[dict], baseline_path: str, time_tolerance: float, memory_tolerance: float, min_rows: int) -> bool:
+    """
+    Функция проверки регрессий относительно сохраненных результатов
+
+    :param results: Результаты текущего запуска
+    :param baseline_path: Путь к сохраненным результатам
+    :param time_tolerance: Допустимый относительный рост времени
+    :param memory_tolerance: Допустимый относительный рост пикового объема памяти
+    :param min_rows: Минимальный размер данных для проверки, малые размеры слишком шумные
+    :return: Регрессий нет
+    """
+
+    if not os.path.exists(baseline_path):
+        print(f'\nФайл {baseline_path} не найден, сохраните базовые результаты: --save-baseline')
+        return False
+
+    with open(baseline_path) as file:
+        baseline = {(item['case'], item['rows']): item for item in json.load(file)['results']}
+
+    metrics = {
+        'build_us_per_row': time_tolerance,
+        'render_us_per_row': time_tolerance,
+        'peak_bytes_per_row': memory_tolerance,
+    }
+
+    passed = True
+    print()
+    for result in results:
+        before = baseline.get((result['case'], result['rows']))
+        if before is None or result['rows'] < min_rows:
+            continue
+
+        for metric, tolerance in metrics.items():
+            if not before.get(metric) or result[metric] is None:
+                continue
+
+            change = result[metric] / before[metric] - 1
+            if change > tolerance:
+                passed = False
+                print(
+                    f'РЕГРЕССИЯ {result["case"]} ({result["rows"]} строк) {metric}: '
+                    f'{before[metric]} -> {result[metric]} ({change:+.0%}, допустимо {tolerance:+.0%})'
+                )
+
+    print('Регрессий нет' if passed else 'Обнаружены регрессии')
+    return passed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cases', default=','.join(CASES), help='Случаи через запятую')
+    parser.add_argument('--rows', default='10,100,1000,10000,100000', help='Размеры данных через запятую')
+    parser.add_argument('--repeat', type=int, default=3, help='Количество повторов измерения')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='Файл сохраненных результатов')
+    parser.add_argument('--save-baseline', action='store_true', help='Сохранить результаты как базовые')
+    parser.add_argument('--check', action='store_true', help='Сравнить с базовыми результатами, код 1 при регрессии')
+    parser.add_argument('--time-tolerance', type=float, default=0.25, help='Допустимый рост времени, доля')
+    parser.add_argument('--memory-tolerance', type=float, default=0.10, help='Допустимый рост памяти, доля')
+    parser.add_argument('--min-rows', type=int, default=1000, help='Минимальный размер данных для проверки')
+    args = parser.parse_args()
+
+    cases = args.cases.split(',')
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error(f'Неизвестные случаи: {", ".join(sorted(unknown))}')
+
+    results = run(cases, [int(rows) for rows in args.rows.split(',')], args.repeat)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w') as file:
+            json.dump(dict(results=results), file, ensure_ascii=False, indent=2)
+        print(f'\nБазовые результаты сохранены в {args.baseline}')
+
+    if args.check and not check(results, args.baseline, args.time_tolerance, args.memory_tolerance, args.min_rows):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""
+Сравнение затрат CPU на разбор ответов бэкенда в режимах VALIDATION_MODE
+и способов построения pydantic моделей
+
+Запуск: python benchmarks/bench_validation.py [--affects 20000] [--repeat 3]
+"""
+
+import argparse
+import asyncio
+import functools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import typing
+
+from pydantic import BaseModel
+
+from schemas.models import VulnerGetDTO, ScanConfigListDTO
+from services.config import ValidationConfig
+from services.reports import ReportsService, iter_report_items
+from services.stream import JsonStreamReader
+from synthetic import dump, gen_report, gen_vulner
+
+
+async def build_rows(payload: bytes) -> None:
+    async def chunks():
+        for start in range(0, len(payload), 64 * 1024):
+            yield payload[start:start + 64 * 1024]
+
+    await ReportsService().build_report_rows(iter_report_items(JsonStreamReader(chunks())))
+
+
+@functools.cache
+def construct_plan(model: type[BaseModel]) -> list[tuple[str, type[BaseModel] | None, bool]]:
+    """
+    Функция построения плана model_construct по аннотациям полей модели
+
+    :param model: Класс модели
+    :return: Имя поля, вложенная модель и признак списка для каждого поля
+    """
+
+    plan = []
+    for name, field in model.model_fields.items():
+        annotation = next(
+            (arg for arg in typing.get_args(field.annotation) or (field.annotation,) if arg is not type(None)),
+            field.annotation,
+        )
+        is_list = typing.get_origin(annotation) is list
+        sub_model = typing.get_args(annotation)[0] if is_list else annotation
+        if not (isinstance(sub_model, type) and issubclass(sub_model, BaseModel)):
+            sub_model = None
+        plan.append((name, sub_model, is_list))
+
+    return plan
+
+
+def construct_model(model: type[BaseModel], data: dict) -> BaseModel:
+    """
+    Функция рекурсивного построения модели через model_construct
+
+    :param model: Класс модели
+    :param data: Данные модели
+    :return: Экземпляр модели без валидации
+    """
+
+    values = {}
+    for name, sub_model, is_list in construct_plan(model):
+        if name not in data:
+            continue
+
+        value = data[name]
+        if sub_model is not None and value is not None:
+            value = [construct_model(sub_model, item) for item in value] if is_list else construct_model(sub_model, value)
+        values[name] = value
+
+    return model.model_construct(**values)
+
+
+def measure(func, repeat: int) -> float:
+    """
+    Функция измерения процессорного времени
+
+    :param func: Измеряемая функция
+    :param repeat: Количество повторов
+    :return: Минимальное процессорное время одного вызова в секундах
+    """
+
+    timings = []
+    for _ in range(repeat):
+        started = time.process_time()
+        func()
+        timings.append(time.process_time() - started)
+
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--affects', type=int, default=20000, help='Количество затронутых пакетов в отчете')
+    parser.add_argument('--repeat', type=int, default=3, help='Количество повторов измерения')
+    parser.add_argument('--sample-rate', type=int, default=ValidationConfig.sample_rate, help='VALIDATION_SAMPLE_RATE')
+    args = parser.parse_args()
+
+    report = dump(gen_report(projects_count=4, affects_count=args.affects // 4))
+    report_case = f'Отчет ({args.affects} пакетов, {len(report) // 1024} КБ)'
+
+    ValidationConfig.sample_rate = args.sample_rate
+    results = {}
+    for mode in ('strict', 'sampled', 'trusted'):
+        ValidationConfig.mode = mode
+        # В режиме sampled время усредняется по sample_rate ответам.
+        calls = args.sample_rate if mode == 'sampled' else 1
+        results[mode] = measure(lambda: [asyncio.run(build_rows(report)) for _ in range(calls)], args.repeat) / calls
+
+    print(f'{"Режим VALIDATION_MODE":<40} {"strict, мс":>12} {"sampled, мс":>12} {"trusted, мс":>12}')
+    print(f'{report_case:<40}' + ''.join(f'{results[mode] * 1000:>13.1f}' for mode in ('strict', 'sampled', 'trusted')))
+
+    vulner = gen_vulner(1, affected_count=2000, ratings_count=4)
+    scan_configs = [
+        dict(id=i, name=f'conf-{i}', host='10.0.0.1', user='scanner', date='10_06_2025_14_14_07')
+        for i in range(5000)
+    ]
+    cases = {
+        'Уязвимость (2000 пакетов)': (VulnerGetDTO, [vulner]),
+        'Список конфигураций (5000)': (ScanConfigListDTO, scan_configs),
+    }
+
+    print()
+    print(f'{"Построение моделей":<40} {"model_validate, мс":>20} {"model_construct, мс":>20}')
+    for name, (model, rows) in cases.items():
+        validate_time = measure(lambda: [model.model_validate(row) for row in rows], args.repeat)
+        construct_time = measure(lambda: [construct_model(model, row) for row in rows], args.repeat)
+        print(f'{name:<40} {validate_time * 1000:>20.1f} {construct_time * 1000:>20.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,367 @@
+"""
+Нагрузочный тест фронтенд сервиса
+
+Для каждого сценария (маршрута API) и уровня параллельности запросы
+отправляются замкнутым циклом в течение заданного времени. Выводятся
+пропускная способность и задержки p50/p95/p99, результаты сохраняются
+в JSON для сравнения запусков на разных коммитах.
+
+Запуск с заглушкой бэкенда и сервисом, поднятыми автоматически:
+    python benchmarks/load_test.py --spawn [--concurrency 1,8,32] [--duration 10]
+
+Сравнение с предыдущим запуском:
+    python benchmarks/load_test.py --spawn --compare benchmarks/results/<файл>.json
+"""
+
+import argparse
+import asyncio
+import datetime
+import itertools
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+import httpx
+
+from stub_backend import StubConfig
+from synthetic import project_id, report_config_id, vulner_identifier
+
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(os.path.dirname(BENCHMARKS_DIR), 'src')
+RESULTS_DIR = os.path.join(BENCHMARKS_DIR, 'results')
+
+# Сценарии: адрес запроса по порядковому номеру запроса и параметрам данных.
+SCENARIOS: dict[str, Callable[[int, argparse.Namespace], str]] = {
+    'reports': lambda i, args: f'/api/reports/?page={i % max(args.reports // 10, 1) + 1}',
+    'report': lambda i, args: f'/api/reports/{i % args.report_ids + 1}',
+    'report_project': lambda i, args: (
+        f'/api/reports/{i % args.report_ids + 1}/projects/'
+        f'{project_id(report_config_id(i % args.report_ids + 1, args.configs), i % args.projects)}'
+        f'?page={i % 5 + 1}&sort=score'
+    ),
+    'vulners': lambda i, args: f'/api/vulners/?page={i % 50 + 1}',
+    'vulner': lambda i, args: f'/api/vulners/{vulner_identifier(i % args.vulners)}',
+    'vulner_affected': lambda i, args: f'/api/vulners/{vulner_identifier(i % 100)}/affected?page=1',
+    'scan_configs': lambda i, args: f'/api/scan/configs/?page={i % max(args.configs // 7, 1) + 1}',
+    'scan_config': lambda i, args: f'/api/scan/configs/{i % args.configs + 1}',
+}
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """
+    Функция вычисления перцентиля методом ближайшего ранга
+
+    :param sorted_values: Отсортированные значения
+    :param fraction: Доля от 0 до 1
+    :return: Перцентиль
+    """
+
+    if not sorted_values:
+        return 0.0
+
+    rank = max(math.ceil(len(sorted_values) * fraction) - 1, 0)
+    return sorted_values[rank]
+
+
+async def run_level(
+        client: httpx.AsyncClient,
+        url_factory: Callable[[int], str],
+        concurrency: int,
+        duration: float,
+) -> dict:
+    """
+    Функция нагрузки одного сценария с заданной параллельностью
+
+    :param client: HTTP клиент сервиса
+    :param url_factory: Функция получения адреса по номеру запроса
+    :param concurrency: Количество одновременных запросов
+    :param duration: Время нагрузки в секундах
+    :return: Результаты: количество запросов, ошибки, пропускная способность, задержки
+    """
+
+    counter = itertools.count()
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker() -> None:
+        nonlocal errors
+
+        while time.perf_counter() < deadline:
+            url = url_factory(next(counter))
+            started = time.perf_counter()
+            try:
+                response = await client.get(url)
+                await response.aread()
+            except httpx.HTTPError:
+                errors += 1
+                continue
+
+            if response.is_success:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+
+    return dict(
+        concurrency=concurrency,
+        requests=len(latencies),
+        errors=errors,
+        duration_s=round(elapsed, 3),
+        throughput_rps=round(len(latencies) / elapsed, 2),
+        latency_ms=dict(
+            mean=round(statistics.fmean(latencies) * 1000, 3) if latencies else 0.0,
+            p50=round(percentile(latencies, 0.50) * 1000, 3),
+            p95=round(percentile(latencies, 0.95) * 1000, 3),
+            p99=round(percentile(latencies, 0.99) * 1000, 3),
+            max=round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        ),
+    )
+
+
+async def run_benchmark(args: argparse.Namespace) -> list[dict]:
+    """
+    Функция прогона всех сценариев и уровней параллельности
+
+    :param args: Параметры запуска
+    :return: Результаты по каждому сценарию и уровню параллельности
+    """
+
+    results = []
+    limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        for scenario in args.scenarios:
+            url_factory = lambda i, scenario=scenario: SCENARIOS[scenario](i, args)
+
+            # Прогрев: первые запросы заполняют кэши сервиса.
+            await run_level(client, url_factory, 1, args.warmup)
+
+            for concurrency in args.concurrency:
+                result = dict(scenario=scenario, **await run_level(client, url_factory, concurrency, args.duration))
+                results.append(result)
+                print_result(result)
+
+    return results
+
+
+def print_result(result: dict) -> None:
+    latency = result['latency_ms']
+    print(
+        f'{result["scenario"]:<16} {result["concurrency"]:>4} {result["throughput_rps"]:>10.1f} '
+        f'{latency["p50"]:>9.1f} {latency["p95"]:>9.1f} {latency["p99"]:>9.1f} {result["errors"]:>7}',
+        flush=True,
+    )
+
+
+def print_comparison(results: list[dict], baseline_path: str) -> None:
+    """
+    Функция вывода изменений относительно предыдущего запуска
+
+    :param results: Результаты текущего запуска
+    :param baseline_path: Путь к JSON файлу предыдущего запуска
+    """
+
+    with open(baseline_path) as file:
+        baseline = json.load(file)
+
+    previous = {(item['scenario'], item['concurrency']): item for item in baseline['results']}
+
+    print()
+    print(f'Сравнение с {baseline.get("commit", "?")} ({baseline_path})')
+    print(f'{"Сценарий":<16} {"Парал.":>6} {"RPS, %":>9} {"p50, %":>9} {"p95, %":>9} {"p99, %":>9}')
+
+    def change(current: float, before: float) -> str:
+        return f'{(current - before) / before * 100:>+9.1f}' if before else f'{"-":>9}'
+
+    for result in results:
+        before = previous.get((result['scenario'], result['concurrency']))
+        if before is None:
+            continue
+
+        print(
+            f'{result["scenario"]:<16} {result["concurrency"]:>6}'
+            f'{change(result["throughput_rps"], before["throughput_rps"])}'
+            + ''.join(change(result['latency_ms'][name], before['latency_ms'][name]) for name in ('p50', 'p95', 'p99'))
+        )
+
+
+def git_revision() -> tuple[str, bool]:
+    """
+    Функция получения текущего коммита
+
+    :return: Короткий хэш коммита и признак незакоммиченных изменений
+    """
+
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True, cwd=BENCHMARKS_DIR,
+        ).stdout.strip()
+        dirty = bool(subprocess.run(
+            ['git', 'status', '--porcelain', '--untracked-files=no'], capture_output=True, text=True, cwd=BENCHMARKS_DIR,
+        ).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown', False
+
+    return commit, dirty
+
+
+def wait_ready(url: str, process: subprocess.Popen, timeout: float = 60) -> None:
+    """
+    Функция ожидания готовности запущенного сервиса
+
+    :param url: Адрес, отвечающий после запуска
+    :param process: Процесс сервиса
+    :param timeout: Время ожидания в секундах
+    """
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'Процесс {process.args} завершился с кодом {process.returncode}')
+        try:
+            httpx.get(url, timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+
+    raise RuntimeError(f'{url} не ответил за {timeout} с')
+
+
+@contextmanager
+def spawn_services(args: argparse.Namespace) -> Iterator[None]:
+    """
+    Функция запуска заглушки бэкенда и фронтенд сервиса на время теста
+
+    :param args: Параметры запуска
+    """
+
+    stub = subprocess.Popen([
+        sys.executable, os.path.join(BENCHMARKS_DIR, 'stub_backend.py'),
+        '--port', str(args.stub_port),
+        '--reports', str(args.reports),
+        '--configs', str(args.configs),
+        '--projects', str(args.projects),
+        '--affects', str(args.affects),
+        '--ratings', str(args.ratings),
+        '--vulners', str(args.vulners),
+        '--latency-ms', str(args.latency_ms),
+        '--jitter-ms', str(args.jitter_ms),
+    ])
+    processes = [stub]
+
+    try:
+        wait_ready(f'http://127.0.0.1:{args.stub_port}/docs', stub)
+
+        port = httpx.URL(args.base_url).port
+        frontend = subprocess.Popen(
+            [sys.executable, 'main.py'],
+            cwd=SRC_DIR,
+            env={
+                **os.environ,
+                'BACKEND_SERVICE_HOST': '127.0.0.1',
+                'BACKEND_SERVICE_PORT': str(args.stub_port),
+                'SERVER_HOST': '127.0.0.1',
+                'SERVER_PORT': str(port),
+                'SERVER_WORKERS': str(args.workers),
+                'SERVER_LOG_LEVEL': 'warning',
+            },
+        )
+        processes.append(frontend)
+        wait_ready(f'{args.base_url}/api/', frontend)
+
+        yield
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=30)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000', help='Адрес фронтенд сервиса')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help='Сценарии через запятую')
+    parser.add_argument('--concurrency', default='1,8,32', help='Уровни параллельности через запятую')
+    parser.add_argument('--duration', type=float, default=10, help='Время нагрузки каждого уровня в секундах')
+    parser.add_argument('--warmup', type=float, default=2, help='Время прогрева каждого сценария в секундах')
+    parser.add_argument('--timeout', type=float, default=60, help='Таймаут запроса в секундах')
+    parser.add_argument('--report-ids', type=int, default=4, help='Количество разных отчетов в сценариях отчетов')
+    parser.add_argument('--output', help='JSON файл результатов, по умолчанию benchmarks/results/<время>-<коммит>.json')
+    parser.add_argument('--compare', help='JSON файл предыдущего запуска для сравнения')
+
+    spawn = parser.add_argument_group('запуск заглушки бэкенда и сервиса')
+    spawn.add_argument('--spawn', action='store_true', help='Запустить заглушку бэкенда и сервис на время теста')
+    spawn.add_argument('--stub-port', type=int, default=5000)
+    spawn.add_argument('--workers', type=int, default=1, help='SERVER_WORKERS сервиса')
+    spawn.add_argument('--reports', type=int, default=StubConfig.reports)
+    spawn.add_argument('--configs', type=int, default=StubConfig.configs)
+    spawn.add_argument('--projects', type=int, default=StubConfig.projects, help='Проектов в отчете (N)')
+    spawn.add_argument('--affects', type=int, default=StubConfig.affects, help='Затронутых пакетов в проекте (M)')
+    spawn.add_argument('--ratings', type=int, default=StubConfig.ratings, help='Оценок у уязвимости (K)')
+    spawn.add_argument('--vulners', type=int, default=StubConfig.vulners, help='Размер базы уязвимостей')
+    spawn.add_argument('--latency-ms', type=float, default=StubConfig.latency_ms, help='Задержка бэкенда')
+    spawn.add_argument('--jitter-ms', type=float, default=StubConfig.jitter_ms, help='Случайная добавка к задержке')
+    args = parser.parse_args()
+
+    args.scenarios = args.scenarios.split(',')
+    args.concurrency = [int(level) for level in args.concurrency.split(',')]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f'Неизвестные сценарии: {", ".join(sorted(unknown))}')
+
+    print(f'{"Сценарий":<16} {"Пар.":>4} {"RPS":>10} {"p50, мс":>9} {"p95, мс":>9} {"p99, мс":>9} {"Ошибки":>7}')
+
+    if args.spawn:
+        with spawn_services(args):
+            results = asyncio.run(run_benchmark(args))
+    else:
+        results = asyncio.run(run_benchmark(args))
+
+    commit, dirty = git_revision()
+    timestamp = datetime.datetime.now(datetime.timezone.utc)
+    output = args.output or os.path.join(
+        RESULTS_DIR, f'{timestamp:%Y%m%dT%H%M%SZ}-{commit}{"-dirty" if dirty else ""}.json',
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+
+    with open(output, 'w') as file:
+        json.dump(
+            dict(
+                commit=commit,
+                dirty=dirty,
+                timestamp=timestamp.isoformat(),
+                python=platform.python_version(),
+                platform=platform.platform(),
+                params={
+                    name: value for name, value in vars(args).items()
+                    if name not in ('output', 'compare')
+                },
+                results=results,
+            ),
+            file,
+            ensure_ascii=False,
+            indent=2,
+        )
+
+    print(f'\nРезультаты сохранены в {output}')
+
+    if args.compare:
+        print_comparison(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+"""
+Заглушка бэкенд сервиса с синтетическими данными
+
+Реализует все обработчики scan/... из BackendServiceConfig. Размер данных
+и задержка ответов задаются параметрами запуска.
+
+Запуск: python benchmarks/stub_backend.py [--port 5000] [--projects 4] [--affects 1000] [--latency-ms 20]
+"""
+
+import argparse
+import asyncio
+import functools
+import os
+import random
+import sys
+
+import uvicorn
+from fastapi import FastAPI, HTTPException, Response
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from services.config import BackendServiceConfig
+from synthetic import (
+    CREATED_AT,
+    dump,
+    gen_project,
+    gen_report,
+    gen_scan_config,
+    gen_vulner,
+    gen_vulner_basic,
+    report_config_id,
+    vulner_index,
+)
+
+
+class StubConfig:
+    """Класс параметров синтетических данных заглушки"""
+
+    reports = 50
+    configs = 20
+    projects = 4
+    affects = 1000
+    ratings = 2
+    vulners = 5000
+    vulner_affected = 20
+    # Пагинация на стороне бэкенда для списков отчетов и конфигураций.
+    paginated = False
+    latency_ms = 0.0
+    jitter_ms = 0.0
+
+
+app = FastAPI()
+prefix = f'/{BackendServiceConfig.api_version}/scan'
+
+
+async def delay() -> None:
+    """Функция имитации задержки бэкенда"""
+
+    latency = StubConfig.latency_ms + random.uniform(0, StubConfig.jitter_ms)
+    if latency > 0:
+        await asyncio.sleep(latency / 1000)
+
+
+def json_response(data: object) -> Response:
+    return Response(content=dump(data), media_type='application/json')
+
+
+def page_window(count: int, page: int, page_size: int) -> range:
+    """
+    Функция получения номеров записей страницы
+
+    :param count: Общее количество записей
+    :param page: Номер страницы пагинации
+    :param page_size: Количество записей на одной странице
+    :return: Номера записей страницы, начиная с 0
+    """
+
+    return range((page - 1) * page_size, min(page * page_size, count))
+
+
+@functools.lru_cache(maxsize=8)
+def report_payload(report_id: int) -> bytes:
+    """
+    Функция подготовки ответа с отчетом
+
+    Отчеты сериализуются один раз, чтобы заглушка не ограничивала нагрузку.
+
+    :param report_id: Идентификатор отчета
+    :return: JSON отчета
+    """
+
+    return dump(gen_report(
+        report_id=report_id,
+        projects_count=StubConfig.projects,
+        affects_count=StubConfig.affects,
+        ratings_count=StubConfig.ratings,
+        vulners_count=StubConfig.vulners,
+        config_id=report_config_id(report_id, StubConfig.configs),
+    ))
+
+
+def report_row(report_id: int) -> dict:
+    return dict(id=report_id, created_at=CREATED_AT, scan_config_id=report_config_id(report_id, StubConfig.configs))
+
+
+def config_row(config_id: int) -> dict:
+    config = gen_scan_config(config_id, 0)
+    return dict(id=config_id, name=config['name'], host=config['host'], user=config['user'], date=config['date'])
+
+
+@app.get(f'{prefix}/reports')
+async def get_reports(page: int = 1, page_size: int = 10) -> Response:
+    await delay()
+
+    if StubConfig.paginated:
+        rows = [report_row(index + 1) for index in page_window(StubConfig.reports, page, page_size)]
+        return json_response(dict(reports=rows, count=StubConfig.reports))
+
+    return json_response([report_row(report_id) for report_id in range(1, StubConfig.reports + 1)])
+
+
+@app.get(f'{prefix}/reports/id/{{report_id}}')
+async def get_report(report_id: int) -> Response:
+    await delay()
+
+    if not 1 <= report_id <= StubConfig.reports:
+        raise HTTPException(status_code=404)
+
+    return Response(content=report_payload(report_id), media_type='application/json')
+
+
+@app.get(f'{prefix}/vulners')
+async def get_vulners(page: int = 1, page_size: int = 10) -> Response:
+    await delay()
+
+    rows = [gen_vulner_basic(index) for index in page_window(StubConfig.vulners, page, page_size)]
+    return json_response(dict(vulners=rows, count=StubConfig.vulners))
+
+
+@app.get(f'{prefix}/vulners/{{vulner_id}}')
+async def get_vulner(vulner_id: str) -> Response:
+    await delay()
+
+    try:
+        index = vulner_index(vulner_id)
+    except (IndexError, ValueError):
+        raise HTTPException(status_code=404)
+
+    return json_response(gen_vulner(index, affected_count=StubConfig.vulner_affected, ratings_count=StubConfig.ratings))
+
+
+@app.get(f'{prefix}/confs/all')
+async def get_configs(page: int = 1, page_size: int = 7) -> Response:
+    await delay()
+
+    if StubConfig.paginated:
+        rows = [config_row(index + 1) for index in page_window(StubConfig.configs, page, page_size)]
+        return json_response(dict(configs=rows, count=StubConfig.configs))
+
+    return json_response([config_row(config_id) for config_id in range(1, StubConfig.configs + 1)])
+
+
+@app.get(f'{prefix}/confs/id/{{config_id}}')
+async def get_config(config_id: int) -> Response:
+    await delay()
+    return json_response(gen_scan_config(config_id, StubConfig.projects))
+
+
+@app.post(f'{prefix}/confs')
+async def add_config() -> Response:
+    await delay()
+    return json_response(dict(created_item_id=StubConfig.configs + 1))
+
+
+@app.get(f'{prefix}/projects/{{project_id}}')
+async def get_project(project_id: int) -> Response:
+    await delay()
+    return json_response(gen_project(project_id // 1000, project_id))
+
+
+@app.post(f'{prefix}/projects')
+async def add_project() -> Response:
+    await delay()
+    return json_response(dict(created_item_id=StubConfig.configs * 1000 + 1))
+
+
+@app.post(f'{prefix}/run/{{config_id}}')
+async def run_scanner(config_id: int) -> Response:
+    await delay()
+    return json_response(dict(created_item_id=StubConfig.reports + 1))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=int(BackendServiceConfig.port))
+    parser.add_argument('--reports', type=int, default=StubConfig.reports, help='Количество отчетов')
+    parser.add_argument('--configs', type=int, default=StubConfig.configs, help='Количество конфигураций сканирования')
+    parser.add_argument('--projects', type=int, default=StubConfig.projects, help='Количество проектов в отчете (N)')
+    parser.add_argument('--affects', type=int, default=StubConfig.affects, help='Затронутых пакетов в проекте (M)')
+    parser.add_argument('--ratings', type=int, default=StubConfig.ratings, help='Оценок у уязвимости (K)')
+    parser.add_argument('--vulners', type=int, default=StubConfig.vulners, help='Размер базы уязвимостей')
+    parser.add_argument('--vulner-affected', type=int, default=StubConfig.vulner_affected,
+                        help='Затронутых пакетов на странице уязвимости')
+    parser.add_argument('--paginated', action='store_true', help='Пагинация списков отчетов и конфигураций')
+    parser.add_argument('--latency-ms', type=float, default=StubConfig.latency_ms, help='Задержка ответов')
+    parser.add_argument('--jitter-ms', type=float, default=StubConfig.jitter_ms, help='Случайная добавка к задержке')
+    args = parser.parse_args()
+
+    for name in ('reports', 'configs', 'projects', 'affects', 'ratings', 'vulners', 'vulner_affected',
+                 'paginated', 'latency_ms', 'jitter_ms'):
+        setattr(StubConfig, name, getattr(args, name))
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level='warning', access_log=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+"""
+Синтетические данные бэкенда для бенчмарков
+
+Данные детерминированы: одинаковые параметры дают одинаковые ответы,
+поэтому результаты запусков на разных коммитах сравнимы.
+"""
+
+import json
+
+
+CREATED_AT = '10_06_2025_14_14_07'
+PROJECT_TYPES = ('python', 'golang', 'javascript')
+SEVERITIES = ('LOW', 'MEDIUM', 'HIGH', 'CRITICAL')
+
+
+def vulner_identifier(index: int) -> str:
+    """
+    Функция формирования идентификатора уязвимости БЗУ
+
+    :param index: Номер уязвимости
+    :return: Глобальный идентификатор уязвимости
+    """
+
+    return f'BDU:2024-{index:05}'
+
+
+def vulner_index(identifier: str) -> int:
+    """
+    Функция получения номера уязвимости по идентификатору
+
+    :param identifier: Глобальный идентификатор уязвимости
+    :return: Номер уязвимости
+    """
+
+    return int(identifier.rsplit('-', 1)[1])
+
+
+def vulner_score(index: int, rating: int = 0) -> float:
+    """
+    Функция получения оценки уязвимости
+
+    :param index: Номер уязвимости
+    :param rating: Номер оценки
+    :return: Оценка в баллах от 0 до 9.9
+    """
+
+    return (index * 37 + rating * 11) % 100 / 10
+
+
+def gen_affected(index: int, package: int) -> dict:
+    """
+    Функция генерации затронутого пакета уязвимости
+
+    :param index: Номер уязвимости
+    :param package: Номер пакета уязвимости
+    :return: Данные затронутого пакета в формате бэкенда
+    """
+
+    return dict(
+        id=index * 100 + package,
+        name=f'package-{(index + package) % 997}',
+        vendor=f'vendor-{package % 7}',
+        type=PROJECT_TYPES[package % len(PROJECT_TYPES)],
+        start_condition='gte',
+        start_value=f'1.{package}.0',
+        end_value=f'2.{package}.{index % 10}',
+        end_condition='lt',
+    )
+
+
+def gen_vulner(index: int, affected_count: int = 3, ratings_count: int = 2) -> dict:
+    """
+    Функция генерации данных уязвимости
+
+    :param index: Номер уязвимости
+    :param affected_count: Количество затронутых пакетов
+    :param ratings_count: Количество оценок
+    :return: Данные уязвимости в формате бэкенда
+    """
+
+    return dict(
+        global_identifier=vulner_identifier(index),
+        identifier=f'CVE-2024-{index}',
+        description='Уязвимость в обработчике запросов ' * 8,
+        source_name='bdu',
+        source_url=f'https://bdu.fstec.ru/vul/2024-{index:05}',
+        affected=[gen_affected(index, package) for package in range(affected_count)],
+        ratings=[
+            dict(
+                id=index * 10 + rating,
+                method='CVSS',
+                score=vulner_score(index, rating),
+                severity=SEVERITIES[int(vulner_score(index, rating)) * len(SEVERITIES) // 10],
+                source_name='nvd',
+                source_url='https://nvd.nist.gov',
+                vector='AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H',
+                version=3.0 + rating / 10,
+            )
+            for rating in range(ratings_count)
+        ],
+        references=[dict(id=index, source='nvd', url=f'https://nvd.nist.gov/vuln/detail/CVE-2024-{index}')],
+    )
+
+
+def gen_vulner_basic(index: int) -> dict:
+    """
+    Функция генерации строки списка уязвимостей
+
+    :param index: Номер уязвимости
+    :return: Краткие данные уязвимости в формате бэкенда
+    """
+
+    return dict(
+        global_identifier=vulner_identifier(index),
+        identifier=f'CVE-2024-{index}',
+        source_name='bdu',
+        source_url=f'https://bdu.fstec.ru/vul/2024-{index:05}',
+        score=vulner_score(index),
+        severity=SEVERITIES[int(vulner_score(index)) * len(SEVERITIES) // 10],
+    )
+
+
+def report_config_id(report_id: int, configs_count: int) -> int:
+    """
+    Функция получения конфигурации сканирования, по которой собран отчет
+
+    :param report_id: Идентификатор отчета
+    :param configs_count: Количество конфигураций сканирования
+    :return: Идентификатор конфигурации сканирования
+    """
+
+    return (report_id - 1) % configs_count + 1
+
+
+def project_id(config_id: int, index: int) -> int:
+    """
+    Функция получения идентификатора проекта конфигурации
+
+    :param config_id: Идентификатор конфигурации сканирования
+    :param index: Номер проекта в конфигурации
+    :return: Идентификатор проекта
+    """
+
+    return config_id * 1000 + index
+
+
+def gen_project(config_id: int, project_id: int) -> dict:
+    """
+    Функция генерации конфигурации проекта
+
+    :param config_id: Идентификатор конфигурации сканирования
+    :param project_id: Идентификатор проекта
+    :return: Конфигурация проекта в формате бэкенда
+    """
+
+    return dict(
+        id=project_id,
+        name=f'project-{project_id}',
+        type=PROJECT_TYPES[project_id % len(PROJECT_TYPES)],
+        dir_path=f'/srv/project-{project_id}',
+        description='',
+        scan_config_id=config_id,
+    )
+
+
+def gen_scan_config(config_id: int, projects_count: int) -> dict:
+    """
+    Функция генерации конфигурации сканирования
+
+    :param config_id: Идентификатор конфигурации сканирования
+    :param projects_count: Количество проектов
+    :return: Конфигурация сканирования в формате бэкенда
+    """
+
+    return dict(
+        id=config_id,
+        name=f'conf-{config_id}',
+        host=f'10.0.{config_id // 256}.{config_id % 256}',
+        user='scanner',
+        secret='secret',
+        description='Конфигурация',
+        date=CREATED_AT,
+        port='22',
+        projects=[gen_project(config_id, project_id(config_id, index)) for index in range(projects_count)],
+    )
+
+
+def gen_report(
+        report_id: int = 1,
+        projects_count: int = 4,
+        affects_count: int = 1000,
+        ratings_count: int = 2,
+        vulners_count: int = 5000,
+        config_id: int = 1,
+) -> dict:
+    """
+    Функция генерации отчета
+
+    :param report_id: Идентификатор отчета
+    :param projects_count: Количество проектов
+    :param affects_count: Количество затронутых пакетов в каждом проекте
+    :param ratings_count: Количество оценок каждой уязвимости
+    :param vulners_count: Размер базы уязвимостей, из которой берутся уязвимости отчета
+    :param config_id: Идентификатор конфигурации сканирования
+    :return: Отчет в формате бэкенда
+    """
+
+    scan_config = gen_scan_config(config_id, projects_count)
+
+    affects_projects = []
+    for project_index, project in enumerate(scan_config['projects']):
+        affects = []
+        for affect_index in range(affects_count):
+            index = (report_id * 7919 + project_index * affects_count + affect_index) % vulners_count
+            affects.append(dict(
+                affected=gen_affected(index, affect_index % 3),
+                vulner=gen_vulner(index, ratings_count=ratings_count),
+            ))
+        affects_projects.append(dict(project=project, affects=affects))
+
+    return dict(
+        id=report_id,
+        created_at=CREATED_AT,
+        scan_config_id=config_id,
+        scan_config=scan_config,
+        affects_projects=affects_projects,
+    )
+
+
+def dump(data: object) -> bytes:
+    """
+    Функция сериализации ответа бэкенда
+
+    :param data: Данные ответа
+    :return: JSON
+    """
+
+    return json.dumps(data, ensure_ascii=False).encode()
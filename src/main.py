@@ -1,17 +1,69 @@
 """Главный модуль сервиса"""
 
+import argparse
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 import uvicorn
-from fastapi import FastAPI
-from fastapi.responses import HTMLResponse
-from fastui import FastUI, AnyComponent, prebuilt_html, components as c
+from fastapi import FastAPI, Request, Response
+from fastui import FastUI, components as c
 from fastui.events import BackEvent
 
 from const import INDEX_PAGE_TEXT
 from routers import routers
+from routers.static import fastui_assets
+from services.client import backend_client
+from services.config import ServerConfig, StaticConfig, TimingConfig, MetricsConfig, VersionIndexConfig
+from services.metrics import MetricsMiddleware, monitor_event_loop
+from services.timing import ServerTimingMiddleware
+from services.versions import refresh_version_index
+from ui.assets import fastui_html
 from ui.base import base_page
+from ui.response import FastUIResponse
+from ui.static import StaticContent
+
+
+# HTML оболочка React приложения собирается и сжимается один раз при запуске.
+spa_shell = StaticContent(
+    body=(
+        fastui_assets.html(title='DPSS Service') if fastui_assets
+        else fastui_html(title='DPSS Service', assets_url=StaticConfig.assets_cdn_url)
+    ).encode(),
+    media_type='text/html; charset=utf-8',
+    cache_control=StaticConfig.shell_cache_control,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    tasks = []
+    if MetricsConfig.enabled:
+        tasks.append(asyncio.create_task(monitor_event_loop(MetricsConfig.event_loop_interval)))
+    # Индекс версий пакетов строится в фоне, запуск сервиса его не ожидает.
+    if VersionIndexConfig.enabled:
+        tasks.append(asyncio.create_task(
+            refresh_version_index(VersionIndexConfig.refresh_interval, VersionIndexConfig.retry_interval)
+        ))
+
+    yield
+
+    for task in tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+    # Закрытие пула соединений с бэкендом.
+    await backend_client.close()
+
 
+app = FastAPI(lifespan=lifespan)
 
-app = FastAPI()
+if TimingConfig.enabled:
+    app.add_middleware(ServerTimingMiddleware)
+
+# Добавляется последним, чтобы учитывать время всех остальных middleware.
+if MetricsConfig.enabled:
+    app.add_middleware(MetricsMiddleware)
 
 # Подключение маршрутов.
 for router in routers:
@@ -19,28 +71,60 @@ for router in routers:
 
 
 @app.get('/api/', response_model=FastUI, response_model_exclude_none=True)
-def get_index() -> list[AnyComponent]:
+async def get_index() -> FastUIResponse:
     components = [
         c.Markdown(
             text=INDEX_PAGE_TEXT,
         ),
     ]
 
-    return base_page(*components)
+    return FastUIResponse(base_page(*components))
 
 
 @app.get('/{path:path}')
-async def html_landing() -> HTMLResponse:
+async def html_landing(request: Request) -> Response:
     """Simple HTML page which serves the React app, comes last as it matches all paths."""
-    return HTMLResponse(prebuilt_html(title='DPSS Service'))
+    return spa_shell.response(request)
 
 
-if __name__ == '__main__':
+def run(reload: bool = ServerConfig.reload) -> None:
+    """
+    Функция запуска HTTP сервера
+
+    :param reload: Запуск в режиме разработки с перезагрузкой при изменении файлов
+    """
+
+    if reload:
+        uvicorn.run(
+            app='main:app',
+            host=ServerConfig.host,
+            port=ServerConfig.port,
+            reload=True,
+            log_level='debug',
+            workers=1,
+        )
+        return
+
     uvicorn.run(
         app='main:app',
-        host='0.0.0.0',
-        port=8000,
-        reload=True,
-        log_level='debug',
-        workers=1,
+        host=ServerConfig.host,
+        port=ServerConfig.port,
+        workers=ServerConfig.workers,
+        loop=ServerConfig.loop,
+        http=ServerConfig.http,
+        log_level=ServerConfig.log_level,
+        access_log=ServerConfig.access_log,
+        backlog=ServerConfig.backlog,
+        timeout_keep_alive=ServerConfig.timeout_keep_alive,
+        timeout_graceful_shutdown=ServerConfig.timeout_graceful_shutdown,
+        limit_concurrency=ServerConfig.limit_concurrency,
+        limit_max_requests=ServerConfig.limit_max_requests,
     )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='DPSS frontend')
+    parser.add_argument('--reload', action='store_true', help='Режим разработки с перезагрузкой при изменении файлов')
+    args = parser.parse_args()
+
+    run(reload=args.reload or ServerConfig.reload)
@@ -1,9 +1,17 @@
 from routers.reports import report_router
 from routers.vulners import vulners_router
 from routers.scans import scan_router
+from routers.admin import admin_router
+from routers.static import static_router
+from routers.metrics import metrics_router
+from routers.versions import versions_router
 
 routers = [
     report_router,
     vulners_router,
     scan_router,
+    admin_router,
+    static_router,
+    metrics_router,
+    versions_router,
 ]
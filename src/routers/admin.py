@@ -0,0 +1,55 @@
+"""Модуль служебных маршрутов"""
+
+from typing import Any
+
+from fastapi import APIRouter, HTTPException
+
+from services.cache import caches
+from services.client import backend_client
+from services.versions import version_index_state
+from services.vulners import vulners_cache
+
+
+admin_router = APIRouter(prefix="/api/admin")
+
+
+@admin_router.get('/caches')
+async def get_caches_stats() -> dict[str, dict[str, int | float]]:
+    """Получение статистики кэшей процесса"""
+
+    return {name: cache.stats() for name, cache in caches.items()}
+
+
+@admin_router.get('/backend')
+async def get_backend_client_stats() -> dict[str, int]:
+    """Получение статистики запросов к бэкенду"""
+
+    return backend_client.stats()
+
+
+@admin_router.get('/version_index')
+async def get_version_index_stats() -> dict[str, Any]:
+    """Получение состояния индекса версий пакетов"""
+
+    return version_index_state.stats()
+
+
+@admin_router.delete('/caches/vulners/{vulner_id}')
+async def purge_vulner_cache_entry(vulner_id: str) -> dict[str, int]:
+    """Удаление записи об уязвимости из кэша"""
+
+    return dict(purged=int(vulners_cache.pop(vulner_id) is not None))
+
+
+@admin_router.delete('/caches/{cache_name}')
+async def purge_cache(cache_name: str) -> dict[str, int]:
+    """Очистка кэша по имени"""
+
+    cache = caches.get(cache_name)
+    if cache is None:
+        raise HTTPException(status_code=404, detail='Кэш не найден')
+
+    purged = len(cache)
+    cache.clear()
+
+    return dict(purged=purged)
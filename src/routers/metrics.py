@@ -0,0 +1,19 @@
+"""Модуль маршрута метрик"""
+
+from fastapi import APIRouter, HTTPException, Response
+
+from services.config import MetricsConfig
+from services.metrics import METRICS_CONTENT_TYPE, render_metrics
+
+
+metrics_router = APIRouter()
+
+
+@metrics_router.get('/metrics', include_in_schema=False)
+async def get_metrics() -> Response:
+    """Получение метрик процесса в формате Prometheus"""
+
+    if not MetricsConfig.enabled:
+        raise HTTPException(status_code=404)
+
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
@@ -1,22 +1,60 @@
 """Модуль маршрутов отчетов"""
 
-from fastapi import APIRouter, Depends
-from fastui import FastUI, AnyComponent
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from fastui import FastUI
+
+from schemas.forms import ExportFormats
+from services.etag import make_etag, etag_headers, check_not_modified
+from services.export import EXPORT_MEDIA_TYPES, EXPORT_EXTENSIONS
 from services.reports import ReportsService
+from ui.response import FastUIResponse
 
 
 report_router = APIRouter(prefix="/api/reports")
 
 
 @report_router.get('/', response_model=FastUI, response_model_exclude_none=True)
-def get_reports(page: int = 1, page_size: int = 10, report_service: ReportsService = Depends()) -> list[AnyComponent]:
+async def get_reports(page: int = 1, page_size: int = 10, report_service: ReportsService = Depends()) -> FastUIResponse:
     """Получение списка отчетов"""
 
-    return report_service.get_reports_view(page, page_size)
+    return FastUIResponse(await report_service.get_reports_view(page, page_size))
 
 
 @report_router.get('/{report_id}', response_model=FastUI, response_model_exclude_none=True)
-def get_report(report_id: int, page: int = 1, page_size: int = 10, report_service: ReportsService = Depends()) -> list[AnyComponent]:
+async def get_report(report_id: int, request: Request, page_size: int = 10, report_service: ReportsService = Depends()) -> FastUIResponse:
     """Получение отчета по идентификатору"""
 
-    return report_service.get_report_view(report_id, page, page_size)
+    etag = make_etag(await report_service.get_report_digest(report_id), request)
+    if not_modified := check_not_modified(request, etag):
+        return not_modified
+
+    return FastUIResponse(await report_service.get_report_view(report_id, page_size, request.query_params), headers=etag_headers(etag))
+
+
+@report_router.get('/{report_id}/projects/{project_id}', response_model=FastUI, response_model_exclude_none=True)
+async def get_report_project(report_id: int, project_id: int, request: Request, page: int = 1, page_size: int = 10, sort: str = 'score', expand: bool = False, report_query: str = '', report_service: ReportsService = Depends()) -> FastUIResponse:
+    """Получение таблицы затронутых пакетов проекта из отчета"""
+
+    # Подробности уязвимостей меняются независимо от отчета, поэтому ETag для них не формируется.
+    if expand:
+        return FastUIResponse(await report_service.get_report_project_view(report_id, project_id, page, page_size, sort, expand, report_query))
+
+    etag = make_etag(await report_service.get_report_digest(report_id), request)
+    if not_modified := check_not_modified(request, etag):
+        return not_modified
+
+    return FastUIResponse(await report_service.get_report_project_view(report_id, project_id, page, page_size, sort, report_query=report_query), headers=etag_headers(etag))
+
+
+@report_router.get('/{report_id}/export')
+async def export_report(report_id: int, format: ExportFormats = ExportFormats.csv, report_service: ReportsService = Depends()) -> StreamingResponse:
+    """Потоковая выгрузка отчета в CSV, JSON Lines или CycloneDX VEX"""
+
+    return StreamingResponse(
+        await report_service.export_report(report_id, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={
+            'Content-Disposition': f'attachment; filename="report-{report_id}.{EXPORT_EXTENSIONS[format]}"',
+        },
+    )
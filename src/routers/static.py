@@ -0,0 +1,23 @@
+"""Модуль маршрутов статических файлов"""
+
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from services.config import StaticConfig
+from ui.assets import FastUIAssets
+
+
+static_router = APIRouter(prefix=StaticConfig.assets_url_prefix)
+
+# Локальная копия сборки FastUI, None при загрузке сборки с CDN.
+fastui_assets = FastUIAssets.load()
+
+
+@static_router.get('/{digest}/{name:path}')
+async def get_fastui_asset(digest: str, name: str, request: Request) -> Response:
+    """Получение файла локальной копии сборки FastUI"""
+
+    content = fastui_assets.get(digest, name) if fastui_assets else None
+    if content is None:
+        raise HTTPException(status_code=404)
+
+    return content.response(request)
@@ -0,0 +1,35 @@
+"""Модуль маршрутов сопоставления версий пакетов с уязвимостями"""
+
+from fastapi import APIRouter, HTTPException
+from fastapi.params import Depends
+
+from schemas.models import PackageMatchesDTO, PackageVersionDTO
+from services.config import VersionIndexConfig
+from services.versions import VersionsService
+
+
+versions_router = APIRouter(prefix="/api/versions")
+
+
+@versions_router.get('/match')
+async def match_package(type: str, name: str, version: str, vendor: str | None = None, versions_service: VersionsService = Depends()) -> PackageMatchesDTO:
+    """Поиск уязвимостей версии пакета"""
+
+    if not VersionIndexConfig.enabled:
+        raise HTTPException(status_code=404)
+
+    result = (await versions_service.match_packages([PackageVersionDTO(type=type, name=name, version=version, vendor=vendor)]))[0]
+    if result.error is not None:
+        raise HTTPException(status_code=422, detail=result.error)
+
+    return result
+
+
+@versions_router.post('/match')
+async def match_packages(packages: list[PackageVersionDTO], versions_service: VersionsService = Depends()) -> list[PackageMatchesDTO]:
+    """Поиск уязвимостей версий пакетов, например всех пакетов lock-файла"""
+
+    if not VersionIndexConfig.enabled:
+        raise HTTPException(status_code=404)
+
+    return await versions_service.match_packages(packages)
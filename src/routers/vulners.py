@@ -1,21 +1,49 @@
 """Модуль маршрутов базы уязвимостей"""
 
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from fastapi.params import Depends
-from fastui import FastUI, AnyComponent
+from fastui import FastUI
 
+from services.etag import make_etag, etag_headers, check_not_modified
 from services.vulners import VulnersService
+from ui.response import FastUIResponse
 
 
 vulners_router = APIRouter(prefix="/api/vulners")
 
 
 @vulners_router.get('/', response_model=FastUI, response_model_exclude_none=True)
-def get_vulners(page: int = 1, page_size: int = 7, vulner_service: VulnersService = Depends()) -> list[AnyComponent]:
-    return vulner_service.get_view_vulners(page, page_size)
+async def get_vulners(request: Request, page: int = 1, page_size: int = 7, vulner_service: VulnersService = Depends()) -> FastUIResponse:
+    etag = make_etag(await vulner_service.get_vulners_digest(page, page_size), request)
+    if not_modified := check_not_modified(request, etag):
+        return not_modified
+
+    return FastUIResponse(await vulner_service.get_view_vulners(page, page_size), headers=etag_headers(etag))
 
 
 @vulners_router.get('/{item_id}', response_model=FastUI, response_model_exclude_none=True)
-def get_vulner_data(item_id: str, vulner_service: VulnersService = Depends()) -> list[AnyComponent]:
-    return vulner_service.get_view_vulner(item_id)
+async def get_vulner_data(item_id: str, request: Request, affected_page: int = 1, references_page: int = 1, vulner_service: VulnersService = Depends()) -> FastUIResponse:
+    etag = make_etag(await vulner_service.get_vulner_digest(item_id), request)
+    if not_modified := check_not_modified(request, etag):
+        return not_modified
+
+    return FastUIResponse(await vulner_service.get_view_vulner(item_id, affected_page, references_page), headers=etag_headers(etag))
+
+
+@vulners_router.get('/{item_id}/affected', response_model=FastUI, response_model_exclude_none=True)
+async def get_vulner_affected(item_id: str, request: Request, page: int = 1, page_size: int = 10, vulner_service: VulnersService = Depends()) -> FastUIResponse:
+    etag = make_etag(await vulner_service.get_vulner_digest(item_id), request)
+    if not_modified := check_not_modified(request, etag):
+        return not_modified
+
+    return FastUIResponse(await vulner_service.get_view_vulner_affected(item_id, page, page_size), headers=etag_headers(etag))
+
+
+@vulners_router.get('/{item_id}/references', response_model=FastUI, response_model_exclude_none=True)
+async def get_vulner_references(item_id: str, request: Request, page: int = 1, page_size: int = 10, vulner_service: VulnersService = Depends()) -> FastUIResponse:
+    etag = make_etag(await vulner_service.get_vulner_digest(item_id), request)
+    if not_modified := check_not_modified(request, etag):
+        return not_modified
+
+    return FastUIResponse(await vulner_service.get_view_vulner_references(item_id, page, page_size), headers=etag_headers(etag))
@@ -16,6 +16,11 @@ class ProjectTypes(Enum):
     golang = 'golang'
     javascript = 'javascript'
 
+class ExportFormats(Enum):
+    csv = 'csv'
+    jsonl = 'jsonl'
+    vex = 'vex'
+
 class ProjectScanConfAddForm(BaseModel):
     name: str
     type: ProjectTypes
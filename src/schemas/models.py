@@ -1,5 +1,7 @@
 """Модуль с моделями данных"""
 
+from typing import NamedTuple
+
 from fastui import components as c
 from pydantic import BaseModel
 
@@ -41,6 +43,17 @@ class ScanConfigGetDTO(ScanConfigAddDTO):
     id: int
     projects: list[ProjectConfigGetDTO]
 
+class ScanConfigListDTO(BaseModel):
+    id: int
+    name: str
+    host: str
+    user: str
+    date: str | None = None
+
+class ScanConfigsListGetDTO(BaseModel):
+    configs: list[ScanConfigListDTO]
+    count: int
+
 class TableScanConfigDTO(BaseModel):
     id: c.Link
     name: str
@@ -119,6 +132,10 @@ class ReportGetDTO(BaseModel):
     created_at: str | None
     scan_config_id: int
 
+class ReportsGetDTO(BaseModel):
+    reports: list[ReportGetDTO]
+    count: int
+
 class TableReportDTO(BaseModel):
     report_id: c.Link
     created_at: str
@@ -142,11 +159,76 @@ class TableAffectWithVulnerDTO(AffectedDTO):
     score: float | None = None
     severity: str | None = None
 
+class AffectRow:
+    """
+    Компактная строка затронутого пакета в отчете
+
+    Хранит только поля, нужные таблицам и сортировкам отчета. Условия
+    и границы диапазона версий хранятся одним кортежем, одинаковые строки
+    и диапазоны разделяются между строками отчета.
+    """
+
+    __slots__ = ('name', 'vendor', 'type', 'range', 'vulner', 'score', 'severity')
+
+    def __init__(
+            self,
+            name: str,
+            vendor: str,
+            type: str,
+            range: tuple[str, str, str, str],
+            vulner: str,
+            score: float | None,
+            severity: str | None,
+    ):
+        """
+        :param name: Имя пакета
+        :param vendor: Имя вендора
+        :param type: Тип пакета
+        :param range: Диапазон версий: start_condition, start_value, end_value, end_condition
+        :param vulner: Глобальный идентификатор уязвимости
+        :param score: Наибольшая оценка уязвимости
+        :param severity: Уровень угрозы наибольшей оценки
+        """
+
+        self.name = name
+        self.vendor = vendor
+        self.type = type
+        self.range = range
+        self.vulner = vulner
+        self.score = score
+        self.severity = severity
+
+    @property
+    def start_condition(self) -> str:
+        return self.range[0]
+
+    @property
+    def start_value(self) -> str:
+        return self.range[1]
+
+    @property
+    def end_value(self) -> str:
+        return self.range[2]
+
+    @property
+    def end_condition(self) -> str:
+        return self.range[3]
+
+class ReportProjectRows(NamedTuple):
+    """Отсортированные строки затронутых пакетов проекта"""
+
+    project: ProjectConfigGetDTO
+    rows: list[AffectRow]
+
+class ReportRows(NamedTuple):
+    """Неизменяемое представление отчета для кэширования"""
+
+    report: ReportGetDTO
+    scan_config: ScanConfigGetDTO
+    projects: list[ReportProjectRows]
+    # Хэш ответа бэкенда, из которого построено представление.
+    digest: str = ''
 
-def count_vulnerable_interval(affected: AffectedGetDTO) -> str:
-    start = '[' if affected.start_condition == 'gte' else '('
-    end = ']' if affected.end_condition == 'lte' else ')'
-    return f'{start}{affected.start_value}, {affected.end_value}{end}'
 
 class TableAffectWithIntervalDTO(AffectedGetDTO):
     interval: str
@@ -169,3 +251,20 @@ class VulnersBasicsGetDTO(BaseModel):
 
 class AddItemResponseDTO(BaseModel):
     created_item_id: int
+
+class PackageVersionDTO(BaseModel):
+    type: str
+    name: str
+    version: str
+    vendor: str | None = None
+
+class VersionMatchDTO(BaseModel):
+    vulner: str
+    vendor: str
+    interval: str
+
+class PackageMatchesDTO(PackageVersionDTO):
+    matches: list[VersionMatchDTO]
+    error: str | None = None
+    # Количество уязвимостей базы, не вошедших в индекс: при ненулевом значении список может быть неполным.
+    index_missing: int = 0
@@ -0,0 +1,371 @@
+"""Модуль кэшей в памяти процесса"""
+
+import asyncio
+import logging
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+from pydantic import BaseModel
+
+from services.timing import untimed_context
+
+
+logger = logging.getLogger(__name__)
+
+def estimate_size(obj: Any) -> int:
+    """
+    Функция приблизительной оценки занимаемой объектом памяти
+
+    Обходит вложенные коллекции и pydantic модели, повторно
+    встречающиеся объекты учитываются один раз.
+
+    :param obj: Оцениваемый объект
+    :return: Размер в байтах
+    """
+
+    seen = set()
+    size = 0
+    stack = [obj]
+
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif isinstance(item, BaseModel):
+            stack.append(item.__dict__)
+        elif hasattr(item, '__slots__'):
+            stack.extend(getattr(item, slot) for slot in item.__slots__ if hasattr(item, slot))
+
+    return size
+
+
+class LRUCache:
+    """
+    LRU кэш с ограничением количества записей, объема памяти и временем жизни записей
+
+    Кэш живет в памяти одного процесса (воркера) и не разделяется между воркерами.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            max_entries: int = 128,
+            ttl: float | None = None,
+            max_bytes: int | None = None,
+            sizeof: Callable[[Any], int] = estimate_size,
+    ):
+        """
+        :param name: Имя кэша, под которым он регистрируется в `caches`
+        :param max_entries: Максимальное количество записей
+        :param ttl: Время жизни записи в секундах, None - без ограничения
+        :param max_bytes: Ограничение суммарного размера записей в байтах, None - без ограничения
+        :param sizeof: Функция оценки размера записи, используется при заданном max_bytes
+        """
+
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+
+        self._data: OrderedDict[Hashable, tuple[float | None, int, Any]] = OrderedDict()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        caches[name] = self
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        item = self._data.get(key)
+        return item is not None and (item[0] is None or item[0] > time.monotonic())
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Метод получения записи из кэша
+
+        :param key: Ключ записи
+        :param default: Значение, возвращаемое при отсутствии записи
+        :return: Значение записи
+        """
+
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return default
+
+        expires_at, _, value = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            self.pop(key)
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Метод сохранения записи в кэш
+
+        Запись, размер которой превышает max_bytes, в кэш не сохраняется.
+
+        :param key: Ключ записи
+        :param value: Значение записи
+        """
+
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        self.pop(key)
+
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        self._data[key] = (expires_at, size, value)
+        self._bytes += size
+
+        while len(self._data) > self.max_entries or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+        ):
+            _, (_, evicted_size, _) = self._data.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def pop(self, key: Hashable) -> Any:
+        """
+        Метод удаления записи из кэша
+
+        :param key: Ключ записи
+        :return: Значение удаленной записи или None
+        """
+
+        item = self._data.pop(key, None)
+        if item is None:
+            return None
+
+        self._bytes -= item[1]
+        return item[2]
+
+    def clear(self) -> None:
+        """Метод очистки кэша"""
+
+        self._data.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict[str, int | float]:
+        """
+        Метод получения статистики использования кэша
+
+        :return: Счетчики попаданий, промахов и вытеснений
+        """
+
+        requests_count = self.hits + self.misses
+
+        return dict(
+            entries=len(self._data),
+            bytes=self._bytes,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            hit_rate=self.hits / requests_count if requests_count else 0.0,
+        )
+
+
+class SingleFlight:
+    """
+    Объединение одновременных загрузок по ключу
+
+    Пока загрузка по ключу выполняется, новые вызовы ожидают ее результат,
+    а не запускают загрузку повторно. Отмена одного из ожидающих не
+    отменяет общую загрузку. Этапы загрузки не входят в Server-Timing
+    запросов, ожидающий учитывает только время ожидания.
+    """
+
+    def __init__(self, name: str):
+        """
+        :param name: Имя загружаемых данных для логов
+        """
+
+        self.name = name
+        self._tasks: dict[Hashable, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._tasks
+
+    def start(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """
+        Метод запуска загрузки, если по ключу она еще не выполняется
+
+        :param key: Ключ загрузки
+        :param loader: Функция загрузки
+        :return: Задача загрузки по ключу
+        """
+
+        task = self._tasks.get(key)
+        if task is None:
+            # Загрузка может пережить запрос, который ее запустил, поэтому
+            # ее этапы не учитываются во времени этого запроса.
+            task = asyncio.get_running_loop().create_task(loader(), context=untimed_context())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done_task: self._finish(key, done_task))
+
+        return task
+
+    async def run(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Метод ожидания загрузки по ключу с ее запуском при необходимости
+
+        :param key: Ключ загрузки
+        :param loader: Функция загрузки
+        :return: Результат загрузки
+        """
+
+        return await asyncio.shield(self.start(key, loader))
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+
+        # Ошибка забирается здесь, чтобы она не терялась, если все ожидающие были отменены.
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning('Loading %s %s failed: %r', self.name, key, task.exception())
+
+
+class StaleWhileRevalidateCache:
+    """
+    Кэш с отдачей устаревших данных и фоновым обновлением
+
+    Свежая запись отдается как есть. Устаревшая запись отдается сразу,
+    а ее обновление запускается в фоне. Фоновые загрузки (обновление
+    и упреждающая загрузка) ограничены общим бюджетом параллельности.
+    Одновременные промахи по одному ключу ожидают одну загрузку.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            max_entries: int = 128,
+            fresh_ttl: float = 30,
+            stale_ttl: float = 600,
+            max_concurrency: int = 4,
+    ):
+        """
+        :param name: Имя кэша, под которым он регистрируется в `caches`
+        :param max_entries: Максимальное количество записей
+        :param fresh_ttl: Время в секундах, в течение которого запись считается свежей
+        :param stale_ttl: Время жизни записи в секундах, после которого она не отдается
+        :param max_concurrency: Максимальное количество одновременных фоновых загрузок
+        """
+
+        self.cache = LRUCache(name, max_entries=max_entries, ttl=stale_ttl)
+        self.fresh_ttl = fresh_ttl
+        self.max_concurrency = max_concurrency
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._loading = SingleFlight(name)
+
+        self.stale_hits = 0
+        self.prefetches = 0
+        self.background_errors = 0
+
+        caches[name] = self
+
+    def __len__(self) -> int:
+        return len(self.cache)
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Метод получения записи с загрузкой при отсутствии
+
+        :param key: Ключ записи
+        :param loader: Функция загрузки значения записи
+        :return: Значение записи
+        """
+
+        item = self.cache.get(key)
+
+        if item is None:
+            return await self._loading.run(key, lambda: self._load(key, loader))
+
+        loaded_at, value = item
+        if time.monotonic() - loaded_at > self.fresh_ttl:
+            self.stale_hits += 1
+            self._load_in_background(key, loader)
+
+        return value
+
+    def prefetch(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> None:
+        """
+        Метод упреждающей фоновой загрузки записи
+
+        Загрузка пропускается, если запись уже есть в кэше или
+        бюджет фоновых загрузок исчерпан.
+
+        :param key: Ключ записи
+        :param loader: Функция загрузки значения записи
+        """
+
+        if key in self.cache or key in self._loading or self._semaphore.locked():
+            return
+
+        self.prefetches += 1
+        self._load_in_background(key, loader)
+
+    def _load_in_background(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> None:
+        self._loading.start(key, lambda: self._load(key, loader, background=True))
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], background: bool = False) -> Any:
+        try:
+            if background:
+                async with self._semaphore:
+                    value = await loader()
+            else:
+                value = await loader()
+        except Exception:
+            if background:
+                self.background_errors += 1
+            raise
+
+        self.cache.set(key, (time.monotonic(), value))
+        return value
+
+    def clear(self) -> None:
+        """Метод очистки кэша"""
+
+        self.cache.clear()
+
+    def stats(self) -> dict[str, int | float]:
+        """
+        Метод получения статистики использования кэша
+
+        :return: Счетчики базового кэша, устаревших попаданий и фоновых загрузок
+        """
+
+        return dict(
+            **self.cache.stats(),
+            stale_hits=self.stale_hits,
+            prefetches=self.prefetches,
+            background_errors=self.background_errors,
+            loading=len(self._loading),
+        )
+
+
+# Реестр всех кэшей процесса по имени.
+caches: dict[str, LRUCache | StaleWhileRevalidateCache] = {}
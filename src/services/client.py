@@ -0,0 +1,299 @@
+"""Модуль HTTP клиента бэкенд сервиса"""
+
+import functools
+import re
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+import httpx
+from fastapi import HTTPException
+
+from services.cache import SingleFlight
+from services.config import BackendClientConfig, BackendServiceConfig
+from services.metrics import Counter, Histogram
+from services.timing import timed
+
+
+# Шаблоны адресов обработчиков бэкенда для меток метрик, например scan/reports/id/{id}.
+BACKEND_URL_TEMPLATES = [
+    BackendServiceConfig.get_reports_url(),
+    BackendServiceConfig.get_report_url('{id}'),
+    BackendServiceConfig.get_vulners_url(),
+    BackendServiceConfig.get_vulner_url('{id}'),
+    BackendServiceConfig.get_config_url('{id}'),
+    BackendServiceConfig.get_configs_url(),
+    BackendServiceConfig.add_configs_url(),
+    BackendServiceConfig.add_project_config_url(),
+    BackendServiceConfig.get_project_config_url('{id}'),
+    BackendServiceConfig.run_scanner_url('{id}'),
+]
+BACKEND_URL_PATTERNS = [
+    (re.compile(re.escape(template).replace(re.escape('{id}'), '[^/]+')), template)
+    for template in BACKEND_URL_TEMPLATES
+]
+# Метка адреса, не соответствующего ни одному шаблону.
+UNKNOWN_BACKEND_URL = 'other'
+
+backend_request_duration = Histogram(
+    'dpss_backend_request_duration_seconds',
+    'Backend request latency until response headers by URL template',
+    ('method', 'url'),
+)
+backend_responses = Counter(
+    'dpss_backend_responses_total',
+    'Backend responses by URL template and status code',
+    ('method', 'url', 'status'),
+)
+backend_errors = Counter(
+    'dpss_backend_errors_total',
+    'Backend requests failed without a response by URL template and error type',
+    ('method', 'url', 'error'),
+)
+backend_coalesced = Counter(
+    'dpss_backend_coalesced_requests_total',
+    'GET requests served by an identical backend request already in flight',
+    ('url',),
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def backend_url_template(url: str) -> str:
+    """
+    Функция получения шаблона адреса обработчика бэкенда
+
+    :param url: URL адрес обработчика бэкенда
+    :return: Шаблон адреса без адреса сервиса, например scan/reports/id/{id}
+    """
+
+    for pattern, template in BACKEND_URL_PATTERNS:
+        if pattern.fullmatch(url):
+            return template.removeprefix(BackendServiceConfig.service_url(''))
+
+    return UNKNOWN_BACKEND_URL
+
+
+def check_backend_status(response: httpx.Response) -> None:
+    """
+    Функция проверки статуса ответа бэкенда
+
+    Ответ 404 передается клиенту как 404, остальные неуспешные
+    ответы - как 502, чтобы ошибка бэкенда не выглядела пустыми данными.
+
+    :param response: Ответ бэкенда
+    """
+
+    if response.status_code == 404:
+        raise HTTPException(status_code=404, detail='Запись не найдена')
+    if not response.is_success:
+        raise HTTPException(status_code=502, detail=f'Бэкенд вернул статус {response.status_code}')
+
+
+class BackendClient:
+    """
+    Общий асинхронный клиент бэкенд сервиса
+
+    Держит один пул keep-alive соединений на процесс, поэтому запросы
+    страниц не открывают новое TCP соединение к бэкенду на каждый вызов.
+    Одновременные одинаковые GET запросы объединяются в один вызов бэкенда.
+    """
+
+    def __init__(self):
+        self._client: httpx.AsyncClient | None = None
+        self._inflight = SingleFlight('backend GET')
+
+        self.get_requests = 0
+        self.coalesced_requests = 0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        Экземпляр httpx клиента, создается при первом обращении
+
+        :return: Асинхронный httpx клиент
+        """
+
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=BackendClientConfig.max_connections,
+                    max_keepalive_connections=BackendClientConfig.max_keepalive_connections,
+                    keepalive_expiry=BackendClientConfig.keepalive_expiry,
+                ),
+                timeout=httpx.Timeout(
+                    connect=BackendClientConfig.connect_timeout,
+                    read=BackendClientConfig.read_timeout,
+                    write=BackendClientConfig.write_timeout,
+                    pool=BackendClientConfig.pool_timeout,
+                ),
+            )
+
+        return self._client
+
+    async def close(self) -> None:
+        """Метод закрытия пула соединений"""
+
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def get(
+            self,
+            url: str,
+            params: dict[str, Any] | None = None,
+            headers: dict[str, str] | None = None,
+            timeout: float | None = None,
+    ) -> httpx.Response:
+        """
+        Метод выполнения GET запроса к бэкенду
+
+        Если такой же запрос уже выполняется, вызывающий получает его результат
+        без повторного обращения к бэкенду. Таймаут в этом случае берется
+        из первого запроса. Неуспешный ответ не отдается вызывающему,
+        см. check_backend_status.
+
+        :param url: URL адрес обработчика бэкенда
+        :param params: Параметры строки запроса
+        :param headers: Заголовки запроса
+        :param timeout: Таймаут запроса в секундах, по умолчанию из настроек клиента
+        :return: Ответ бэкенда
+        """
+
+        key = (
+            url,
+            tuple(sorted((params or {}).items())),
+            tuple(sorted((headers or {}).items())),
+        )
+
+        self.get_requests += 1
+        if key in self._inflight:
+            self.coalesced_requests += 1
+            backend_coalesced.inc(backend_url_template(url))
+
+        with timed('backend'):
+            response = await self._inflight.run(
+                key,
+                lambda: self._request(
+                    method='GET',
+                    url=url,
+                    params=params,
+                    headers=headers,
+                    timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+                ),
+            )
+
+        check_backend_status(response)
+        return response
+
+    async def _request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Метод выполнения запроса к бэкенду с учетом в метриках
+
+        :param method: HTTP метод
+        :param url: URL адрес обработчика бэкенда
+        :param kwargs: Параметры httpx.AsyncClient.request
+        :return: Ответ бэкенда
+        """
+
+        template = backend_url_template(url)
+        start = time.perf_counter()
+
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError as error:
+            backend_errors.inc(method, template, type(error).__name__)
+            raise
+        finally:
+            backend_request_duration.observe(time.perf_counter() - start, method, template)
+
+        backend_responses.inc(method, template, str(response.status_code))
+        return response
+
+    def stats(self) -> dict[str, int]:
+        """
+        Метод получения статистики объединения запросов
+
+        :return: Количество GET запросов, объединенных запросов и запросов в процессе выполнения
+        """
+
+        return dict(
+            get_requests=self.get_requests,
+            coalesced_requests=self.coalesced_requests,
+            inflight_requests=len(self._inflight),
+        )
+
+    @asynccontextmanager
+    async def stream(
+            self,
+            url: str,
+            params: dict[str, Any] | None = None,
+            headers: dict[str, str] | None = None,
+            timeout: float | None = None,
+    ) -> AsyncIterator[httpx.Response]:
+        """
+        Метод выполнения GET запроса к бэкенду с потоковым чтением ответа
+
+        Тело ответа не загружается в память целиком, его блоки
+        читаются через response.aiter_bytes(). Запросы не объединяются.
+        Неуспешный ответ не отдается вызывающему, см. check_backend_status.
+
+        :param url: URL адрес обработчика бэкенда
+        :param params: Параметры строки запроса
+        :param headers: Заголовки запроса
+        :param timeout: Таймаут запроса в секундах, по умолчанию из настроек клиента
+        :return: Ответ бэкенда с непрочитанным телом
+        """
+
+        template = backend_url_template(url)
+        start = time.perf_counter()
+
+        try:
+            async with self.client.stream(
+                method='GET',
+                url=url,
+                params=params,
+                headers=headers,
+                timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+            ) as response:
+                backend_request_duration.observe(time.perf_counter() - start, 'GET', template)
+                backend_responses.inc('GET', template, str(response.status_code))
+                check_backend_status(response)
+                yield response
+        except httpx.HTTPError as error:
+            # Учитываются и ошибки чтения тела ответа.
+            backend_errors.inc('GET', template, type(error).__name__)
+            raise
+
+    async def post(
+            self,
+            url: str,
+            json: Any = None,
+            headers: dict[str, str] | None = None,
+            timeout: float | None = None,
+    ) -> httpx.Response:
+        """
+        Метод выполнения POST запроса к бэкенду
+
+        Неуспешный ответ не отдается вызывающему, см. check_backend_status.
+
+        :param url: URL адрес обработчика бэкенда
+        :param json: Тело запроса
+        :param headers: Заголовки запроса
+        :param timeout: Таймаут запроса в секундах, по умолчанию из настроек клиента
+        :return: Ответ бэкенда
+        """
+
+        with timed('backend'):
+            response = await self._request(
+                method='POST',
+                url=url,
+                json=json,
+                headers=headers,
+                timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+            )
+
+        check_backend_status(response)
+        return response
+
+
+backend_client = BackendClient()
@@ -3,6 +3,33 @@
 import os
 
 
+def available_cpus() -> int:
+    """
+    Функция получения количества процессоров, доступных процессу
+
+    В отличие от os.cpu_count() учитывает привязку процесса к процессорам
+    и квоту CPU cgroup v2, поэтому в контейнере возвращает выделенные
+    контейнеру процессоры, а не процессоры хоста.
+
+    :return: Количество доступных процессоров, не меньше 1
+    """
+
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as file:
+            quota, period = file.read().split()
+        if quota != 'max':
+            cpus = min(cpus, int(quota) // int(period))
+    except (OSError, ValueError):
+        pass
+
+    return max(cpus, 1)
+
+
 class BackendServiceConfig:
     """Класс настроек бэкенд сервиса"""
 
@@ -56,6 +83,74 @@ class BackendServiceConfig:
         return cls.service_url(f'scan/run/{item_id}')
 
 
+class ServerConfig:
+    """Класс настроек запуска HTTP сервера фронтенд сервиса"""
+
+    host = os.getenv('SERVER_HOST', '0.0.0.0')
+    port = int(os.getenv('SERVER_PORT', 8000))
+    # Каждый воркер держит свои кэши отчетов и уязвимостей и свой индекс версий,
+    # поэтому по умолчанию воркеров не больше max_default_workers.
+    max_default_workers = 4
+    workers = int(os.getenv('SERVER_WORKERS', min(available_cpus(), max_default_workers)))
+
+    # Режим разработки: один воркер, перезапуск при изменении файлов, отладочные логи.
+    reload = os.getenv('SERVER_RELOAD', 'false').lower() in ('1', 'true', 'yes')
+
+    loop = os.getenv('SERVER_LOOP', 'uvloop')
+    http = os.getenv('SERVER_HTTP', 'httptools')
+    log_level = os.getenv('SERVER_LOG_LEVEL', 'info')
+    access_log = os.getenv('SERVER_ACCESS_LOG', 'false').lower() in ('1', 'true', 'yes')
+
+    backlog = int(os.getenv('SERVER_BACKLOG', 2048))
+    timeout_keep_alive = int(os.getenv('SERVER_TIMEOUT_KEEP_ALIVE', 5))
+    timeout_graceful_shutdown = int(os.getenv('SERVER_TIMEOUT_GRACEFUL_SHUTDOWN', 30))
+
+    # Нулевые значения отключают ограничения.
+    limit_concurrency = int(os.getenv('SERVER_LIMIT_CONCURRENCY', 0)) or None
+    limit_max_requests = int(os.getenv('SERVER_LIMIT_MAX_REQUESTS', 0)) or None
+
+
+class StaticConfig:
+    """Класс настроек отдачи HTML оболочки и статических файлов"""
+
+    # Оболочка всегда перепроверяется браузером, ответ 304 не содержит тела.
+    shell_cache_control = os.getenv('STATIC_SHELL_CACHE_CONTROL', 'no-cache')
+
+    # Источник JS/CSS сборки FastUI: local - локальная копия, cdn - публичный CDN,
+    # auto - локальная копия при ее наличии.
+    assets_mode = os.getenv('STATIC_ASSETS_MODE', 'auto')
+    assets_dir = os.getenv(
+        'STATIC_ASSETS_DIR',
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static', 'fastui'),
+    )
+    assets_url_prefix = '/static/fastui'
+    # Версия сборки FastUI (npm пакет @pydantic/fastui-prebuilt), соответствующая
+    # пакету fastui из requirements.txt. Закреплена здесь, чтобы CDN и локальная
+    # копия не зависели от внутренних атрибутов пакета fastui.
+    assets_version = '0.0.24'
+    assets_cdn_url = os.getenv(
+        'STATIC_ASSETS_CDN_URL',
+        f'https://cdn.jsdelivr.net/npm/@pydantic/fastui-prebuilt@{assets_version}/dist/assets',
+    )
+    # Список всех файлов сборки для локальной копии.
+    assets_files_url = f'https://data.jsdelivr.com/v1/packages/npm/@pydantic/fastui-prebuilt@{assets_version}?structure=flat'
+    # Адреса файлов содержат хэш содержимого, поэтому файлы кэшируются навсегда.
+    assets_cache_control = os.getenv('STATIC_ASSETS_CACHE_CONTROL', 'public, max-age=31536000, immutable')
+
+
+class BackendClientConfig:
+    """Класс настроек HTTP клиента бэкенд сервиса"""
+
+    max_connections = int(os.getenv('BACKEND_CLIENT_MAX_CONNECTIONS', 100))
+    max_keepalive_connections = int(os.getenv('BACKEND_CLIENT_MAX_KEEPALIVE_CONNECTIONS', 20))
+    keepalive_expiry = float(os.getenv('BACKEND_CLIENT_KEEPALIVE_EXPIRY', 30))
+
+    connect_timeout = float(os.getenv('BACKEND_CLIENT_CONNECT_TIMEOUT', 3))
+    read_timeout = float(os.getenv('BACKEND_CLIENT_READ_TIMEOUT', 30))
+    write_timeout = float(os.getenv('BACKEND_CLIENT_WRITE_TIMEOUT', 30))
+    pool_timeout = float(os.getenv('BACKEND_CLIENT_POOL_TIMEOUT', 5))
+
+
 class FrontendServiceConfig:
     """Класс настроек фронтенд сервиса"""
 
@@ -67,6 +162,14 @@ class FrontendServiceConfig:
     def get_vulners(cls):
         return f'/vulners/'
 
+    @classmethod
+    def get_vulner_affected(cls, item_id: str):
+        return f'/vulners/{item_id}/affected'
+
+    @classmethod
+    def get_vulner_references(cls, item_id: str):
+        return f'/vulners/{item_id}/references'
+
     @classmethod
     def get_report(cls, item_id: int):
         return f'/reports/{item_id}'
@@ -75,6 +178,14 @@ class FrontendServiceConfig:
     def get_reports(cls):
         return '/reports/'
 
+    @classmethod
+    def get_report_project(cls, report_id: int, project_id: int):
+        return f'/reports/{report_id}/projects/{project_id}'
+
+    @classmethod
+    def get_report_export_url(cls, report_id: int, export_format: str):
+        return f'/api/reports/{report_id}/export?format={export_format}'
+
     @classmethod
     def get_scan_configs(cls):
         return f'/scan/configs/'
@@ -110,3 +221,87 @@ class FrontendServiceConfig:
     @classmethod
     def submit_add_project_config_url(cls, conf_id: int):
         return f'/api/scan/configs/{conf_id}/add_project'
+
+
+class CacheConfig:
+    """Класс настроек кэшей фронтенд сервиса"""
+
+    # Время жизни полного списка отчетов, если бэкенд не поддерживает пагинацию.
+    reports_list_ttl = float(os.getenv('CACHE_REPORTS_LIST_TTL', 30))
+
+    # Время жизни списка конфигураций сканирования.
+    scan_configs_ttl = float(os.getenv('CACHE_SCAN_CONFIGS_TTL', 10))
+
+    # Кэш строк завершенных отчетов.
+    report_rows_max_entries = int(os.getenv('CACHE_REPORT_ROWS_MAX_ENTRIES', 64))
+    report_rows_max_bytes = int(os.getenv('CACHE_REPORT_ROWS_MAX_BYTES', 256 * 1024 * 1024))
+
+    # Кэш подробной информации об уязвимостях.
+    vulners_ttl = float(os.getenv('CACHE_VULNERS_TTL', 600))
+    vulners_max_entries = int(os.getenv('CACHE_VULNERS_MAX_ENTRIES', 2048))
+    vulners_max_bytes = int(os.getenv('CACHE_VULNERS_MAX_BYTES', 64 * 1024 * 1024))
+
+    # Кэш страниц базы уязвимостей с фоновым обновлением.
+    vulners_list_fresh_ttl = float(os.getenv('CACHE_VULNERS_LIST_FRESH_TTL', 30))
+    vulners_list_stale_ttl = float(os.getenv('CACHE_VULNERS_LIST_STALE_TTL', 600))
+    vulners_list_max_entries = int(os.getenv('CACHE_VULNERS_LIST_MAX_ENTRIES', 256))
+    vulners_list_max_concurrency = int(os.getenv('CACHE_VULNERS_LIST_MAX_CONCURRENCY', 4))
+
+
+class ReportsConfig:
+    """Класс настроек страниц отчетов"""
+
+    # Количество одновременных загрузок уязвимостей в режиме подробностей секции проекта.
+    expand_max_concurrency = int(os.getenv('REPORT_EXPAND_MAX_CONCURRENCY', 10))
+
+
+class VersionIndexConfig:
+    """Класс настроек построения индекса диапазонов уязвимых версий"""
+
+    # Построение индекса в фоне при запуске и маршруты /api/versions. Каждый воркер
+    # загружает всю базу уязвимостей, поэтому по умолчанию выключено.
+    enabled = os.getenv('VERSION_INDEX_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+    # Интервал перестроения индекса, с.
+    refresh_interval = float(os.getenv('VERSION_INDEX_REFRESH_INTERVAL', 3600))
+    # Интервал повтора после неудачного построения, с. Удваивается после каждой
+    # следующей неудачи, но не превышает refresh_interval.
+    retry_interval = float(os.getenv('VERSION_INDEX_RETRY_INTERVAL', 60))
+    # Количество попыток загрузки каждой уязвимости при построении и пауза перед
+    # второй попыткой, с (удваивается для следующих).
+    load_attempts = int(os.getenv('VERSION_INDEX_LOAD_ATTEMPTS', 3))
+    load_retry_delay = float(os.getenv('VERSION_INDEX_LOAD_RETRY_DELAY', 1))
+    # Доля уязвимостей, которые можно не загрузить: индекс без них используется,
+    # а при большей доле построение считается неудачным.
+    max_missing_ratio = float(os.getenv('VERSION_INDEX_MAX_MISSING_RATIO', 0.01))
+    # Индекс старше указанного времени, с, не используется.
+    max_age = float(os.getenv('VERSION_INDEX_MAX_AGE', 86400))
+    # Размер страницы списка уязвимостей при загрузке базы.
+    page_size = int(os.getenv('VERSION_INDEX_PAGE_SIZE', 100))
+    # Количество одновременных загрузок подробностей уязвимостей.
+    max_concurrency = int(os.getenv('VERSION_INDEX_MAX_CONCURRENCY', 10))
+
+
+class ValidationConfig:
+    """Класс настроек валидации ответов бэкенда"""
+
+    # strict - полная проверка схемы каждого ответа, sampled - полная проверка
+    # каждого sample_rate-го ответа, trusted - проверки, не нужные для построения
+    # страниц, не выполняются.
+    mode = os.getenv('VALIDATION_MODE', 'strict')
+    sample_rate = int(os.getenv('VALIDATION_SAMPLE_RATE', 100))
+
+
+class MetricsConfig:
+    """Класс настроек метрик в формате Prometheus"""
+
+    # Учет HTTP запросов и маршрут /metrics.
+    enabled = os.getenv('METRICS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    # Интервал измерения задержки цикла событий в секундах.
+    event_loop_interval = float(os.getenv('METRICS_EVENT_LOOP_INTERVAL', 0.5))
+
+
+class TimingConfig:
+    """Класс настроек измерения этапов обработки запросов"""
+
+    # Заголовок Server-Timing с временем этапов и отладочные логи этапов.
+    enabled = os.getenv('SERVER_TIMING_ENABLED', 'true').lower() in ('1', 'true', 'yes')
@@ -0,0 +1,125 @@
+"""Модуль условных запросов (ETag / If-None-Match)"""
+
+import hashlib
+import os
+
+from fastapi import Request, Response
+
+
+def source_digest(directory: str) -> str:
+    """
+    Функция вычисления хэша исходного кода сервиса
+
+    Хэш входит в ETag ответов API, поэтому после обновления сервиса
+    ранее выданные ETag перестают совпадать и страницы строятся заново.
+
+    :param directory: Каталог исходного кода
+    :return: Хэш содержимого всех .py файлов каталога
+    """
+
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith('.py'):
+                with open(os.path.join(root, name), 'rb') as file:
+                    digest.update(file.read())
+
+    return digest.hexdigest()
+
+
+APP_DIGEST = source_digest(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Ответы с ETag всегда перепроверяются браузером.
+API_CACHE_CONTROL = 'no-cache'
+
+
+def payload_hasher() -> 'hashlib._Hash':
+    """
+    Функция создания объекта для вычисления хэша ответа бэкенда по блокам
+
+    :return: Объект хэша, результат совпадает с payload_digest
+    """
+
+    return hashlib.sha256()
+
+
+def payload_digest(content: bytes) -> str:
+    """
+    Функция вычисления хэша ответа бэкенда
+
+    :param content: Тело ответа бэкенда
+    :return: Хэш тела ответа
+    """
+
+    hasher = payload_hasher()
+    hasher.update(content)
+    return hasher.hexdigest()
+
+
+def make_etag(digest: str, request: Request) -> str:
+    """
+    Функция формирования ETag ответа API
+
+    ETag зависит от данных бэкенда, адреса и параметров страницы
+    и версии исходного кода сервиса.
+
+    :param digest: Хэш данных бэкенда, из которых строится ответ
+    :param request: Запрос клиента
+    :return: Значение заголовка ETag
+    """
+
+    etag = hashlib.sha256(APP_DIGEST.encode())
+    etag.update(digest.encode())
+    etag.update(request.url.path.encode())
+    for name, value in sorted(request.query_params.multi_items()):
+        etag.update(f'\0{name}={value}'.encode())
+
+    return f'"{etag.hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: str, etags: set[str]) -> bool:
+    """
+    Функция проверки заголовка If-None-Match
+
+    :param if_none_match: Значение заголовка If-None-Match
+    :param etags: ETag актуального содержимого
+    :return: Клиент уже имеет актуальное содержимое
+    """
+
+    if if_none_match.strip() == '*':
+        return True
+
+    # Сравнение слабое, как требует RFC 9110 для If-None-Match.
+    tags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+    return not tags.isdisjoint(etags)
+
+
+def etag_headers(etag: str) -> dict[str, str]:
+    """
+    Функция формирования заголовков ответа API с ETag
+
+    :param etag: ETag ответа
+    :return: Заголовки ETag и Cache-Control
+    """
+
+    return {'ETag': etag, 'Cache-Control': API_CACHE_CONTROL}
+
+
+def check_not_modified(request: Request, etag: str) -> Response | None:
+    """
+    Функция обработки условного запроса к API
+
+    Если клиент уже имеет актуальную версию, возвращается ответ 304,
+    который маршрут отдает вместо построения страницы.
+
+    :param request: Запрос клиента
+    :param etag: ETag актуальной версии ответа
+    :return: Ответ 304 или None, если страницу нужно построить
+    """
+
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match and etag_matches(if_none_match, {etag}):
+        return Response(status_code=304, headers=etag_headers(etag))
+
+    return None
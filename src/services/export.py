@@ -0,0 +1,296 @@
+"""Модуль потоковой выгрузки отчетов"""
+
+import csv
+import io
+import json
+import uuid
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator
+
+from schemas.forms import ExportFormats
+from services.utils import top_rating
+
+
+# Размер блока, которым данные отдаются клиенту.
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormats.csv: 'text/csv; charset=utf-8',
+    ExportFormats.jsonl: 'application/x-ndjson',
+    ExportFormats.vex: 'application/vnd.cyclonedx+json',
+}
+
+EXPORT_EXTENSIONS = {
+    ExportFormats.csv: 'csv',
+    ExportFormats.jsonl: 'jsonl',
+    ExportFormats.vex: 'cdx.json',
+}
+
+EXPORT_COLUMNS = (
+    'project_id',
+    'project_name',
+    'project_type',
+    'name',
+    'vendor',
+    'type',
+    'start_condition',
+    'start_value',
+    'end_value',
+    'end_condition',
+    'vulner',
+    'identifier',
+    'score',
+    'severity',
+    'vector',
+    'source_url',
+    'description',
+)
+
+# Соответствие типов проектов и типов purl.
+PURL_TYPES = {
+    'python': 'pypi',
+    'golang': 'golang',
+    'javascript': 'npm',
+}
+
+VEX_SEVERITIES = {'critical', 'high', 'medium', 'low', 'info', 'none', 'unknown'}
+
+VERS_CONDITIONS = {
+    'gte': '>=',
+    'gt': '>',
+    'lte': '<=',
+    'lt': '<',
+}
+
+# Запись выгрузки: сырые данные проекта и затронутого пакета с уязвимостью.
+ExportRecord = tuple[dict[str, Any], dict[str, Any]]
+
+
+def export_row(project: dict[str, Any], affect: dict[str, Any]) -> dict[str, Any]:
+    """
+    Функция построения плоской строки выгрузки
+
+    :param project: Данные конфигурации проекта
+    :param affect: Данные затронутого пакета и уязвимости
+    :return: Строка выгрузки
+    """
+
+    affected = affect['affected']
+    vulner = affect['vulner']
+    # Та же оценка, что в таблице отчета.
+    rating = top_rating(vulner.get('ratings'))
+
+    return dict(
+        project_id=project.get('id'),
+        project_name=project.get('name'),
+        project_type=project.get('type'),
+        name=affected.get('name'),
+        vendor=affected.get('vendor'),
+        type=affected.get('type'),
+        start_condition=affected.get('start_condition'),
+        start_value=affected.get('start_value'),
+        end_value=affected.get('end_value'),
+        end_condition=affected.get('end_condition'),
+        vulner=vulner.get('global_identifier'),
+        identifier=vulner.get('identifier'),
+        score=rating.get('score'),
+        severity=rating.get('severity'),
+        vector=rating.get('vector'),
+        source_url=vulner.get('source_url'),
+        description=vulner.get('description'),
+    )
+
+
+async def export_csv(records: AsyncIterator[ExportRecord]) -> AsyncIterator[str]:
+    """
+    Функция выгрузки отчета в CSV
+
+    :param records: Записи отчета
+    :return: Блоки CSV документа
+    """
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+
+    async for project, affect in records:
+        writer.writerow(export_row(project, affect))
+        if buffer.tell() >= EXPORT_CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
+
+
+async def export_jsonl(records: AsyncIterator[ExportRecord]) -> AsyncIterator[str]:
+    """
+    Функция выгрузки отчета в JSON Lines
+
+    :param records: Записи отчета
+    :return: Блоки JSONL документа
+    """
+
+    lines = []
+    size = 0
+
+    async for project, affect in records:
+        line = json.dumps(export_row(project, affect), ensure_ascii=False)
+        lines.append(line)
+        size += len(line)
+        if size >= EXPORT_CHUNK_SIZE:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+            size = 0
+
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+def gen_purl(affected: dict[str, Any]) -> str:
+    """
+    Функция генерации purl идентификатора пакета
+
+    :param affected: Данные затронутого пакета
+    :return: purl пакета без версии
+    """
+
+    purl_type = PURL_TYPES.get(affected.get('type'), affected.get('type') or 'generic')
+    vendor = affected.get('vendor')
+    namespace = f'{vendor}/' if vendor and purl_type != 'pypi' else ''
+    return f'pkg:{purl_type}/{namespace}{affected.get("name")}'
+
+
+def gen_vers_range(affected: dict[str, Any]) -> str:
+    """
+    Функция генерации диапазона уязвимых версий в формате vers
+
+    :param affected: Данные затронутого пакета
+    :return: Диапазон версий, например vers:pypi/>=1.0|<2.3
+    """
+
+    purl_type = PURL_TYPES.get(affected.get('type'), affected.get('type') or 'generic')
+    constraints = [
+        f'{VERS_CONDITIONS[condition]}{value}'
+        for condition, value in (
+            (affected.get('start_condition'), affected.get('start_value')),
+            (affected.get('end_condition'), affected.get('end_value')),
+        )
+        if value and condition in VERS_CONDITIONS
+    ]
+    return f'vers:{purl_type}/{"|".join(constraints) or "*"}'
+
+
+def gen_vex_rating(rating: dict[str, Any]) -> dict[str, Any]:
+    """
+    Функция преобразования оценки уязвимости в формат CycloneDX
+
+    :param rating: Данные оценки уязвимости
+    :return: Оценка уязвимости CycloneDX
+    """
+
+    method = 'other'
+    if 'cvss' in (rating.get('method') or '').lower():
+        version = rating.get('version') or 0
+        if version >= 4:
+            method = 'CVSSv4'
+        elif version >= 3.1:
+            method = 'CVSSv31'
+        elif version >= 3:
+            method = 'CVSSv3'
+        elif version >= 2:
+            method = 'CVSSv2'
+
+    severity = (rating.get('severity') or '').lower()
+
+    return dict(
+        source=dict(name=rating.get('source_name'), url=rating.get('source_url')),
+        score=rating.get('score'),
+        severity=severity if severity in VEX_SEVERITIES else 'unknown',
+        method=method,
+        vector=rating.get('vector'),
+    )
+
+
+async def export_vex(records: AsyncIterator[ExportRecord], report_id: int) -> AsyncIterator[str]:
+    """
+    Функция выгрузки отчета в CycloneDX VEX
+
+    Уязвимости выводятся по мере чтения записей, компоненты
+    (уникальные пакеты) дописываются в конце документа.
+
+    :param records: Записи отчета
+    :param report_id: Идентификатор отчета
+    :return: Блоки JSON документа CycloneDX
+    """
+
+    header = dict(
+        bomFormat='CycloneDX',
+        specVersion='1.5',
+        serialNumber=f'urn:uuid:{uuid.uuid4()}',
+        version=1,
+        metadata=dict(
+            timestamp=datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            component={'type': 'application', 'name': f'dpss-report-{report_id}', 'bom-ref': f'report-{report_id}'},
+        ),
+    )
+
+    yield json.dumps(header, ensure_ascii=False)[:-1] + ', "vulnerabilities": ['
+
+    components = {}
+    # Номер записи в проекте: один пакет и уязвимость могут встречаться
+    # в проекте несколько раз с разными диапазонами, а bom-ref должен быть уникален в документе.
+    project_rows: dict[Any, int] = {}
+    chunk = []
+    size = 0
+    separator = ''
+
+    async for project, affect in records:
+        affected = affect['affected']
+        vulner = affect['vulner']
+        purl = gen_purl(affected)
+        components.setdefault(purl, (affected.get('name'), affected.get('vendor')))
+        project_id = project.get('id')
+        project_rows[project_id] = row = project_rows.get(project_id, 0) + 1
+
+        vulnerability = {
+            'bom-ref': f'{project_id}:{row}:{purl}:{vulner.get("global_identifier")}',
+            'id': vulner.get('global_identifier'),
+            'source': dict(name=vulner.get('source_name'), url=vulner.get('source_url')),
+            'ratings': [gen_vex_rating(rating) for rating in vulner.get('ratings') or []],
+            'description': vulner.get('description'),
+            'references': [
+                dict(id=reference.get('url'), source=dict(name=reference.get('source'), url=reference.get('url')))
+                for reference in vulner.get('references') or []
+            ],
+            'affects': [dict(ref=purl, versions=[dict(range=gen_vers_range(affected), status='affected')])],
+            'analysis': dict(state='in_triage'),
+            'properties': [
+                dict(name='dpss:project', value=str(project.get('name'))),
+                dict(name='dpss:project_type', value=str(project.get('type'))),
+            ],
+        }
+
+        line = separator + json.dumps(vulnerability, ensure_ascii=False)
+        separator = ','
+        chunk.append(line)
+        size += len(line)
+        if size >= EXPORT_CHUNK_SIZE:
+            yield ''.join(chunk)
+            chunk = []
+            size = 0
+
+    yield ''.join(chunk) + '], "components": ['
+
+    yield ','.join(
+        json.dumps({
+            'type': 'library',
+            'bom-ref': purl,
+            'name': name,
+            'group': vendor,
+            'purl': purl,
+        }, ensure_ascii=False)
+        for purl, (name, vendor) in components.items()
+    )
+
+    yield ']}'
@@ -0,0 +1,402 @@
+"""Модуль метрик сервиса в текстовом формате Prometheus"""
+
+import abc
+import asyncio
+import bisect
+import math
+import time
+from typing import Any, Callable, Iterable, Iterator
+
+from anyio import to_thread
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from services.cache import caches
+
+
+# Тип содержимого ответа /metrics (text exposition format 0.0.4).
+METRICS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Границы корзин гистограмм времени (секунды) и размера (байты).
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# Экранирование значений меток: обратная косая черта, кавычка и перевод строки.
+LABEL_ESCAPES = str.maketrans({'\\': '\\\\', '"': '\\"', '\n': '\\n'})
+
+# Метка маршрута для запросов, не сопоставленных ни одному маршруту.
+UNMATCHED_ROUTE = 'unmatched'
+
+Labels = tuple[str, ...]
+Sample = tuple[str, dict[str, str], float]
+
+
+def format_value(value: float) -> str:
+    """
+    Функция форматирования значения метрики
+
+    :param value: Значение
+    :return: Значение в формате Prometheus
+    """
+
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if math.isnan(value):
+        return 'NaN'
+
+    return repr(value)
+
+
+def format_labels(labels: dict[str, str]) -> str:
+    """
+    Функция форматирования меток метрики
+
+    :param labels: Метки
+    :return: Метки в формате Prometheus, например {cache="vulners"}
+    """
+
+    if not labels:
+        return ''
+
+    return '{' + ','.join(
+        f'{name}="{value.translate(LABEL_ESCAPES)}"'
+        for name, value in labels.items()
+    ) + '}'
+
+
+class Metric(abc.ABC):
+    """
+    Базовый класс метрики
+
+    Метрики регистрируются в `registry` при создании и живут в памяти
+    одного процесса (воркера), каждый воркер отдает свои значения.
+    """
+
+    type = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Labels = ()):
+        """
+        :param name: Имя метрики
+        :param documentation: Описание метрики (HELP)
+        :param labelnames: Имена меток
+        """
+
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+
+        registry.append(self)
+
+    @abc.abstractmethod
+    def samples(self) -> Iterable[Sample]:
+        """
+        Метод получения значений метрики
+
+        :return: Суффикс имени, метки и значение каждого ряда
+        """
+
+    def render(self) -> Iterator[str]:
+        """
+        Метод формирования строк метрики в текстовом формате Prometheus
+
+        :return: Строки HELP, TYPE и рядов метрики
+        """
+
+        yield f'# HELP {self.name} {self.documentation}'
+        yield f'# TYPE {self.name} {self.type}'
+        for suffix, labels, value in self.samples():
+            yield f'{self.name}{suffix}{format_labels(labels)} {format_value(value)}'
+
+
+class Counter(Metric):
+    """Монотонно возрастающий счетчик"""
+
+    type = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Labels = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, *labels: str, value: float = 1) -> None:
+        """
+        Метод увеличения счетчика
+
+        :param labels: Значения меток в порядке labelnames
+        :param value: Величина увеличения
+        """
+
+        self._values[labels] = self._values.get(labels, 0) + value
+
+    def samples(self) -> Iterable[Sample]:
+        for labels, value in self._values.items():
+            yield '', dict(zip(self.labelnames, labels)), value
+
+
+class Gauge(Counter):
+    """Значение, которое может как расти, так и уменьшаться"""
+
+    type = 'gauge'
+
+    def dec(self, *labels: str, value: float = 1) -> None:
+        """
+        Метод уменьшения значения
+
+        :param labels: Значения меток в порядке labelnames
+        :param value: Величина уменьшения
+        """
+
+        self.inc(*labels, value=-value)
+
+    def set(self, *labels: str, value: float) -> None:
+        """
+        Метод установки значения
+
+        :param labels: Значения меток в порядке labelnames
+        :param value: Значение
+        """
+
+        self._values[labels] = value
+
+
+class CallbackGauge(Metric):
+    """Значение, вычисляемое в момент запроса метрик"""
+
+    type = 'gauge'
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            callback: Callable[[], Iterable[tuple[Labels, float]]],
+            labelnames: Labels = (),
+            metric_type: str = 'gauge',
+    ):
+        """
+        :param name: Имя метрики
+        :param documentation: Описание метрики (HELP)
+        :param callback: Функция получения значений и меток рядов
+        :param labelnames: Имена меток
+        :param metric_type: Тип метрики, counter - для накопленных счетчиков
+        """
+
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+        self.type = metric_type
+
+    def samples(self) -> Iterable[Sample]:
+        for labels, value in self.callback():
+            yield '', dict(zip(self.labelnames, labels)), value
+
+
+class Histogram(Metric):
+    """Гистограмма распределения значений по корзинам"""
+
+    type = 'histogram'
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            labelnames: Labels = (),
+            buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        """
+        :param name: Имя метрики
+        :param documentation: Описание метрики (HELP)
+        :param labelnames: Имена меток
+        :param buckets: Верхние границы корзин, корзина +Inf добавляется автоматически
+        """
+
+        super().__init__(name, documentation, labelnames)
+        self.buckets = buckets
+        # Количество значений в каждой корзине (без накопления), сумма значений.
+        self._values: dict[Labels, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        """
+        Метод учета значения
+
+        :param value: Значение
+        :param labels: Значения меток в порядке labelnames
+        """
+
+        entry = self._values.get(labels)
+        if entry is None:
+            entry = self._values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+
+        entry[0][bisect.bisect_left(self.buckets, value)] += 1
+        entry[1][0] += value
+
+    def samples(self) -> Iterable[Sample]:
+        for labels, (counts, total) in self._values.items():
+            label_values = dict(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                yield '_bucket', {**label_values, 'le': format_value(float(bound))}, cumulative
+            yield '_sum', label_values, total[0]
+            yield '_count', label_values, cumulative
+
+
+# Все метрики процесса в порядке создания.
+registry: list[Metric] = []
+
+
+def render_metrics() -> bytes:
+    """
+    Функция формирования ответа /metrics
+
+    :return: Все метрики процесса в текстовом формате Prometheus
+    """
+
+    return ('\n'.join(line for metric in registry for line in metric.render()) + '\n').encode()
+
+
+http_request_duration = Histogram(
+    'dpss_http_request_duration_seconds',
+    'HTTP request latency by route template',
+    ('method', 'route', 'status'),
+)
+http_response_size = Histogram(
+    'dpss_http_response_size_bytes',
+    'HTTP response body size by route template',
+    ('method', 'route'),
+    buckets=SIZE_BUCKETS,
+)
+http_requests_in_flight = Gauge(
+    'dpss_http_requests_in_flight',
+    'HTTP requests currently being processed',
+)
+event_loop_lag = Histogram(
+    'dpss_event_loop_lag_seconds',
+    'Delay of event loop wakeups over the scheduled time',
+    buckets=LAG_BUCKETS,
+)
+
+
+def threadpool_usage() -> Iterable[tuple[Labels, float]]:
+    """
+    Функция получения загрузки пула потоков синхронных обработчиков
+
+    :return: Количество занятых потоков и размер пула
+    """
+
+    limiter = to_thread.current_default_thread_limiter()
+    yield ('busy',), limiter.borrowed_tokens
+    yield ('max',), limiter.total_tokens
+
+
+def event_loop_tasks() -> Iterable[tuple[Labels, float]]:
+    """
+    Функция получения количества задач цикла событий
+
+    :return: Количество незавершенных задач
+    """
+
+    yield (), len(asyncio.all_tasks())
+
+
+CallbackGauge(
+    'dpss_threadpool_threads',
+    'Threads of the sync handler threadpool: busy and max',
+    threadpool_usage,
+    ('state',),
+)
+CallbackGauge(
+    'dpss_event_loop_tasks',
+    'Tasks scheduled on the event loop',
+    event_loop_tasks,
+)
+
+# Накопленные счетчики кэшей, остальные показатели кэшей отдаются как gauge.
+CACHE_COUNTER_STATS = ('hits', 'misses', 'evictions', 'stale_hits', 'prefetches', 'background_errors')
+CACHE_GAUGE_STATS = ('entries', 'bytes', 'loading')
+
+
+def cache_stat(stat: str) -> Callable[[], Iterable[tuple[Labels, float]]]:
+    """
+    Функция создания обработчика показателя всех кэшей процесса
+
+    :param stat: Показатель из stats() кэша
+    :return: Функция получения показателя по каждому кэшу
+    """
+
+    def callback() -> Iterable[tuple[Labels, float]]:
+        for name, cache in caches.items():
+            stats = cache.stats()
+            if stat in stats:
+                yield (name,), stats[stat]
+
+    return callback
+
+
+for stat in CACHE_COUNTER_STATS:
+    CallbackGauge(f'dpss_cache_{stat}_total', f'Cache {stat.replace("_", " ")}', cache_stat(stat), ('cache',), 'counter')
+for stat in CACHE_GAUGE_STATS:
+    CallbackGauge(f'dpss_cache_{stat}', f'Cache {stat}', cache_stat(stat), ('cache',))
+
+
+async def monitor_event_loop(interval: float) -> None:
+    """
+    Функция измерения задержки цикла событий
+
+    Задержка пробуждения после asyncio.sleep показывает, насколько
+    цикл событий занят синхронной работой (разбор JSON, построение страниц).
+
+    :param interval: Интервал измерений в секундах
+    """
+
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        event_loop_lag.observe(max(loop.time() - start - interval, 0.0))
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware учета HTTP запросов
+
+    Время обработки и размер ответа учитываются по шаблону маршрута,
+    например /api/reports/{report_id}, поэтому число рядов ограничено.
+    """
+
+    def __init__(self, app: ASGIApp):
+        """
+        :param app: ASGI приложение
+        """
+
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+        size = 0
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal status_code, size
+
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+            elif message['type'] == 'http.response.body':
+                size += len(message.get('body', b''))
+
+            await send(message)
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            http_requests_in_flight.dec()
+
+            # Маршрут записывается в scope при сопоставлении запроса.
+            route: Any = scope.get('route')
+            route_path = getattr(route, 'path', UNMATCHED_ROUTE)
+            http_request_duration.observe(time.perf_counter() - start, scope['method'], route_path, str(status_code))
+            http_response_size.observe(size, scope['method'], route_path)
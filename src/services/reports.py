@@ -1,46 +1,196 @@
 """Модуль сервиса работы с отчетами"""
 
-import logging
+from typing import Any, AsyncIterator, Mapping
+from urllib.parse import parse_qsl, urlencode
+
+from fastapi import HTTPException
 
-import requests
 from fastui import AnyComponent
 from fastui import components as c
 from fastui.events import GoToEvent
 from fastui.components.display import DisplayLookup
 
 from ui.base import gen_ui_link, base_page
-from services.config import BackendServiceConfig, FrontendServiceConfig
-from services.utils import fix_date_str
+from ui.tables import select_page, build_table
+from services.cache import LRUCache, SingleFlight
+from services.client import backend_client
+from services.config import BackendServiceConfig, FrontendServiceConfig, CacheConfig, ReportsConfig
+from services.etag import payload_hasher
+from services.export import ExportRecord, export_csv, export_jsonl, export_vex
+from services.stream import JsonStreamReader
+from services.timing import timed, timed_phase
+from services.validation import validate_response
+from services.utils import fix_date_str, top_rating
+from services.vulners import VulnersService, build_ratings, build_affected_table
+from schemas.forms import ExportFormats
 from schemas.models import (
     TableAffectWithVulnerDTO,
     ReportGetDTO,
+    ReportsGetDTO,
+    ReportAffectDTO,
     TableReportDTO,
-    ReportFullDTO,
+    AffectRow,
+    ReportProjectRows,
+    ReportRows,
+    ProjectConfigGetDTO,
+    ScanConfigGetDTO,
+)
+
+ALL_REPORTS_KEY = 'all'
+
+# Полный список отчетов для бэкенда без пагинации.
+reports_list_cache = LRUCache('reports_list', max_entries=1, ttl=CacheConfig.reports_list_ttl)
+
+# Компактные строки завершенных отчетов по идентификатору отчета.
+report_rows_cache = LRUCache(
+    'report_rows',
+    max_entries=CacheConfig.report_rows_max_entries,
+    max_bytes=CacheConfig.report_rows_max_bytes,
 )
 
+# Загрузки представлений отчетов, выполняющиеся в данный момент.
+report_rows_loading = SingleFlight('report')
+
+# Виды элементов потока отчета: поле отчета, конфигурация проекта, затронутый пакет.
+REPORT_FIELD = 'field'
+REPORT_PROJECT = 'project'
+REPORT_AFFECT = 'affect'
+
+# Варианты сортировки строк проекта: ключ сортировки и обратный порядок.
+AFFECT_SORTS = {
+    'score': (lambda x: (x.score is None, x.score), False),
+    'score_desc': (lambda x: (x.score is not None, x.score or 0), True),
+    'name': (lambda x: (x.name, x.vendor), False),
+    'vulner': (lambda x: x.vulner, False),
+}
+
+AFFECT_SORT_TITLES = {
+    'score': 'по возрастанию оценки',
+    'score_desc': 'по убыванию оценки',
+    'name': 'по имени пакета',
+    'vulner': 'по уязвимости',
+}
+
+
+def build_affect_row(affected: dict[str, Any], vulner: dict[str, Any], pool: dict[Any, Any]) -> AffectRow:
+    """
+    Функция построения компактной строки затронутого пакета
+
+    Повторяющиеся строки и диапазоны версий берутся из общего пула,
+    поэтому одинаковые значения хранятся в отчете один раз.
+
+    :param affected: Данные затронутого пакета
+    :param vulner: Данные уязвимости
+    :param pool: Пул уже встреченных значений отчета
+    :return: Строка затронутого пакета
+    """
+
+    version_range = (
+        affected['start_condition'],
+        affected['start_value'],
+        affected['end_value'],
+        affected['end_condition'],
+    )
+
+    rating = top_rating(vulner.get('ratings'))
+    score = float(rating['score']) if rating else None
+    severity = rating.get('severity')
+
+    return AffectRow(
+        name=pool.setdefault(affected['name'], affected['name']),
+        vendor=pool.setdefault(affected['vendor'], affected['vendor']),
+        type=pool.setdefault(affected['type'], affected['type']),
+        range=pool.setdefault(version_range, version_range),
+        vulner=pool.setdefault(vulner['global_identifier'], vulner['global_identifier']),
+        score=score,
+        severity=pool.setdefault(severity, severity),
+    )
+
+
+async def iter_report_items(reader: JsonStreamReader) -> AsyncIterator[tuple[str, str | int, Any]]:
+    """
+    Функция потокового обхода отчета
+
+    Затронутые пакеты выдаются по одному, без разбора массива
+    affects_projects целиком. Порядок ключей в объектах не важен.
+
+    :param reader: Потоковый разбор ответа бэкенда с отчетом
+    :return: Элементы отчета: (REPORT_FIELD, ключ, значение),
+        (REPORT_PROJECT, индекс проекта, конфигурация проекта)
+        и (REPORT_AFFECT, индекс проекта, затронутый пакет с уязвимостью)
+    """
+
+    async for key in reader.iter_object():
+        if key != 'affects_projects':
+            yield REPORT_FIELD, key, await reader.read_value()
+            continue
+
+        async for project_index in reader.iter_array():
+            async for project_key in reader.iter_object():
+                if project_key == 'project':
+                    yield REPORT_PROJECT, project_index, await reader.read_value()
+                elif project_key == 'affects':
+                    async for _ in reader.iter_array():
+                        yield REPORT_AFFECT, project_index, await reader.read_value()
+                else:
+                    await reader.read_value()
+
+
+def project_page_param(project_id: int) -> str:
+    return f'page_{project_id}'
+
+
+def project_sort_param(project_id: int) -> str:
+    return f'sort_{project_id}'
+
+
+def project_expand_param(project_id: int) -> str:
+    return f'expand_{project_id}'
+
 
 class ReportsService:
 
     def __init__(self):
         pass
 
-    def get_reports_info(self) -> list[ReportGetDTO]:
+    async def get_reports_info(self, page: int = 1, page_size: int = 10) -> ReportsGetDTO:
         """
-        Метод получения списка отчетов
+        Метод получения страницы списка отчетов
 
-        :return: Список отчетов
+        Если бэкенд не поддерживает пагинацию и возвращает полный список,
+        список кэшируется и валидируется только запрошенное окно.
+
+        :param page: Номер страницы пагинации
+        :param page_size: Количество записей на одной странице
+        :return: Отчеты страницы и общее количество отчетов
         """
 
-        reports_response = requests.get(url=BackendServiceConfig.get_reports_url()).json()
+        reports_response = reports_list_cache.get(ALL_REPORTS_KEY)
 
-        reports = [
-            ReportGetDTO.model_validate(row)
-            for row in reports_response
-        ]
+        if reports_response is None:
+            response = await backend_client.get(
+                url=BackendServiceConfig.get_reports_url(),
+                params=dict(page=page, page_size=page_size),
+            )
+            with timed('decode'):
+                reports_response = response.json()
+
+            if isinstance(reports_response, dict):
+                with timed('validate'):
+                    return ReportsGetDTO.model_validate(reports_response)
 
-        return reports
+            reports_list_cache.set(ALL_REPORTS_KEY, reports_response)
 
-    def get_reports_view(self, page: int = 1, page_size: int = 10) -> list[AnyComponent]:
+        reports_page = select_page(reports_response, page, page_size)
+
+        with timed('validate'):
+            return ReportsGetDTO(
+                reports=[ReportGetDTO.model_validate(row) for row in reports_page.rows],
+                count=reports_page.total,
+            )
+
+    @timed_phase('build')
+    async def get_reports_view(self, page: int = 1, page_size: int = 10) -> list[AnyComponent]:
         """
         Метод получения страницы с отчетами
 
@@ -49,10 +199,11 @@ class ReportsService:
         :return: Страница с информацией об отчетах
         """
 
-        reports = self.get_reports_info()
+        reports_dto = await self.get_reports_info(page, page_size)
 
-        table_reports = [
-            TableReportDTO(
+        table = build_table(
+            reports_dto.reports,
+            row_factory=lambda report: TableReportDTO(
                 report_id=gen_ui_link(
                     url=FrontendServiceConfig.get_report(report.id),
                     text=report.id,
@@ -62,12 +213,7 @@ class ReportsService:
                     url=FrontendServiceConfig.get_scan_config(report.scan_config_id),
                     text=report.scan_config_id,
                 ),
-            )
-            for report in reports
-        ]
-
-        table = c.Table(
-            data=table_reports[(page - 1) * page_size: page * page_size],
+            ),
             data_model=TableReportDTO,
             columns=[
                 DisplayLookup(field='report_id', table_width_percent=10, title='ID'),
@@ -78,7 +224,7 @@ class ReportsService:
 
         components=[
             table,
-            c.Pagination(page=page, page_size=page_size, total=len(reports)),
+            c.Pagination(page=page, page_size=page_size, total=reports_dto.count),
         ]
 
         return base_page(
@@ -86,78 +232,365 @@ class ReportsService:
             title='Собранные отчеты',
         )
 
-    def get_report_info(self, report_id: int) -> ReportFullDTO:
+    async def stream_report(self, report_id: int, hasher: Any = None) -> AsyncIterator[tuple[str, str | int, Any]]:
         """
-        Метод получения информации из отчета
+        Метод потокового чтения отчета из бэкенда
 
         :param report_id: Идентификатор отчета
-        :return: Информация об отчете
+        :param hasher: Объект хэша, обновляемый блоками ответа бэкенда
+        :return: Элементы отчета, см. iter_report_items
         """
 
-        report = requests.get(url=BackendServiceConfig.get_report_url(report_id)).json()
+        async with backend_client.stream(url=BackendServiceConfig.get_report_url(report_id)) as response:
+            async def chunks() -> AsyncIterator[bytes]:
+                async for chunk in response.aiter_bytes():
+                    if hasher is not None:
+                        hasher.update(chunk)
+                    yield chunk
 
-        report_dto = ReportFullDTO.model_validate(report)
+            async for item in iter_report_items(JsonStreamReader(chunks())):
+                yield item
 
-        return report_dto
+    async def build_report_rows(self, items: AsyncIterator[tuple[str, str | int, Any]]) -> ReportRows:
+        """
+        Метод построения компактного отсортированного представления отчета
 
-    def get_report_view(self, report_id: int, page: int = 1, page_size: int = 10):
+        Строки строятся по мере чтения отчета, без создания pydantic моделей
+        для затронутых пакетов и уязвимостей и без хранения отчета целиком.
+        Если ответ валидируется (см. VALIDATION_MODE), каждый затронутый
+        пакет с уязвимостью проверяется по схеме ReportAffectDTO.
+
+        :param items: Элементы отчета, см. iter_report_items
+        :return: Строки затронутых пакетов по проектам отчета
         """
-        Метод получения информации из отчета
+
+        validate = validate_response()
+        pool = {}
+        fields = {}
+        project_configs = {}
+        project_rows = {}
+
+        async for kind, key, value in items:
+            if kind == REPORT_AFFECT:
+                if validate:
+                    with timed('validate'):
+                        ReportAffectDTO.model_validate(value)
+                project_rows.setdefault(key, []).append(build_affect_row(value['affected'], value['vulner'], pool))
+            elif kind == REPORT_PROJECT:
+                with timed('validate'):
+                    project_configs[key] = ProjectConfigGetDTO.model_validate(value)
+            else:
+                fields[key] = value
+
+        projects = []
+        for project_index, project_config in sorted(project_configs.items()):
+            rows = project_rows.get(project_index, [])
+            rows.sort(key=AFFECT_SORTS['score'][0])
+            projects.append(ReportProjectRows(project=project_config, rows=rows))
+
+        with timed('validate'):
+            return ReportRows(
+                report=ReportGetDTO.model_validate(fields),
+                scan_config=ScanConfigGetDTO.model_validate(fields['scan_config']),
+                projects=projects,
+            )
+
+    async def load_report_rows(self, report_id: int) -> ReportRows:
+        """
+        Метод загрузки компактного представления отчета в кэш
 
         :param report_id: Идентификатор отчета
+        :return: Строки затронутых пакетов по проектам отчета
+        """
+
+        hasher = payload_hasher()
+        # Разбор потока и построение строк учитываются как decode.
+        with timed('decode'):
+            report_rows = await self.build_report_rows(self.stream_report(report_id, hasher))
+        report_rows = report_rows._replace(digest=hasher.hexdigest())
+        report_rows_cache.set(report_id, report_rows)
+
+        return report_rows
+
+    async def get_report_rows(self, report_id: int) -> ReportRows:
+        """
+        Метод получения компактного представления отчета
+
+        Завершенные отчеты не изменяются, поэтому представление
+        кэшируется и последующие страницы отдаются из памяти.
+        Одновременные запросы одного отчета ожидают одну загрузку.
+
+        :param report_id: Идентификатор отчета
+        :return: Строки затронутых пакетов по проектам отчета
+        """
+
+        report_rows = report_rows_cache.get(report_id)
+        if report_rows is not None:
+            return report_rows
+
+        return await report_rows_loading.run(report_id, lambda: self.load_report_rows(report_id))
+
+    async def get_report_digest(self, report_id: int) -> str:
+        """
+        Метод получения хэша данных отчета для формирования ETag
+
+        При промахе кэша представление отчета строится и сохраняется:
+        оно понадобится запросам секций проектов этой же страницы.
+
+        :param report_id: Идентификатор отчета
+        :return: Хэш ответа бэкенда с отчетом
+        """
+
+        return (await self.get_report_rows(report_id)).digest
+
+    async def iter_report_records(self, report_id: int) -> AsyncIterator[ExportRecord]:
+        """
+        Метод потокового перебора записей отчета без построения pydantic моделей
+
+        :param report_id: Идентификатор отчета
+        :return: Пары из данных проекта и затронутого пакета с уязвимостью
+        """
+
+        projects = {}
+        # Пакеты проекта, конфигурация которого в ответе идет после них.
+        pending = {}
+
+        async for kind, key, value in self.stream_report(report_id):
+            if kind == REPORT_PROJECT:
+                projects[key] = value
+                for affect in pending.pop(key, ()):
+                    yield value, affect
+            elif kind == REPORT_AFFECT:
+                if key in projects:
+                    yield projects[key], value
+                else:
+                    pending.setdefault(key, []).append(value)
+
+    async def export_report(self, report_id: int, export_format: ExportFormats) -> AsyncIterator[str]:
+        """
+        Метод потоковой выгрузки отчета
+
+        Первая запись читается до начала ответа: если бэкенд не отдал
+        отчет, клиент получает ошибку, а не пустой документ со статусом 200.
+
+        :param report_id: Идентификатор отчета
+        :param export_format: Формат выгрузки
+        :return: Блоки выгружаемого документа
+        """
+
+        report_records = self.iter_report_records(report_id)
+        try:
+            first_record = await anext(report_records)
+        except StopAsyncIteration:
+            first_record = None
+
+        async def iter_records() -> AsyncIterator[ExportRecord]:
+            if first_record is not None:
+                yield first_record
+            async for record in report_records:
+                yield record
+
+        records = iter_records()
+
+        if export_format == ExportFormats.csv:
+            return export_csv(records)
+        if export_format == ExportFormats.jsonl:
+            return export_jsonl(records)
+        return export_vex(records, report_id)
+
+    @timed_phase('build')
+    async def get_report_project_view(
+            self,
+            report_id: int,
+            project_id: int,
+            page: int = 1,
+            page_size: int = 10,
+            sort: str = 'score',
+            expand: bool = False,
+            report_query: str = '',
+    ) -> list[AnyComponent]:
+        """
+        Метод получения таблицы затронутых пакетов одного проекта отчета
+
+        Состояние страницы, сортировки и подробностей каждого проекта хранится
+        в отдельных параметрах адреса страницы отчета, поэтому секции проектов
+        независимы. Ссылки секции ведут на страницу отчета со всеми текущими
+        параметрами, в которых изменены только параметры этой секции.
+
+        :param report_id: Идентификатор отчета
+        :param project_id: Идентификатор конфигурации проекта
         :param page: Номер страницы пагинации
         :param page_size: Количество записей на одной странице
+        :param sort: Порядок сортировки, один из AFFECT_SORTS
+        :param expand: Вывести под таблицей подробности уязвимостей страницы
+        :param report_query: Строка параметров адреса страницы отчета
+        :return: Компоненты секции проекта
+        """
+
+        report_rows = await self.get_report_rows(report_id)
+
+        project = next((item for item in report_rows.projects if item.project.id == project_id), None)
+        if project is None:
+            raise HTTPException(status_code=404, detail='Проект не найден в отчете')
+
+        if sort not in AFFECT_SORTS:
+            sort = 'score'
+        sort_key, reverse = AFFECT_SORTS[sort]
+
+        # Строки в кэше уже упорядочены по возрастанию оценки.
+        rows_page = select_page(
+            project.rows,
+            page,
+            page_size,
+            key=None if sort == 'score' else sort_key,
+            reverse=reverse,
+        )
+
+        section_query = {
+            **dict(parse_qsl(report_query)),
+            project_page_param(project_id): str(page),
+            project_sort_param(project_id): sort,
+            project_expand_param(project_id): '1' if expand else '0',
+        }
+
+        def report_url(**changes: str) -> str:
+            return f'{FrontendServiceConfig.get_report(report_id)}?{urlencode({**section_query, **changes})}'
+
+        sort_links = []
+        for sort_name, sort_title in AFFECT_SORT_TITLES.items():
+            sort_links.extend(
+                [
+                    c.Text(text=' '),
+                    c.Text(text=sort_title) if sort_name == sort else c.Link(
+                        components=[c.Text(text=sort_title)],
+                        on_click=GoToEvent(url=report_url(**{
+                            project_sort_param(project_id): sort_name,
+                            project_page_param(project_id): '1',
+                        })),
+                    ),
+                ]
+            )
+
+        expand_link = c.Link(
+            components=[c.Text(text='скрыть' if expand else 'показать')],
+            on_click=GoToEvent(url=report_url(**{project_expand_param(project_id): '0' if expand else '1'})),
+        )
+
+        return [
+            c.Div(components=[c.Text(text='Сортировка:'), *sort_links]),
+            c.Div(components=[c.Text(text='Подробности уязвимостей: '), expand_link]),
+            build_table(
+                rows_page.rows,
+                row_factory=lambda row: TableAffectWithVulnerDTO(
+                    name=row.name,
+                    vendor=row.vendor,
+                    type=row.type,
+                    start_condition=row.start_condition,
+                    start_value=row.start_value,
+                    end_value=row.end_value,
+                    end_condition=row.end_condition,
+                    vulner=gen_ui_link(url=FrontendServiceConfig.get_vulner(row.vulner), text=row.vulner),
+                    score=row.score,
+                    severity=row.severity,
+                ),
+                data_model=TableAffectWithVulnerDTO,
+                columns=[
+                    DisplayLookup(field='name', table_width_percent=10),
+                    DisplayLookup(field='vendor', table_width_percent=10),
+                    DisplayLookup(field='type', table_width_percent=10),
+                    DisplayLookup(field='vulner', table_width_percent=10),
+                    DisplayLookup(field='score', table_width_percent=10),
+                    DisplayLookup(field='severity', table_width_percent=10),
+                ]
+            ),
+            c.Pagination(
+                page=page,
+                page_size=page_size,
+                total=rows_page.total,
+                page_query_param=project_page_param(project_id),
+            ),
+            *(await self.get_vulners_details(rows_page.rows) if expand else []),
+        ]
+
+    async def get_vulners_details(self, rows: list[AffectRow]) -> list[AnyComponent]:
+        """
+        Метод получения подробностей уязвимостей строк страницы
+
+        Все уязвимости страницы загружаются одновременно (не более
+        REPORT_EXPAND_MAX_CONCURRENCY загрузок) через кэш уязвимостей,
+        каждая уязвимость загружается один раз.
+
+        :param rows: Строки страницы
+        :return: Описание, оценки и диапазоны уязвимых версий пакетов страницы
+        """
+
+        vulners = await VulnersService().get_vulners_info(
+            (row.vulner for row in rows),
+            max_concurrency=ReportsConfig.expand_max_concurrency,
+        )
+
+        components = [c.Heading(text='Подробности уязвимостей', level=5)]
+        for vulner_id, vulner_dto in vulners.items():
+            # Диапазоны выводятся для пакетов страницы, если они есть в данных уязвимости.
+            packages = {row.name for row in rows if row.vulner == vulner_id}
+            affected = [affect for affect in vulner_dto.affected or [] if affect.name in packages] or vulner_dto.affected or []
+
+            components.extend(
+                [
+                    c.Heading(text=vulner_id, level=6),
+                    gen_ui_link(url=FrontendServiceConfig.get_vulner(vulner_id), text='Страница уязвимости'),
+                    c.Paragraph(text=vulner_dto.description or ''),
+                    *build_ratings(vulner_dto),
+                    build_affected_table(affected),
+                ]
+            )
+
+        return components
+
+    @timed_phase('build')
+    async def get_report_view(self, report_id: int, page_size: int = 10, query: Mapping[str, str] | None = None):
+        """
+        Метод получения информации из отчета
+
+        Таблицы проектов не входят в ответ, они подгружаются отдельными
+        запросами через ServerLoad.
+
+        :param report_id: Идентификатор отчета
+        :param page_size: Количество записей на одной странице
+        :param query: Параметры адреса страницы с состоянием секций проектов
         :return: Страница с информацией об отчете сканирования
         """
 
-        report_dto = self.get_report_info(report_id)
+        query = query or {}
+
+        report_rows = await self.get_report_rows(report_id)
+        report_dto = report_rows.report
+        scan_config = report_rows.scan_config
 
         result_affects = []
-        for project in report_dto.affects_projects:
-            affects = [
-                TableAffectWithVulnerDTO.model_validate(
-                    dict(
-                        vulner=c.Link(
-                            components=[
-                                c.Text(text=affect.vulner.global_identifier),
-
-                            ],
-                            on_click=GoToEvent(
-                                url=FrontendServiceConfig.get_vulner(affect.vulner.global_identifier)
-                            ),
-                        ),
-                        score=affect.vulner.ratings[0].score if affect.vulner.ratings else None,
-                        severity=affect.vulner.ratings[0].severity if affect.vulner.ratings else None,
-                        **dict(affect.affected)
-                    )
-                )
-                for affect in project.affects
-            ]
-            affects.sort(key=lambda x: (x.score is None, x.score))
+        for project in report_rows.projects:
+            project_id = project.project.id
+            section_params = urlencode(dict(
+                page=query.get(project_page_param(project_id), 1),
+                page_size=page_size,
+                sort=query.get(project_sort_param(project_id), 'score'),
+                expand=query.get(project_expand_param(project_id), '0'),
+                report_query=urlencode(dict(query)),
+            ))
             result_affects.extend(
                 [
                     c.Heading(text=f'Имя проекта: {project.project.name}', level=4),
                     c.Paragraph(text=f'Тип проекта: {project.project.type}'),
-                    c.Table(
-                        data=affects[(page - 1) * page_size: page * page_size],
-                        data_model=TableAffectWithVulnerDTO,
-                        columns=[
-                            DisplayLookup(field='name', table_width_percent=10),
-                            DisplayLookup(field='vendor', table_width_percent=10),
-                            DisplayLookup(field='type', table_width_percent=10),
-                            DisplayLookup(field='vulner', table_width_percent=10),
-                            DisplayLookup(field='score', table_width_percent=10),
-                            DisplayLookup(field='severity', table_width_percent=10),
-                        ]
+                    c.ServerLoad(
+                        path=f'{FrontendServiceConfig.get_report_project(report_id, project_id)}?{section_params}',
+                        components=[c.Spinner(text='Загрузка...')],
                     ),
-                    c.Pagination(page=page, page_size=page_size, total=len(affects)),
-
                 ]
             )
 
         scan_conf_link = c.Link(
             components=[
-                c.Text(text=report_dto.scan_config.name or str(report_dto.scan_config_id)),
+                c.Text(text=scan_config.name or str(report_dto.scan_config_id)),
 
             ],
             on_click=GoToEvent(
@@ -169,18 +602,31 @@ class ReportsService:
             c.Paragraph(text=f'Дата создания отчета: {fix_date_str(report_dto.created_at)}'),
             c.Text(text=f'Используемая конфигурация сканирования: '),
             scan_conf_link,
-            c.Paragraph(text=f'Сканируемый хост: {report_dto.scan_config.host}'),
-            c.Paragraph(text=f'Используемый пользователь: {report_dto.scan_config.user}'),
+            c.Paragraph(text=f'Сканируемый хост: {scan_config.host}'),
+            c.Paragraph(text=f'Используемый пользователь: {scan_config.user}'),
             c.Paragraph(text=f'Описание конфигурации:'),
-            c.Paragraph(text=f'{report_dto.scan_config.description}'),
+            c.Paragraph(text=f'{scan_config.description}'),
             *result_affects,
         ]
 
         components = [
             *report_main_data,
             c.Button(text='Удалить'),
-            c.Text(text=' '),
-            c.Button(text='Экспорт'),
+            c.Text(text=' Экспорт: '),
+            *(
+                component
+                for export_format in ExportFormats
+                for component in (
+                    c.Button(
+                        text=export_format.name.upper(),
+                        on_click=GoToEvent(
+                            url=FrontendServiceConfig.get_report_export_url(report_id, export_format.value),
+                            target='_blank',
+                        ),
+                    ),
+                    c.Text(text=' '),
+                )
+            ),
         ]
 
         return base_page(
@@ -2,7 +2,6 @@
 
 from typing import Annotated
 
-import requests
 from fastui import AnyComponent
 from fastui.forms import fastui_form
 from fastui import components as c
@@ -10,7 +9,11 @@ from fastui.events import GoToEvent, BackEvent
 from fastui.components.display import DisplayLookup
 
 from ui.base import gen_ui_link, base_page
-from services.config import BackendServiceConfig, FrontendServiceConfig
+from ui.tables import select_page, build_table
+from services.cache import LRUCache
+from services.client import backend_client
+from services.config import BackendServiceConfig, FrontendServiceConfig, CacheConfig
+from services.timing import timed, timed_phase
 from services.utils import fix_date_str
 
 from schemas.forms import (
@@ -26,8 +29,15 @@ from schemas.models import (
     ScanConfigAddDTO,
     AddItemResponseDTO,
     ScanConfigGetDTO,
+    ScanConfigListDTO,
+    ScanConfigsListGetDTO,
 )
 
+ALL_SCAN_CONFIGS_KEY = 'all'
+
+# Облегченный список конфигураций сканирования, сбрасывается при добавлении конфигураций и проектов.
+scan_configs_cache = LRUCache('scan_configs', max_entries=64, ttl=CacheConfig.scan_configs_ttl)
+
 
 class ScannerService:
 
@@ -35,35 +45,67 @@ class ScannerService:
     def __init__(self):
         pass
 
-    def get_scan_configs_info(self) -> list[ScanConfigGetDTO]:
-        scan_confs_response = requests.get(url=BackendServiceConfig.get_configs_url()).json()
-        scan_confs = [
-            ScanConfigGetDTO(**row)
-            for row in scan_confs_response
-        ]
+    async def get_scan_configs_info(self, page: int = 1, page_size: int = 7) -> ScanConfigsListGetDTO:
+        """
+        Метод получения страницы списка конфигураций сканирования
 
-        return scan_confs
+        Список хранится в облегченном виде, без проектов и секретов.
+        Если бэкенд не поддерживает пагинацию, полный список кэшируется
+        и из него берется окно запрошенной страницы.
 
-    def get_scan_configs_view(self, page: int = 1, page_size: int = 7):
-        scan_confs = self.get_scan_configs_info()
+        :param page: Номер страницы пагинации
+        :param page_size: Количество записей на одной странице
+        :return: Конфигурации страницы и общее количество конфигураций
+        """
 
-        scan_confs_table = [
-            TableScanConfigDTO(
-                id=gen_ui_link(
-                    url=FrontendServiceConfig.get_scan_config(scan_conf.id),
-                    text=str(scan_conf.id),
-                ),
-                name=scan_conf.name,
-                host=scan_conf.host,
-                user=scan_conf.user,
-                date=fix_date_str(scan_conf.date),
+        scan_confs = scan_configs_cache.get(ALL_SCAN_CONFIGS_KEY)
+
+        if scan_confs is None:
+            scan_confs = scan_configs_cache.get((page, page_size))
+            if scan_confs is not None:
+                return scan_confs
+
+            response = await backend_client.get(
+                url=BackendServiceConfig.get_configs_url(),
+                params=dict(page=page, page_size=page_size),
             )
-            for scan_conf in scan_confs
-        ]
+            with timed('decode'):
+                scan_confs_response = response.json()
+
+            if isinstance(scan_confs_response, dict):
+                with timed('validate'):
+                    scan_confs_page = ScanConfigsListGetDTO.model_validate(scan_confs_response)
+                scan_configs_cache.set((page, page_size), scan_confs_page)
+                return scan_confs_page
+
+            with timed('validate'):
+                scan_confs = [
+                    ScanConfigListDTO.model_validate(row)
+                    for row in scan_confs_response
+                ]
+            scan_configs_cache.set(ALL_SCAN_CONFIGS_KEY, scan_confs)
+
+        scan_confs_page = select_page(scan_confs, page, page_size)
+
+        return ScanConfigsListGetDTO(configs=scan_confs_page.rows, count=scan_confs_page.total)
+
+    @timed_phase('build')
+    async def get_scan_configs_view(self, page: int = 1, page_size: int = 7):
+        scan_confs_dto = await self.get_scan_configs_info(page, page_size)
 
         components = [
-            c.Table(
-                data=scan_confs_table,
+            build_table(
+                scan_confs_dto.configs,
+                row_factory=lambda scan_conf: TableScanConfigDTO(
+                    id=gen_ui_link(
+                        url=FrontendServiceConfig.get_scan_config(scan_conf.id),
+                        text=str(scan_conf.id),
+                    ),
+                    name=scan_conf.name,
+                    host=scan_conf.host,
+                    user=scan_conf.user,
+                    date=fix_date_str(scan_conf.date),
+                ),
                 data_model=TableScanConfigDTO,
                 columns=[
                     DisplayLookup(field='id', table_width_percent=10),
@@ -73,7 +115,7 @@ class ScannerService:
                     DisplayLookup(field='date', table_width_percent=10, title='Дата создания'),
                 ]
             ),
-            c.Pagination(page=page, page_size=page_size, total=len(scan_confs)),
+            c.Pagination(page=page, page_size=page_size, total=scan_confs_dto.count),
             c.Button(text='Добавить конфигурацию', on_click=GoToEvent(url='/scan/configs/add')),
         ]
 
@@ -82,37 +124,39 @@ class ScannerService:
             title='Конфигурации сканирования',
         )
 
-    def get_scan_config_info(self, conf_id: int) -> ScanConfigGetDTO:
+    async def get_scan_config_info(self, conf_id: int) -> ScanConfigGetDTO:
         headers = {
             'Content-Type': 'application/json',
             'accept': 'application/json',
         }
 
-        scan_conf_response = requests.get(
+        response = await backend_client.get(
             url=BackendServiceConfig.get_config_url(conf_id),
             headers=headers
-        ).json()
+        )
+        with timed('decode'):
+            scan_conf_response = response.json()
 
-        scan_conf = ScanConfigGetDTO(**scan_conf_response)
+        with timed('validate'):
+            scan_conf = ScanConfigGetDTO(**scan_conf_response)
 
         return scan_conf
 
-    def get_scan_config_view(self, conf_id: int, page: int = 1, page_size: int = 7) -> list[AnyComponent]:
-        scan_conf = self.get_scan_config_info(conf_id)
+    @timed_phase('build')
+    async def get_scan_config_view(self, conf_id: int, page: int = 1, page_size: int = 7) -> list[AnyComponent]:
+        scan_conf = await self.get_scan_config_info(conf_id)
+
+        projects_page = select_page(scan_conf.projects, page, page_size)
 
-        table_data = [
-            TableProjectConfigGetDTO(
+        project_confs_table = build_table(
+            projects_page.rows,
+            row_factory=lambda row: TableProjectConfigGetDTO(
                 id=gen_ui_link(url=FrontendServiceConfig.get_scan_project_config(row.id), text=row.id),
                 name=row.name,
                 type=row.type,
                 dir_path=row.dir_path,
                 description=row.description,
-            )
-            for row in scan_conf.projects
-        ]
-
-        project_confs_table = c.Table(
-            data=table_data[(page - 1) * page_size: page * page_size],
+            ),
             data_model=TableProjectConfigGetDTO,
             columns=[
                 DisplayLookup(field='id', table_width_percent=10, title='ID'),
@@ -149,7 +193,7 @@ class ScannerService:
             ),
             c.Paragraph(text=' '),
             project_confs_table,
-            c.Pagination(page=page, page_size=page_size, total=len(table_data)),
+            c.Pagination(page=page, page_size=page_size, total=projects_page.total),
         ]
 
         return base_page(
@@ -158,7 +202,7 @@ class ScannerService:
         )
 
 
-    def add_scan_config(self, form: Annotated[ScanConfAddForm, fastui_form(ScanConfAddForm)]) -> list[AnyComponent]:
+    async def add_scan_config(self, form: Annotated[ScanConfAddForm, fastui_form(ScanConfAddForm)]) -> list[AnyComponent]:
         headers = {
             'Content-Type': 'application/json',
             'accept': 'application/json',
@@ -173,13 +217,14 @@ class ScannerService:
             port=form.port,
         )
 
-        response = requests.post(
+        response = await backend_client.post(
             url=BackendServiceConfig.add_configs_url(),
             headers=headers,
             json=data.model_dump(mode='json')
         )
 
         validated_response = AddItemResponseDTO.model_validate(response.json())
+        scan_configs_cache.clear()
 
         return [c.FireEvent(event=GoToEvent(url=FrontendServiceConfig.get_scan_config(validated_response.created_item_id)))]
 
@@ -197,15 +242,19 @@ class ScannerService:
             title='Добавить конфигурацию',
         )
 
-    def get_project_config_info(self, project_id: int) -> ProjectConfigGetDTO:
-        project_conf = requests.get(url=BackendServiceConfig.get_project_config_url(project_id)).json()
+    async def get_project_config_info(self, project_id: int) -> ProjectConfigGetDTO:
+        response = await backend_client.get(url=BackendServiceConfig.get_project_config_url(project_id))
+        with timed('decode'):
+            project_conf = response.json()
 
-        project_conf = ProjectConfigGetDTO(**project_conf)
+        with timed('validate'):
+            project_conf = ProjectConfigGetDTO(**project_conf)
 
         return project_conf
 
-    def get_project_config_view(self, project_id: int) -> list[AnyComponent]:
-        project_conf = self.get_project_config_info(project_id)
+    @timed_phase('build')
+    async def get_project_config_view(self, project_id: int) -> list[AnyComponent]:
+        project_conf = await self.get_project_config_info(project_id)
 
         components = [
             c.Heading(text=f'Тип проекта: {project_conf.type}', level=4),
@@ -222,7 +271,7 @@ class ScannerService:
             title=f'Конфигурация проекта "{project_conf.name}"',
         )
 
-    def add_project_config(self, conf_id: int, form: Annotated[ProjectScanConfAddForm, fastui_form(ProjectScanConfAddForm)]):
+    async def add_project_config(self, conf_id: int, form: Annotated[ProjectScanConfAddForm, fastui_form(ProjectScanConfAddForm)]):
 
         data = ProjectScanConfigAddDTO(
             name=form.name,
@@ -237,12 +286,13 @@ class ScannerService:
             'accept': 'application/json',
         }
 
-        response = requests.post(
+        response = await backend_client.post(
             url=BackendServiceConfig.add_project_config_url(),
             headers=headers,
             json=data.model_dump(mode='json')
         )
         validated_response = AddItemResponseDTO.model_validate(response.json())
+        scan_configs_cache.clear()
 
         return [c.FireEvent(event=GoToEvent(url=FrontendServiceConfig.get_scan_project_config(validated_response.created_item_id)))]
 
@@ -261,12 +311,12 @@ class ScannerService:
             title='Добавить конфигурацию проекта',
         )
 
-    def start_config_scanner(self, conf_id: int) -> list[AnyComponent]:
+    async def start_config_scanner(self, conf_id: int) -> list[AnyComponent]:
         headers = {
             'accept': 'application/json',
         }
 
-        response = requests.post(
+        response = await backend_client.post(
             url=BackendServiceConfig.run_scanner_url(conf_id),
             headers=headers,
         )
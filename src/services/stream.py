@@ -0,0 +1,182 @@
+"""Модуль потокового разбора JSON"""
+
+import codecs
+import json
+import re
+from typing import Any, AsyncIterator
+
+from services.timing import timed
+
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+# Символы, которыми может продолжаться число, например 2 -> 2.5e10.
+NUMBER_TAIL = re.compile(r'[0-9+\-.eE]*')
+
+
+class JsonStreamReader:
+    """
+    Потоковый разбор JSON документа из асинхронного источника байт
+
+    Документ обходится по структуре: объекты и массивы перебираются
+    по ключам и элементам, а значения разбираются по одному через
+    json.JSONDecoder.raw_decode. В памяти находится только текущее
+    значение и непрочитанный остаток буфера.
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes]):
+        """
+        :param chunks: Источник блоков документа
+        """
+
+        self._chunks = chunks
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    async def _fill(self) -> bool:
+        """
+        Метод чтения следующего блока документа в буфер
+
+        :return: Блок прочитан, False - документ закончился
+        """
+
+        if self._eof:
+            return False
+
+        # Разобранная часть буфера отбрасывается.
+        if self._pos:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+
+        try:
+            with timed('backend'):
+                chunk = await anext(self._chunks)
+        except StopAsyncIteration:
+            self._eof = True
+            self._buffer += self._text_decoder.decode(b'', final=True)
+            return False
+
+        self._buffer += self._text_decoder.decode(chunk)
+        return True
+
+    async def _grow(self) -> bool:
+        """
+        Метод дочитывания документа для разбора незавершенного значения
+
+        Непрочитанный остаток буфера как минимум удваивается, поэтому
+        большое значение разбирается за логарифмическое число попыток.
+
+        :return: Буфер пополнен, False - документ закончился
+        """
+
+        target = 2 * (len(self._buffer) - self._pos)
+        grown = False
+        while await self._fill():
+            grown = True
+            if len(self._buffer) - self._pos >= target:
+                break
+
+        return grown
+
+    async def _peek(self) -> str:
+        """
+        Метод получения следующего значимого символа без его разбора
+
+        :return: Символ после пробельных символов
+        """
+
+        while True:
+            self._pos = WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not await self._fill():
+                raise ValueError('Unexpected end of JSON document')
+
+    async def _expect(self, *chars: str) -> str:
+        """
+        Метод разбора одного из ожидаемых символов структуры
+
+        :param chars: Ожидаемые символы
+        :return: Разобранный символ
+        """
+
+        char = await self._peek()
+        if char not in chars:
+            raise ValueError(f'Expected one of {chars!r} in JSON document, got {char!r}')
+
+        self._pos += 1
+        return char
+
+    async def read_value(self) -> Any:
+        """
+        Метод разбора очередного значения целиком
+
+        :return: Значение
+        """
+
+        first = await self._peek()
+
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if await self._grow():
+                    continue
+                raise
+
+            # Число в конце буфера может продолжаться в следующем блоке.
+            if (
+                    first not in '{["'
+                    and NUMBER_TAIL.match(self._buffer, end).end() == len(self._buffer)
+                    and await self._grow()
+            ):
+                continue
+
+            self._pos = end
+            return value
+
+    async def iter_object(self) -> AsyncIterator[str]:
+        """
+        Метод перебора ключей объекта
+
+        Значение каждого ключа должно быть разобрано вызывающим
+        (read_value, iter_object или iter_array) до следующей итерации.
+
+        :return: Ключи объекта
+        """
+
+        await self._expect('{')
+        if await self._peek() == '}':
+            self._pos += 1
+            return
+
+        while True:
+            key = await self.read_value()
+            await self._expect(':')
+            yield key
+            if await self._expect(',', '}') == '}':
+                return
+
+    async def iter_array(self) -> AsyncIterator[int]:
+        """
+        Метод перебора элементов массива
+
+        Каждый элемент должен быть разобран вызывающим
+        (read_value, iter_object или iter_array) до следующей итерации.
+
+        :return: Индексы элементов массива
+        """
+
+        await self._expect('[')
+        if await self._peek() == ']':
+            self._pos += 1
+            return
+
+        index = 0
+        while True:
+            yield index
+            index += 1
+            if await self._expect(',', ']') == ']':
+                return
@@ -0,0 +1,218 @@
+"""Модуль измерения этапов обработки запроса (заголовок Server-Timing)"""
+
+import functools
+import logging
+import time
+from contextvars import Context, ContextVar, copy_context
+from typing import Any, Awaitable, Callable
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+logger = logging.getLogger(__name__)
+
+# Этапы обработки запроса и их описания в заголовке Server-Timing.
+TIMING_PHASES = {
+    'backend': 'Backend HTTP',
+    'decode': 'JSON decode',
+    'validate': 'Schema validation',
+    'build': 'Page build',
+    'render': 'Response serialization',
+}
+
+
+class RequestTiming:
+    """
+    Время этапов обработки одного запроса
+
+    Для каждого этапа хранится собственное время, без времени
+    вложенных этапов, поэтому этапы не пересекаются.
+    """
+
+    __slots__ = ('start', 'durations', 'counts')
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.durations: dict[str, float] = {}
+        self.counts: dict[str, int] = {}
+
+    def add(self, phase: str, elapsed: float, count: int = 1) -> None:
+        """
+        Метод учета времени этапа
+
+        :param phase: Этап обработки запроса
+        :param elapsed: Время в секундах, отрицательное - время вложенного этапа
+        :param count: Количество вызовов этапа
+        """
+
+        self.durations[phase] = self.durations.get(phase, 0.0) + elapsed
+        self.counts[phase] = self.counts.get(phase, 0) + count
+
+    def summary(self) -> dict[str, float]:
+        """
+        Метод получения времени этапов
+
+        :return: Время этапов в миллисекундах, включая total - время с начала запроса
+        """
+
+        # Этап может стать отрицательным, если вложенные этапы выполнялись параллельно.
+        summary = {
+            phase: round(max(self.durations[phase], 0.0) * 1000, 3)
+            for phase in TIMING_PHASES
+            if phase in self.durations
+        }
+        summary['total'] = round((time.perf_counter() - self.start) * 1000, 3)
+
+        return summary
+
+    def header(self) -> str:
+        """
+        Метод формирования значения заголовка Server-Timing
+
+        :return: Значение заголовка
+        """
+
+        return ', '.join(
+            f'{phase};dur={duration};desc="{TIMING_PHASES.get(phase, phase)}"'
+            if phase in TIMING_PHASES else f'{phase};dur={duration}'
+            for phase, duration in self.summary().items()
+        )
+
+
+# Измерения текущего запроса, None - вне запроса или измерение отключено.
+current_timing: ContextVar[RequestTiming | None] = ContextVar('current_timing', default=None)
+# Этап, выполняющийся в текущем контексте.
+current_phase: ContextVar[str | None] = ContextVar('current_phase', default=None)
+
+
+def untimed_context() -> Context:
+    """
+    Функция получения копии текущего контекста без измерения запроса
+
+    Задачи, переживающие запрос (фоновые и общие загрузки), запускаются
+    в этом контексте, чтобы их этапы не учитывались в запросе, который
+    их запустил.
+
+    :return: Копия контекста со сброшенными current_timing и current_phase
+    """
+
+    context = copy_context()
+    context.run(current_timing.set, None)
+    context.run(current_phase.set, None)
+
+    return context
+
+
+class timed:
+    """
+    Контекстный менеджер измерения этапа обработки запроса
+
+    Время вложенного этапа вычитается из времени внешнего.
+    Вне запроса и в задачах, запущенных в untimed_context (например,
+    в фоновом обновлении кэша), ничего не измеряет.
+    Блок не должен содержать yield асинхронного генератора.
+    """
+
+    __slots__ = ('phase', 'timing', 'parent', 'token', 'start')
+
+    def __init__(self, phase: str):
+        """
+        :param phase: Этап обработки запроса, см. TIMING_PHASES
+        """
+
+        self.phase = phase
+        self.timing = current_timing.get()
+
+    def __enter__(self) -> 'timed':
+        if self.timing is not None:
+            self.parent = current_phase.get()
+            self.token = current_phase.set(self.phase)
+            self.start = time.perf_counter()
+
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self.timing is None:
+            return
+
+        elapsed = time.perf_counter() - self.start
+        current_phase.reset(self.token)
+        self.timing.add(self.phase, elapsed)
+        if self.parent is not None:
+            self.timing.add(self.parent, -elapsed, count=0)
+
+
+def timed_phase(phase: str) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
+    """
+    Декоратор измерения асинхронной функции как этапа обработки запроса
+
+    :param phase: Этап обработки запроса, см. TIMING_PHASES
+    :return: Декоратор
+    """
+
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with timed(phase):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware, добавляющее заголовок Server-Timing к ответам
+
+    Время этапов видно во вкладке Network инструментов разработчика браузера.
+    После отправки ответа этапы пишутся в лог на уровне DEBUG.
+    """
+
+    def __init__(self, app: ASGIApp):
+        """
+        :param app: ASGI приложение
+        """
+
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming()
+        token = current_timing.set(timing)
+        status_code = None
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+                MutableHeaders(scope=message).append('Server-Timing', timing.header())
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_timing.reset(token)
+
+            if logger.isEnabledFor(logging.DEBUG):
+                summary = timing.summary()
+                logger.debug(
+                    'server_timing method=%s path=%s status=%s %s',
+                    scope['method'],
+                    scope['path'],
+                    status_code,
+                    ' '.join(f'{phase}={duration}' for phase, duration in summary.items()),
+                    extra={
+                        'server_timing': summary,
+                        'server_timing_counts': dict(timing.counts),
+                        'method': scope['method'],
+                        'path': scope['path'],
+                        'status_code': status_code,
+                    },
+                )
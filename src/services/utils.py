@@ -1,9 +1,11 @@
 """Модуль вспомогательных функций"""
 
+from typing import Any, Iterable
+
 from fastui import components as c
 from fastui.events import GoToEvent
 
-from schemas.models import AffectedGetDTO
+from schemas.models import AffectedDTO
 
 
 def gen_link(url: str, text: str | int | None = None) -> c.Link:
@@ -24,7 +26,61 @@ def fix_date_str(raw_date: str = '10_06_2025_14_14_07') -> str:
     fixed_date = '.'.join(raw_date.split('_')[:3]) + ' ' + ':'.join(raw_date.split('_')[3:])
     return fixed_date
 
-def count_vulnerable_interval(affected: AffectedGetDTO) -> str:
-    start = '[' if affected.start_condition == 'gte' else '('
-    end = ']' if affected.end_condition == 'lte' else ')'
+def top_rating(ratings: Iterable[dict[str, Any]] | None) -> dict[str, Any]:
+    """
+    Функция выбора наибольшей оценки уязвимости
+
+    По этой оценке строятся столбцы оценки и уровня угрозы в таблицах
+    и выгрузках отчета. При равных оценках берется первая.
+
+    :param ratings: Данные оценок уязвимости
+    :return: Данные наибольшей оценки, пустой словарь при отсутствии оценок
+    """
+
+    top, top_score = {}, None
+    for rating in ratings or ():
+        score = float(rating['score'])
+        if top_score is None or score > top_score:
+            top, top_score = rating, score
+
+    return top
+
+# Условия границ диапазона уязвимых версий: входит ли значение границы в диапазон.
+START_CONDITIONS = {'gte': True, 'gt': False}
+END_CONDITIONS = {'lte': True, 'lt': False}
+
+# Значения границ диапазона без ограничения.
+UNBOUNDED_VALUES = ('', '*')
+
+def interval_inclusion(affected: AffectedDTO) -> tuple[bool | None, bool | None]:
+    """
+    Функция определения включения границ диапазона уязвимых версий
+
+    Одно соответствие условий используется и при выводе диапазона,
+    и при сопоставлении версий в services.versions.
+
+    :param affected: Затронутый пакет
+    :return: Входят ли в диапазон нижняя и верхняя границы, None - неизвестное условие
+    """
+
+    return START_CONDITIONS.get(affected.start_condition), END_CONDITIONS.get(affected.end_condition)
+
+def count_vulnerable_interval(affected: AffectedDTO) -> str:
+    """
+    Функция форматирования диапазона уязвимых версий
+
+    Сопоставление версий с диапазонами выполняется в services.versions.
+
+    :param affected: Затронутый пакет
+    :return: Диапазон в виде [1.0, 2.3), граница с неизвестным условием - ?
+    """
+
+    start_inclusive, end_inclusive = interval_inclusion(affected)
+    if (affected.start_value or '').strip() in UNBOUNDED_VALUES:
+        start_inclusive = False
+    if (affected.end_value or '').strip() in UNBOUNDED_VALUES:
+        end_inclusive = False
+
+    start = '?' if start_inclusive is None else '[' if start_inclusive else '('
+    end = '?' if end_inclusive is None else ']' if end_inclusive else ')'
     return f'{start}{affected.start_value}, {affected.end_value}{end}'
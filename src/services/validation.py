@@ -0,0 +1,38 @@
+"""Модуль выбора режима валидации ответов бэкенда"""
+
+import itertools
+
+from services.config import ValidationConfig
+
+
+VALIDATION_MODES = ('strict', 'sampled', 'trusted')
+
+if ValidationConfig.mode not in VALIDATION_MODES:
+    raise ValueError(f'Unknown VALIDATION_MODE {ValidationConfig.mode!r}, expected one of {VALIDATION_MODES}')
+
+if ValidationConfig.sample_rate < 1:
+    raise ValueError(f'VALIDATION_SAMPLE_RATE must be at least 1, got {ValidationConfig.sample_rate}')
+
+# Счетчик ответов для режима sampled.
+response_counter = itertools.count()
+
+
+def validate_response() -> bool:
+    """
+    Функция выбора полной валидации очередного ответа бэкенда
+
+    Режим влияет на проверки, результат которых не используется для
+    построения страниц, например проверку уязвимостей каждого затронутого
+    пакета отчета. Модели, из которых строятся страницы, создаются через
+    model_validate во всех режимах: pydantic-core строит их быстрее,
+    чем model_construct (см. benchmarks/bench_validation.py).
+
+    :return: Ответ нужно валидировать согласно VALIDATION_MODE
+    """
+
+    if ValidationConfig.mode == 'strict':
+        return True
+    if ValidationConfig.mode == 'trusted':
+        return False
+
+    return next(response_counter) % ValidationConfig.sample_rate == 0
@@ -0,0 +1,593 @@
+"""Модуль сопоставления версий пакетов с диапазонами уязвимых версий"""
+
+import asyncio
+import bisect
+import logging
+import re
+import time
+from typing import Any, Iterable, NamedTuple
+
+from anyio import to_thread
+from fastapi import HTTPException
+
+from services.config import VersionIndexConfig
+from services.utils import UNBOUNDED_VALUES, count_vulnerable_interval, interval_inclusion
+from services.vulners import VulnersService
+
+from schemas.models import AffectedDTO, PackageMatchesDTO, PackageVersionDTO, VersionMatchDTO
+
+
+logger = logging.getLogger(__name__)
+
+# Версия PEP 440, см. packaging.version.VERSION_PATTERN.
+PYTHON_VERSION_PATTERN = re.compile(
+    r"""
+    ^\s*v?
+    (?:(?P<epoch>\d+)!)?
+    (?P<release>\d+(?:\.\d+)*)
+    (?:[-_.]?(?P<pre_l>alpha|a|beta|b|preview|pre|c|rc)[-_.]?(?P<pre_n>\d+)?)?
+    (?:-(?P<post_n1>\d+)|[-_.]?(?P<post_l>post|rev|r)[-_.]?(?P<post_n2>\d+)?)?
+    (?:[-_.]?(?P<dev_l>dev)[-_.]?(?P<dev_n>\d+)?)?
+    (?:\+(?P<local>[a-z0-9]+(?:[-_.][a-z0-9]+)*))?
+    \s*$
+    """,
+    re.VERBOSE | re.IGNORECASE,
+)
+
+# Версия semver (npm, модули Go). Недостающие minor и patch считаются нулевыми.
+SEMVER_PATTERN = re.compile(
+    r"""
+    ^\s*[v=]*\s*
+    (?P<major>\d+)(?:\.(?P<minor>\d+))?(?:\.(?P<patch>\d+))?
+    (?:-(?P<pre>[0-9a-z.-]+))?
+    (?:\+[0-9a-z.-]+)?
+    \s*$
+    """,
+    re.VERBOSE | re.IGNORECASE,
+)
+
+PYTHON_PRE_RELEASES = {'a': 0, 'alpha': 0, 'b': 1, 'beta': 1, 'c': 2, 'rc': 2, 'pre': 2, 'preview': 2}
+
+VersionKey = tuple[Any, ...]
+
+# Количество не загруженных уязвимостей, идентификаторы которых выводятся в логе и состоянии индекса.
+VERSION_INDEX_MISSING_SHOWN = 100
+
+
+class InvalidVersion(ValueError):
+    """Версия или тип пакета не поддерживаются"""
+
+
+class IncompleteVersionIndex(RuntimeError):
+    """Слишком много уязвимостей базы не удалось загрузить для построения индекса"""
+
+
+def parse_python_version(value: str) -> VersionKey:
+    """
+    Функция разбора версии Python пакета (PEP 440)
+
+    :param value: Версия, например 1.2.0rc1.post2
+    :return: Ключ сравнения версий
+    """
+
+    match = PYTHON_VERSION_PATTERN.match(value)
+    if match is None:
+        raise InvalidVersion(f'Некорректная версия python: {value}')
+
+    release = tuple(int(part) for part in match['release'].split('.'))
+    # Нули в конце не влияют на порядок: 1.0 == 1.0.0.
+    while len(release) > 1 and release[-1] == 0:
+        release = release[:-1]
+
+    post = match['post_n1'] or match['post_n2'] or ('0' if match['post_l'] else None)
+    dev = match['dev_n'] or ('0' if match['dev_l'] else None)
+
+    if match['pre_l']:
+        pre = (PYTHON_PRE_RELEASES[match['pre_l'].lower()], int(match['pre_n'] or 0))
+    elif dev is not None and post is None:
+        # 1.0.dev0 предшествует 1.0a0.
+        pre = (-1, 0)
+    else:
+        pre = (3, 0)
+
+    local = tuple(
+        (1, int(part), '') if part.isdigit() else (0, 0, part.lower())
+        for part in re.split(r'[-_.]', match['local'] or '')
+        if part
+    )
+
+    return (
+        int(match['epoch'] or 0),
+        release,
+        pre,
+        -1 if post is None else int(post),
+        (1, 0) if dev is None else (0, int(dev)),
+        local,
+    )
+
+
+def parse_semver(value: str) -> VersionKey:
+    """
+    Функция разбора версии semver (пакеты npm и модули Go)
+
+    Метаданные сборки (+incompatible) не влияют на порядок, псевдоверсии Go
+    сравниваются как предварительные версии.
+
+    :param value: Версия, например v1.2.3-rc.1
+    :return: Ключ сравнения версий
+    """
+
+    match = SEMVER_PATTERN.match(value)
+    if match is None:
+        raise InvalidVersion(f'Некорректная версия semver: {value}')
+
+    if match['pre'] is None:
+        pre = (1,)
+    else:
+        pre = (0, *(
+            (0, int(part), '') if part.isdigit() else (1, 0, part)
+            for part in match['pre'].split('.')
+        ))
+
+    return int(match['major']), int(match['minor'] or 0), int(match['patch'] or 0), pre
+
+
+# Функции разбора версий по типу пакета, см. ProjectTypes.
+VERSION_PARSERS = {
+    'python': parse_python_version,
+    'golang': parse_semver,
+    'javascript': parse_semver,
+}
+
+
+def parse_version(package_type: str, value: str) -> VersionKey:
+    """
+    Функция разбора версии пакета с учетом экосистемы
+
+    Ключи сравнимы только между версиями пакетов одного типа.
+
+    :param package_type: Тип пакета, см. ProjectTypes
+    :param value: Версия
+    :return: Ключ сравнения версий
+    """
+
+    parser = VERSION_PARSERS.get(package_type)
+    if parser is None:
+        raise InvalidVersion(f'Неподдерживаемый тип пакета: {package_type}')
+
+    return parser(value)
+
+
+def normalize_package_name(package_type: str, name: str) -> str:
+    """
+    Функция приведения имени пакета к каноническому виду
+
+    :param package_type: Тип пакета, см. ProjectTypes
+    :param name: Имя пакета
+    :return: Имя Python пакета по PEP 503, остальные имена без изменений
+    """
+
+    if package_type == 'python':
+        return re.sub(r'[-_.]+', '-', name).lower()
+
+    return name
+
+
+class VersionMatch(NamedTuple):
+    """Уязвимость, диапазон которой содержит версию пакета"""
+
+    vulner: str
+    vendor: str
+    interval: str
+
+
+class PackageRanges(NamedTuple):
+    """
+    Диапазоны уязвимых версий одного пакета
+
+    Границы всех диапазонов делят версии на отрезки: points[i] - сама
+    граница (отрезок 2i + 1), между границами - открытые промежутки
+    (отрезки 2i). Для каждого отрезка заранее вычислены содержащие его
+    диапазоны, поиск - бинарный поиск по границам.
+    """
+
+    points: list[VersionKey]
+    slots: list[tuple[VersionMatch, ...]]
+
+
+class VersionRangeIndex:
+    """
+    Индекс диапазонов уязвимых версий по типу и имени пакета
+
+    Поиск уязвимостей версии пакета выполняется за O(log n + k), где
+    n - количество диапазонов пакета, k - количество найденных уязвимостей.
+    Индекс строится VersionRangeIndexBuilder, неизменяем после построения
+    и разделяется между запросами.
+    """
+
+    def __init__(self, packages: dict[tuple[str, str], PackageRanges], ranges: int, skipped: int):
+        """
+        :param packages: Диапазоны по типу и каноническому имени пакета
+        :param ranges: Количество диапазонов в индексе
+        :param skipped: Количество пропущенных диапазонов
+        """
+
+        self.packages = packages
+        self.ranges = ranges
+        self.skipped = skipped
+
+    def match(self, package_type: str, name: str, version: str, vendor: str | None = None) -> list[VersionMatch]:
+        """
+        Метод поиска уязвимостей версии пакета
+
+        :param package_type: Тип пакета, см. ProjectTypes
+        :param name: Имя пакета
+        :param version: Версия пакета
+        :param vendor: Имя вендора, None - любой вендор
+        :return: Уязвимости, диапазоны которых содержат версию
+        """
+
+        key = parse_version(package_type, version)
+
+        package = self.packages.get((package_type, normalize_package_name(package_type, name)))
+        if package is None:
+            return []
+
+        index = bisect.bisect_left(package.points, key)
+        if index < len(package.points) and package.points[index] == key:
+            matches = package.slots[2 * index + 1]
+        else:
+            matches = package.slots[2 * index]
+
+        if vendor is not None:
+            return [match for match in matches if match.vendor == vendor]
+
+        return list(matches)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Метод получения размеров индекса
+
+        :return: Количество пакетов, диапазонов и пропущенных диапазонов
+        """
+
+        return dict(packages=len(self.packages), ranges=self.ranges, skipped=self.skipped)
+
+
+class VersionRangeIndexBuilder:
+    """
+    Построитель индекса диапазонов уязвимых версий
+
+    Границы диапазонов разбираются при добавлении уязвимости, поэтому
+    данные уязвимостей не нужно хранить до построения индекса.
+    """
+
+    def __init__(self):
+        self.bounds: dict[tuple[str, str], list[tuple[VersionKey | None, bool, VersionKey | None, bool, VersionMatch]]] = {}
+        self.ranges = 0
+        # Диапазоны с неподдерживаемым типом пакета, некорректными границами или неизвестными условиями границ.
+        self.skipped = 0
+        self.unknown_conditions: list[tuple[str, str, str]] = []
+
+    def add(self, vulner_id: str, affects: Iterable[AffectedDTO]) -> None:
+        """
+        Метод добавления диапазонов уязвимых версий одной уязвимости
+
+        :param vulner_id: Глобальный идентификатор уязвимости
+        :param affects: Затронутые пакеты уязвимости
+        """
+
+        for affected in affects:
+            try:
+                start = self._parse_bound(affected.type, affected.start_value)
+                end = self._parse_bound(affected.type, affected.end_value)
+            except InvalidVersion:
+                self.skipped += 1
+                continue
+
+            # Условие неограниченной границы не важно, для остальных границ оно не угадывается.
+            start_inclusive, end_inclusive = interval_inclusion(affected)
+            if (start is not None and start_inclusive is None) or (end is not None and end_inclusive is None):
+                self.unknown_conditions.append((vulner_id, affected.start_condition, affected.end_condition))
+                self.skipped += 1
+                continue
+
+            match = VersionMatch(vulner_id, affected.vendor, count_vulnerable_interval(affected))
+            self.bounds.setdefault((affected.type, normalize_package_name(affected.type, affected.name)), []).append(
+                (start, bool(start_inclusive), end, bool(end_inclusive), match)
+            )
+            self.ranges += 1
+
+    def build(self) -> VersionRangeIndex:
+        """
+        Метод построения индекса по добавленным диапазонам
+
+        :return: Индекс диапазонов уязвимых версий
+        """
+
+        if self.unknown_conditions:
+            logger.warning(
+                'Skipped %d ranges with unknown bound conditions (vulner, start, end): %s',
+                len(self.unknown_conditions),
+                ', '.join(map(str, self.unknown_conditions[:10])),
+            )
+
+        packages = {key: self._build(package_bounds) for key, package_bounds in self.bounds.items()}
+        return VersionRangeIndex(packages, self.ranges, self.skipped)
+
+    @staticmethod
+    def _parse_bound(package_type: str, value: str | None) -> VersionKey | None:
+        if value is None or value.strip() in UNBOUNDED_VALUES:
+            if package_type not in VERSION_PARSERS:
+                raise InvalidVersion(f'Неподдерживаемый тип пакета: {package_type}')
+            return None
+
+        return parse_version(package_type, value)
+
+    @staticmethod
+    def _build(package_bounds: list[tuple[VersionKey | None, bool, VersionKey | None, bool, VersionMatch]]) -> PackageRanges:
+        points = sorted({bound for start, _, end, _, _ in package_bounds for bound in (start, end) if bound is not None})
+        positions = {point: index for index, point in enumerate(points)}
+        last_slot = 2 * len(points)
+
+        starts: dict[int, list[VersionMatch]] = {}
+        ends: dict[int, list[VersionMatch]] = {}
+        for start, start_inclusive, end, end_inclusive, match in package_bounds:
+            first = 0 if start is None else 2 * positions[start] + (1 if start_inclusive else 2)
+            last = last_slot if end is None else 2 * positions[end] + (1 if end_inclusive else 0)
+            # Пустой диапазон, например [2.0, 1.0).
+            if first > last:
+                continue
+
+            starts.setdefault(first, []).append(match)
+            ends.setdefault(last, []).append(match)
+
+        # Количество активных диапазонов каждой уязвимости в порядке появления.
+        active: dict[VersionMatch, int] = {}
+        slots = []
+        current: tuple[VersionMatch, ...] = ()
+        for slot in range(last_slot + 1):
+            if slot in starts:
+                for match in starts[slot]:
+                    active[match] = active.get(match, 0) + 1
+                current = tuple(active)
+
+            slots.append(current)
+
+            if slot in ends:
+                for match in ends[slot]:
+                    active[match] -= 1
+                    if not active[match]:
+                        del active[match]
+                current = tuple(active)
+
+        return PackageRanges(points, slots)
+
+
+class VersionIndexState:
+    """
+    Индекс диапазонов уязвимых версий воркера и состояние его построения
+
+    Индекс строится в фоне при запуске сервиса и периодически
+    перестраивается, запросы используют последний построенный индекс.
+    """
+
+    def __init__(self):
+        self.index: VersionRangeIndex | None = None
+        # Время построения индекса по time.monotonic().
+        self.built_at: float | None = None
+        # Уязвимости, которые не удалось загрузить для текущего индекса.
+        self.missing: list[str] = []
+        self.builds = 0
+        self.errors = 0
+        self.last_error: str | None = None
+
+    def age(self) -> float | None:
+        """
+        Метод получения возраста индекса
+
+        :return: Время в секундах с построения индекса, None - индекс еще не построен
+        """
+
+        return None if self.built_at is None else time.monotonic() - self.built_at
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Метод получения состояния индекса
+
+        :return: Размеры и возраст индекса, не загруженные уязвимости, количество построений и ошибок
+        """
+
+        return dict(
+            **(self.index.stats() if self.index is not None else {}),
+            age=self.age(),
+            missing=len(self.missing),
+            missing_vulners=self.missing[:VERSION_INDEX_MISSING_SHOWN],
+            builds=self.builds,
+            errors=self.errors,
+            last_error=self.last_error,
+        )
+
+
+version_index_state = VersionIndexState()
+
+
+async def refresh_version_index(interval: float, retry_interval: float) -> None:
+    """
+    Функция периодического построения индекса диапазонов уязвимых версий
+
+    После неудачного построения пауза перед повтором удваивается,
+    но не превышает интервала перестроения.
+
+    :param interval: Интервал перестроения индекса в секундах
+    :param retry_interval: Интервал повтора после первого неудачного построения в секундах
+    """
+
+    failures = 0
+    while True:
+        try:
+            await VersionsService().build_version_index()
+        except Exception as error:
+            version_index_state.errors += 1
+            version_index_state.last_error = repr(error)
+            delay = min(retry_interval * 2 ** failures, interval)
+            failures += 1
+            logger.warning('Building version index failed, retrying in %.0f s', delay, exc_info=True)
+            await asyncio.sleep(delay)
+            continue
+
+        failures = 0
+        await asyncio.sleep(interval)
+
+
+class VersionsService:
+
+    def __init__(self):
+        pass
+
+    async def fetch_vulner_ids(self) -> list[str]:
+        """
+        Метод загрузки идентификаторов всех уязвимостей базы постранично
+
+        :return: Глобальные идентификаторы уязвимостей без повторов
+        """
+
+        page_size = VersionIndexConfig.page_size
+        _, vulners_dto = await VulnersService().fetch_vulners_base_info(1, page_size)
+        vulner_ids = [vulner.global_identifier for vulner in vulners_dto.vulners]
+
+        for page in range(2, (vulners_dto.count + page_size - 1) // page_size + 1):
+            vulners_page = (await VulnersService().fetch_vulners_base_info(page, page_size))[1]
+            vulner_ids.extend(vulner.global_identifier for vulner in vulners_page.vulners)
+
+        return list(dict.fromkeys(vulner_ids))
+
+    async def load_affects(self, builder: VersionRangeIndexBuilder, vulner_ids: list[str]) -> list[str]:
+        """
+        Метод загрузки уязвимостей в построитель индекса
+
+        Уязвимости загружаются параллельно, минуя кэш уязвимостей, чтобы
+        не вытеснять из него записи страниц уязвимостей. Данные каждой
+        уязвимости сразу передаются построителю и не хранятся.
+
+        :param builder: Построитель индекса
+        :param vulner_ids: Идентификаторы уязвимостей
+        :return: Идентификаторы уязвимостей, которые не удалось загрузить
+        """
+
+        pending = iter(vulner_ids)
+        failed = []
+
+        async def worker() -> None:
+            for vulner_id in pending:
+                try:
+                    _, vulner_dto = await VulnersService().fetch_vulner_entry(vulner_id)
+                except Exception as error:
+                    logger.debug('Loading vulner %s failed: %r', vulner_id, error)
+                    failed.append(vulner_id)
+                    continue
+
+                builder.add(vulner_id, vulner_dto.affected or [])
+
+        await asyncio.gather(*(worker() for _ in range(min(VersionIndexConfig.max_concurrency, len(vulner_ids)))))
+
+        return failed
+
+    async def build_version_index(self) -> VersionRangeIndex:
+        """
+        Метод построения индекса по базе уязвимостей бэкенда
+
+        Уязвимости, которые не удалось загрузить, загружаются повторно
+        несколько раз. Если после этого их доля не больше max_missing_ratio,
+        индекс используется без них и они выводятся в состоянии индекса и
+        ответах сопоставления. Иначе построение считается неудачным, запросы
+        продолжают использовать предыдущий индекс. Индекс строится в пуле
+        потоков, чтобы не останавливать обработку запросов на время построения.
+
+        :return: Индекс диапазонов уязвимых версий
+        """
+
+        vulner_ids = await self.fetch_vulner_ids()
+        builder = VersionRangeIndexBuilder()
+
+        missing = await self.load_affects(builder, vulner_ids)
+        for attempt in range(1, VersionIndexConfig.load_attempts):
+            if not missing:
+                break
+            await asyncio.sleep(VersionIndexConfig.load_retry_delay * 2 ** (attempt - 1))
+            missing = await self.load_affects(builder, missing)
+
+        if len(missing) > len(vulner_ids) * VersionIndexConfig.max_missing_ratio:
+            raise IncompleteVersionIndex(f'Не удалось загрузить {len(missing)} из {len(vulner_ids)} уязвимостей')
+
+        index = await to_thread.run_sync(builder.build)
+
+        version_index_state.index = index
+        version_index_state.built_at = time.monotonic()
+        version_index_state.missing = sorted(missing)
+        version_index_state.builds += 1
+        if missing:
+            logger.warning(
+                'Version index built without %d vulners: %s',
+                len(missing),
+                ', '.join(version_index_state.missing[:VERSION_INDEX_MISSING_SHOWN]),
+            )
+        logger.info('Version index built: %s', index.stats())
+
+        return index
+
+    def get_version_index(self) -> VersionRangeIndex:
+        """
+        Метод получения индекса диапазонов уязвимых версий
+
+        Пока индекс строится после запуска или если он слишком давно
+        не перестраивался, запросы получают ответ 503.
+
+        :return: Индекс диапазонов уязвимых версий
+        """
+
+        age = version_index_state.age()
+        if age is None or age > VersionIndexConfig.max_age:
+            raise HTTPException(
+                status_code=503,
+                detail='Индекс версий пакетов еще строится, повторите запрос позже',
+                headers={'Retry-After': str(int(VersionIndexConfig.retry_interval))},
+            )
+
+        return version_index_state.index
+
+    async def match_packages(self, packages: list[PackageVersionDTO]) -> list[PackageMatchesDTO]:
+        """
+        Метод поиска уязвимостей версий пакетов, например всех пакетов lock-файла
+
+        Пакеты с некорректной версией или неподдерживаемым типом не прерывают
+        поиск, для них заполняется поле error. Поле index_missing содержит
+        количество уязвимостей, не вошедших в индекс.
+
+        :param packages: Пакеты и их версии
+        :return: Уязвимости каждого пакета в порядке запроса
+        """
+
+        index = self.get_version_index()
+        index_missing = len(version_index_state.missing)
+
+        results = []
+        for package in packages:
+            try:
+                matches = index.match(package.type, package.name, package.version, package.vendor)
+            except InvalidVersion as error:
+                results.append(PackageMatchesDTO(
+                    **package.model_dump(),
+                    matches=[],
+                    error=str(error),
+                    index_missing=index_missing,
+                ))
+                continue
+
+            results.append(PackageMatchesDTO(
+                **package.model_dump(),
+                matches=[VersionMatchDTO(**match._asdict()) for match in matches],
+                index_missing=index_missing,
+            ))
+
+        return results
@@ -1,23 +1,124 @@
 """Модуль сервиса работы с базой уязвимостей"""
 
-import requests
+import asyncio
+import logging
+from typing import Iterable
+from urllib.parse import urlencode
+
 from fastui import AnyComponent
 from fastui import components as c
 from fastui.events import GoToEvent
 from fastui.components.display import DisplayLookup
 
 from ui.base import gen_ui_link, base_page
-from services.config import BackendServiceConfig, FrontendServiceConfig
+from ui.tables import select_page, build_table
+from services.cache import LRUCache, StaleWhileRevalidateCache
+from services.client import backend_client
+from services.config import BackendServiceConfig, FrontendServiceConfig, CacheConfig
+from services.etag import payload_digest
+from services.timing import timed, timed_phase
 from services.utils import count_vulnerable_interval
 
 from schemas.models import (
     VulnersBasicsGetDTO,
+    AffectedGetDTO,
     TableAffectWithIntervalDTO,
     TableVulnerBasicDTO,
     TableRatingDTO,
     VulnerGetDTO,
 )
 
+logger = logging.getLogger(__name__)
+
+# Хэш ответа бэкенда и подробная информация об уязвимостях по глобальному идентификатору.
+vulners_cache = LRUCache(
+    'vulners',
+    max_entries=CacheConfig.vulners_max_entries,
+    ttl=CacheConfig.vulners_ttl,
+    max_bytes=CacheConfig.vulners_max_bytes,
+)
+
+# Хэш ответа бэкенда и страницы базы уязвимостей по номеру и размеру страницы.
+vulners_list_cache = StaleWhileRevalidateCache(
+    'vulners_list',
+    max_entries=CacheConfig.vulners_list_max_entries,
+    fresh_ttl=CacheConfig.vulners_list_fresh_ttl,
+    stale_ttl=CacheConfig.vulners_list_stale_ttl,
+    max_concurrency=CacheConfig.vulners_list_max_concurrency,
+)
+
+AFFECTED_PAGE_PARAM = 'affected_page'
+REFERENCES_PAGE_PARAM = 'references_page'
+
+
+def build_ratings(vulner_dto: VulnerGetDTO) -> list[AnyComponent]:
+    """
+    Функция построения таблиц оценок уязвимости
+
+    Оценки группируются по методу и версии, каждая оценка выводится один раз.
+
+    :param vulner_dto: Информация об уязвимости
+    :return: Компоненты таблиц оценок
+    """
+
+    rating_groups: dict[tuple[str, float], list[TableRatingDTO]] = {}
+    for rating_item in vulner_dto.ratings or []:
+        rating_groups.setdefault((rating_item.method, rating_item.version), []).append(
+            TableRatingDTO(
+                score=rating_item.score,
+                severity=rating_item.severity,
+                vector=rating_item.vector,
+                source_name=rating_item.source_name,
+                source_url=gen_ui_link(url=rating_item.source_url, text=rating_item.source_url),
+            )
+        )
+
+    ratings = []
+    for (method, version), rating_data in rating_groups.items():
+        ratings.extend(
+            [
+                c.Paragraph(text=f'Метод оценки: {method}'),
+                c.Paragraph(text=f'Версия метода: {version}'),
+                c.Table(
+                    data=rating_data,
+                    data_model=TableRatingDTO,
+                    columns=[
+                        DisplayLookup(field='score', table_width_percent=10, title='Оценка в баллах'),
+                        DisplayLookup(field='severity', table_width_percent=10, title='Уровень угрозы'),
+                        DisplayLookup(field='vector', table_width_percent=10, title='Метрики вектора'),
+                        DisplayLookup(field='source_name', table_width_percent=10, title='Источник информации'),
+                        DisplayLookup(field='source_url', table_width_percent=10, title='Ссылка на исходные данные'),
+                    ]
+                )
+            ]
+        )
+
+    return ratings
+
+
+def build_affected_table(affected: Iterable[AffectedGetDTO]) -> c.Table:
+    """
+    Функция построения таблицы уязвимого ПО с диапазонами версий
+
+    :param affected: Затронутые пакеты уязвимости
+    :return: Таблица FastUI
+    """
+
+    return build_table(
+        affected,
+        row_factory=lambda affect: TableAffectWithIntervalDTO(
+            interval=count_vulnerable_interval(affected=affect),
+            **dict(affect),
+        ),
+        data_model=TableAffectWithIntervalDTO,
+        columns=[
+            DisplayLookup(field='name', table_width_percent=10, title='Имя пакета'),
+            DisplayLookup(field='vendor', table_width_percent=10, title='Имя вендора'),
+            DisplayLookup(field='type', table_width_percent=10, title='Тип пакета'),
+            DisplayLookup(field='interval', table_width_percent=10, title='Диапазон уязвимых версий'),
+        ]
+    )
+
 
 class VulnersService:
 
@@ -25,25 +126,76 @@ class VulnersService:
     def __init__(self):
         pass
 
-    def get_vulners_base_info(self, page: int = 1, page_size: int = 10) -> VulnersBasicsGetDTO:
+    async def fetch_vulners_base_info(self, page: int = 1, page_size: int = 10) -> tuple[str, VulnersBasicsGetDTO]:
         """
-        Метод получения данных об уязвимостях в табличном виде
+        Метод загрузки данных об уязвимостях в табличном виде из бэкенда
 
         :param page: Номер страницы пагинации
         :param page_size: Количество записей на одной странице
-        :return: Данные записей об уязвимостях из бэкенда
+        :return: Хэш ответа бэкенда и данные записей об уязвимостях
         """
 
-        response_data = requests.get(
+        response = await backend_client.get(
             url=BackendServiceConfig.get_vulners_url(),
             params=dict(page=page, page_size=page_size),
-        ).json()
+        )
 
-        vulners_dto = VulnersBasicsGetDTO.model_validate(response_data)
+        with timed('decode'):
+            vulners_response = response.json()
+        with timed('validate'):
+            vulners_dto = VulnersBasicsGetDTO.model_validate(vulners_response)
 
-        return vulners_dto
+        return payload_digest(response.content), vulners_dto
 
-    def get_view_vulners(self, page: int = 1, page_size: int = 10) -> list[AnyComponent]:
+    async def get_vulners_page(self, page: int = 1, page_size: int = 10) -> tuple[str, VulnersBasicsGetDTO]:
+        """
+        Метод получения страницы данных об уязвимостях вместе с хэшем
+
+        Страница отдается из кэша, устаревшая страница обновляется в фоне.
+        Следующая страница загружается заранее.
+
+        :param page: Номер страницы пагинации
+        :param page_size: Количество записей на одной странице
+        :return: Хэш ответа бэкенда и данные записей об уязвимостях
+        """
+
+        digest, vulners_dto = await vulners_list_cache.get(
+            (page, page_size),
+            lambda: self.fetch_vulners_base_info(page, page_size),
+        )
+
+        if page * page_size < vulners_dto.count:
+            vulners_list_cache.prefetch(
+                (page + 1, page_size),
+                lambda: self.fetch_vulners_base_info(page + 1, page_size),
+            )
+
+        return digest, vulners_dto
+
+    async def get_vulners_base_info(self, page: int = 1, page_size: int = 10) -> VulnersBasicsGetDTO:
+        """
+        Метод получения данных об уязвимостях в табличном виде
+
+        :param page: Номер страницы пагинации
+        :param page_size: Количество записей на одной странице
+        :return: Данные записей об уязвимостях
+        """
+
+        return (await self.get_vulners_page(page, page_size))[1]
+
+    async def get_vulners_digest(self, page: int = 1, page_size: int = 10) -> str:
+        """
+        Метод получения хэша страницы базы уязвимостей для формирования ETag
+
+        :param page: Номер страницы пагинации
+        :param page_size: Количество записей на одной странице
+        :return: Хэш ответа бэкенда
+        """
+
+        return (await self.get_vulners_page(page, page_size))[0]
+
+    @timed_phase('build')
+    async def get_view_vulners(self, page: int = 1, page_size: int = 10) -> list[AnyComponent]:
         """
         Метод получения страницы со списком уязвимостей
 
@@ -52,7 +204,7 @@ class VulnersService:
         :return: Список компонентов для отрисовки в браузере
         """
 
-        vulners_dto = self.get_vulners_base_info(page, page_size)
+        vulners_dto = await self.get_vulners_base_info(page, page_size)
 
         vulners = [
             TableVulnerBasicDTO(
@@ -92,7 +244,37 @@ class VulnersService:
             title=f'Уязвимость: База знаний уязвимостей',
         )
 
-    def get_vulner_info(self, vulner_id: str) -> VulnerGetDTO:
+    async def get_vulner_entry(self, vulner_id: str) -> tuple[str, VulnerGetDTO]:
+        """
+        Метод получения данных об уязвимости вместе с хэшем
+
+        :param vulner_id: Идентификатор уязвимости
+        :return: Хэш ответа бэкенда и информация об уязвимости
+        """
+
+        entry = vulners_cache.get(vulner_id)
+
+        if entry is None:
+            entry = await self.fetch_vulner_entry(vulner_id)
+            vulners_cache.set(vulner_id, entry)
+
+        return entry
+
+    async def fetch_vulner_entry(self, vulner_id: str) -> tuple[str, VulnerGetDTO]:
+        """
+        Метод загрузки данных об уязвимости из бэкенда без кэширования
+
+        :param vulner_id: Идентификатор уязвимости
+        :return: Хэш ответа бэкенда и информация об уязвимости
+        """
+
+        response = await backend_client.get(url=BackendServiceConfig.get_vulner_url(vulner_id))
+        with timed('decode'):
+            vulner_response = response.json()
+        with timed('validate'):
+            return payload_digest(response.content), VulnerGetDTO.model_validate(vulner_response)
+
+    async def get_vulner_info(self, vulner_id: str) -> VulnerGetDTO:
         """
         Метод получения данных об уязвимости
 
@@ -100,68 +282,94 @@ class VulnersService:
         :return: Информация об уязвимости
         """
 
-        response = requests.get(url=BackendServiceConfig.get_vulner_url(vulner_id)).json()
+        return (await self.get_vulner_entry(vulner_id))[1]
 
-        vulner_dto = VulnerGetDTO.model_validate(response)
+    async def get_vulners_info(
+            self,
+            vulner_ids: Iterable[str],
+            max_concurrency: int = 10,
+    ) -> dict[str, VulnerGetDTO]:
+        """
+        Метод одновременного получения данных о нескольких уязвимостях
 
-        return vulner_dto
+        Повторяющиеся идентификаторы запрашиваются один раз, данные берутся
+        через общий кэш уязвимостей, одновременно выполняется не более
+        max_concurrency загрузок. Уязвимости, которые не удалось загрузить,
+        в результат не входят.
 
-    def get_view_vulner(self, item_id):
-        vulner_dto = self.get_vulner_info(item_id)
+        :param vulner_ids: Идентификаторы уязвимостей
+        :param max_concurrency: Максимальное количество одновременных загрузок
+        :return: Информация об уязвимостях в порядке первого упоминания
+        """
 
-        rating_data = [
-            TableRatingDTO(
-                score=rating_item.score,
-                severity=rating_item.severity,
-                vector=rating_item.vector,
-                source_name=rating_item.source_name,
-                source_url=gen_ui_link(url=rating_item.source_url, text=rating_item.source_url),
-            )
-            for rating_item in vulner_dto.ratings
-        ]
+        unique_ids = list(dict.fromkeys(vulner_ids))
+        semaphore = asyncio.Semaphore(max_concurrency)
 
-        ratings = []
-        for rating in vulner_dto.ratings:
-            ratings.extend(
-                [
-                    c.Paragraph(text=f'Метод оценки: {rating.method}'),
-                    c.Paragraph(text=f'Версия метода: {rating.version}'),
-                    c.Table(
-                        data=rating_data,
-                        data_model=TableRatingDTO,
-                        columns=[
-                            DisplayLookup(field='score', table_width_percent=10, title='Оценка в баллах'),
-                            DisplayLookup(field='severity', table_width_percent=10, title='Уровень угрозы'),
-                            DisplayLookup(field='vector', table_width_percent=10, title='Метрики вектора'),
-                            DisplayLookup(field='source_name', table_width_percent=10, title='Источник информации'),
-                            DisplayLookup(field='source_url', table_width_percent=10, title='Ссылка на исходные данные'),
-                        ]
-                    )
-                ]
-            )
+        async def load(vulner_id: str) -> VulnerGetDTO:
+            async with semaphore:
+                return await self.get_vulner_info(vulner_id)
 
-        affected = [
-            TableAffectWithIntervalDTO(
-                interval=count_vulnerable_interval(affected=affect),
-                **dict(affect),
-            )
-            for affect in vulner_dto.affected
-        ]
-        affects = [
-            c.Table(
-                data=affected,
-                data_model=TableAffectWithIntervalDTO,
-                columns=[
-                    DisplayLookup(field='name', table_width_percent=10, title='Имя пакета'),
-                    DisplayLookup(field='vendor', table_width_percent=10, title='Имя вендора'),
-                    DisplayLookup(field='type', table_width_percent=10, title='Тип пакета'),
-                    DisplayLookup(field='interval', table_width_percent=10, title='Диапазон уязвимых версий'),
-                ]
-            )
+        results = await asyncio.gather(*(load(vulner_id) for vulner_id in unique_ids), return_exceptions=True)
+
+        vulners = {}
+        for vulner_id, result in zip(unique_ids, results):
+            if isinstance(result, Exception):
+                logger.warning('Loading vulner %s failed', vulner_id, exc_info=result)
+            else:
+                vulners[vulner_id] = result
+
+        return vulners
+
+    async def get_vulner_digest(self, vulner_id: str) -> str:
+        """
+        Метод получения хэша данных об уязвимости для формирования ETag
+
+        :param vulner_id: Идентификатор уязвимости
+        :return: Хэш ответа бэкенда
+        """
+
+        return (await self.get_vulner_entry(vulner_id))[0]
+
+    @timed_phase('build')
+    async def get_view_vulner_affected(self, item_id: str, page: int = 1, page_size: int = 10) -> list[AnyComponent]:
+        """
+        Метод получения страницы уязвимого ПО
+
+        :param item_id: Идентификатор уязвимости
+        :param page: Номер страницы пагинации
+        :param page_size: Количество записей на одной странице
+        :return: Компоненты секции уязвимого ПО
+        """
+
+        vulner_dto = await self.get_vulner_info(item_id)
+        affected_page = select_page(vulner_dto.affected or [], page, page_size)
+
+        return [
+            build_affected_table(affected_page.rows),
+            c.Pagination(
+                page=page,
+                page_size=page_size,
+                total=affected_page.total,
+                page_query_param=AFFECTED_PAGE_PARAM,
+            ),
         ]
 
+    @timed_phase('build')
+    async def get_view_vulner_references(self, item_id: str, page: int = 1, page_size: int = 10) -> list[AnyComponent]:
+        """
+        Метод получения страницы дополнительных ресурсов
+
+        :param item_id: Идентификатор уязвимости
+        :param page: Номер страницы пагинации
+        :param page_size: Количество записей на одной странице
+        :return: Компоненты секции дополнительных ресурсов
+        """
+
+        vulner_dto = await self.get_vulner_info(item_id)
+        references_page = select_page(vulner_dto.references or [], page, page_size)
+
         references = []
-        for reference in vulner_dto.references:
+        for reference in references_page.rows:
             references.extend(
                 [
                     c.Text(text=f'{reference.source}: '),
@@ -175,6 +383,36 @@ class VulnersService:
                 ]
             )
 
+        return [
+            *references,
+            c.Pagination(
+                page=page,
+                page_size=page_size,
+                total=references_page.total,
+                page_query_param=REFERENCES_PAGE_PARAM,
+            ),
+        ]
+
+    @timed_phase('build')
+    async def get_view_vulner(self, item_id: str, affected_page: int = 1, references_page: int = 1, page_size: int = 10):
+        """
+        Метод получения страницы уязвимости
+
+        Уязвимое ПО и дополнительные ресурсы подгружаются
+        отдельными запросами через ServerLoad.
+
+        :param item_id: Идентификатор уязвимости
+        :param affected_page: Номер страницы уязвимого ПО
+        :param references_page: Номер страницы дополнительных ресурсов
+        :param page_size: Количество записей на одной странице секций
+        :return: Список компонентов для отрисовки в браузере
+        """
+
+        vulner_dto = await self.get_vulner_info(item_id)
+        ratings = build_ratings(vulner_dto)
+
+        section_params = dict(page_size=page_size)
+
         vulner_content = (
             c.Paragraph(text=f'Описание:'),
             c.Paragraph(text=vulner_dto.description),
@@ -191,9 +429,17 @@ class VulnersService:
             c.Heading(text=f'Рейтинг уязвимости', level=4),
             *ratings,
             c.Heading(text=f'Уязвимое ПО', level=4),
-            *affects,
+            c.ServerLoad(
+                path=f'{FrontendServiceConfig.get_vulner_affected(item_id)}?'
+                     f'{urlencode(dict(page=affected_page, **section_params))}',
+                components=[c.Spinner(text='Загрузка...')],
+            ),
             c.Heading(text=f'Дополнительные ресурсы', level=4),
-            *references,
+            c.ServerLoad(
+                path=f'{FrontendServiceConfig.get_vulner_references(item_id)}?'
+                     f'{urlencode(dict(page=references_page, **section_params))}',
+                components=[c.Spinner(text='Загрузка...')],
+            ),
         )
 
         return base_page(
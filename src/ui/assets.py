@@ -0,0 +1,210 @@
+"""Модуль локальной копии JS/CSS сборки FastUI"""
+
+import hashlib
+import mimetypes
+import os
+import sys
+
+import httpx
+
+from services.config import StaticConfig
+from ui.static import StaticContent
+
+
+# Файлы сборки FastUI, на которые ссылается HTML оболочка. Остальные файлы
+# (лениво загружаемые компоненты, шрифты) сборка загружает сама по
+# относительным адресам.
+FASTUI_ENTRY_FILES = ('index.js', 'index.css')
+
+# Каталог файлов сборки в npm пакете.
+FASTUI_PACKAGE_ASSETS_DIR = '/dist/assets/'
+
+# MIME типы файлов сборки, не угадываемые или угадываемые без кодировки модулем mimetypes.
+FASTUI_MEDIA_TYPES = {
+    '.js': 'text/javascript; charset=utf-8',
+    '.mjs': 'text/javascript; charset=utf-8',
+    '.css': 'text/css; charset=utf-8',
+    '.map': 'application/json',
+    '.woff2': 'font/woff2',
+}
+
+
+def asset_media_type(name: str) -> str:
+    """
+    Функция определения MIME типа файла сборки
+
+    :param name: Имя файла
+    :return: MIME тип
+    """
+
+    extension = os.path.splitext(name)[1].lower()
+    return FASTUI_MEDIA_TYPES.get(extension) or mimetypes.guess_type(name)[0] or 'application/octet-stream'
+
+
+def fastui_html(title: str, assets_url: str) -> str:
+    """
+    Функция формирования HTML оболочки React приложения FastUI
+
+    Повторяет fastui.prebuilt_html, но адрес сборки задается явно.
+
+    :param title: Заголовок страницы
+    :param assets_url: Адрес каталога файлов сборки
+    :return: HTML оболочка
+    """
+
+    # language=HTML
+    return f"""\
+<!doctype html>
+<html lang="en">
+  <head>
+    <meta charset="UTF-8" />
+    <meta name="viewport" content="width=device-width, initial-scale=1.0" />
+    <title>{title}</title>
+    <script type="module" crossorigin src="{assets_url}/index.js"></script>
+    <link rel="stylesheet" crossorigin href="{assets_url}/index.css">
+  </head>
+  <body>
+    <div id="root"></div>
+  </body>
+</html>
+"""
+
+
+def list_asset_files(directory: str) -> list[str]:
+    """
+    Функция получения списка файлов локальной копии сборки
+
+    :param directory: Каталог с файлами сборки
+    :return: Пути файлов относительно каталога через /
+    """
+
+    names = []
+    for root, _, files in os.walk(directory):
+        for file_name in files:
+            names.append(os.path.relpath(os.path.join(root, file_name), directory).replace(os.sep, '/'))
+
+    return sorted(names)
+
+
+class FastUIAssets:
+    """
+    Локальная копия сборки FastUI
+
+    Все файлы сборки отдаются из каталога с хэшем содержимого всей сборки,
+    например /static/fastui/3f2a9c1b7d4e/index.js, поэтому их можно кэшировать
+    навсегда. Имена файлов не меняются, чтобы лениво загружаемые части сборки
+    находились по относительным адресам.
+    """
+
+    def __init__(self, directory: str, url_prefix: str, cache_control: str):
+        """
+        :param directory: Каталог с файлами сборки
+        :param url_prefix: Префикс адресов файлов
+        :param cache_control: Значение заголовка Cache-Control для файлов
+        """
+
+        self.contents: dict[str, StaticContent] = {}
+
+        bundle_hash = hashlib.sha256()
+        for name in list_asset_files(directory):
+            with open(os.path.join(directory, name), 'rb') as file:
+                content = StaticContent(body=file.read(), media_type=asset_media_type(name), cache_control=cache_control)
+
+            self.contents[name] = content
+            bundle_hash.update(f'{name}\0{content.digest}\0'.encode())
+
+        self.digest = bundle_hash.hexdigest()[:12]
+        self.url = f'{url_prefix}/{self.digest}'
+
+    @classmethod
+    def load(cls) -> 'FastUIAssets | None':
+        """
+        Метод загрузки локальной копии сборки согласно настройкам
+
+        :return: Локальная копия сборки или None, если используется CDN
+        """
+
+        if StaticConfig.assets_mode == 'cdn':
+            return None
+
+        available = all(os.path.isfile(os.path.join(StaticConfig.assets_dir, name)) for name in FASTUI_ENTRY_FILES)
+        if not available:
+            if StaticConfig.assets_mode == 'local':
+                raise RuntimeError(
+                    f'Сборка FastUI не найдена в {StaticConfig.assets_dir}, выполните python -m ui.assets'
+                )
+            return None
+
+        return cls(
+            directory=StaticConfig.assets_dir,
+            url_prefix=StaticConfig.assets_url_prefix,
+            cache_control=StaticConfig.assets_cache_control,
+        )
+
+    def get(self, digest: str, name: str) -> StaticContent | None:
+        """
+        Метод получения файла сборки по адресу
+
+        :param digest: Хэш сборки из адреса файла
+        :param name: Путь файла в сборке
+        :return: Содержимое файла, None - файл не найден или сборка другая
+        """
+
+        if digest != self.digest:
+            return None
+
+        return self.contents.get(name)
+
+    def html(self, title: str) -> str:
+        """
+        Метод получения HTML оболочки, ссылающейся на локальную копию сборки
+
+        :param title: Заголовок страницы
+        :return: HTML оболочка React приложения
+        """
+
+        return fastui_html(title=title, assets_url=self.url)
+
+
+def vendor_fastui_assets(directory: str = StaticConfig.assets_dir) -> None:
+    """
+    Функция загрузки всех файлов сборки FastUI с CDN в локальный каталог
+
+    Список файлов берется из API jsDelivr, файлы предыдущей копии удаляются.
+
+    :param directory: Каталог для сохранения файлов сборки
+    """
+
+    with httpx.Client(timeout=60, follow_redirects=True) as client:
+        response = client.get(StaticConfig.assets_files_url)
+        response.raise_for_status()
+        names = [
+            item['name'].removeprefix(FASTUI_PACKAGE_ASSETS_DIR)
+            for item in response.json()['files']
+            if item['name'].startswith(FASTUI_PACKAGE_ASSETS_DIR)
+        ]
+
+        missing = set(FASTUI_ENTRY_FILES) - set(names)
+        if missing:
+            raise RuntimeError(f'В сборке FastUI {StaticConfig.assets_version} нет файлов {sorted(missing)}')
+
+        files = {}
+        for name in names:
+            response = client.get(f'{StaticConfig.assets_cdn_url}/{name}')
+            response.raise_for_status()
+            files[name] = response.content
+
+    if os.path.isdir(directory):
+        for name in list_asset_files(directory):
+            if name not in files:
+                os.remove(os.path.join(directory, name))
+
+    for name, body in files.items():
+        path = os.path.join(directory, *name.split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as file:
+            file.write(body)
+
+
+if __name__ == '__main__':
+    vendor_fastui_assets(sys.argv[1] if len(sys.argv) > 1 else StaticConfig.assets_dir)
@@ -56,10 +56,15 @@ def base_footer() -> c.Footer:
     )
 
 
+# Навигационная панель и подвал одинаковы для всех страниц и создаются один раз.
+NAVBAR = base_navbar()
+FOOTER = base_footer()
+
+
 def base_page(*components: AnyComponent, title: str | None = None) -> list[AnyComponent]:
     return [
         c.PageTitle(text=f'DPSS UI — {title}' if title else 'DPSS UI'),
-        base_navbar(),
+        NAVBAR,
         c.Page(
             components=[
                 *((c.Heading(text=title),) if title else (c.Heading(text='DPSS UI'),)),
@@ -69,7 +74,7 @@ def base_page(*components: AnyComponent, title: str | None = None) -> list[AnyCo
                 *components,
             ],
         ),
-        base_footer(),
+        FOOTER,
     ]
 
 def gen_ui_link(url: str, text: str | int | None = None) -> c.Link:
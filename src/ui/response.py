@@ -0,0 +1,47 @@
+"""Модуль быстрой сериализации ответов FastUI"""
+
+from typing import Sequence
+
+from fastapi import Response
+from fastui import AnyComponent
+from pydantic_core import to_json
+
+from services.timing import timed
+from ui.base import NAVBAR, FOOTER
+
+
+def dump_component(component: AnyComponent) -> bytes:
+    """
+    Функция сериализации компонента FastUI в JSON
+
+    pydantic-core сериализует модель сразу в байты, без промежуточного
+    словаря model_dump.
+
+    :param component: Компонент FastUI
+    :return: JSON представление компонента
+    """
+
+    return to_json(component, by_alias=True, exclude_none=True)
+
+
+# Неизменяемые элементы страницы сериализуются один раз при импорте.
+PRERENDERED: dict[int, bytes] = {id(component): dump_component(component) for component in (NAVBAR, FOOTER)}
+
+
+class FastUIResponse(Response):
+    """
+    Ответ со списком компонентов FastUI
+
+    Компоненты уже построены и провалидированы при создании, поэтому
+    повторная валидация через response_model=FastUI не выполняется.
+    Навигационная панель и подвал вставляются готовыми байтами.
+    """
+
+    media_type = 'application/json'
+
+    def render(self, content: Sequence[AnyComponent]) -> bytes:
+        with timed('render'):
+            return b'[' + b','.join(
+                PRERENDERED.get(id(component)) or dump_component(component)
+                for component in content
+            ) + b']'
@@ -0,0 +1,108 @@
+"""Модуль отдачи неизменяемого содержимого с предварительным сжатием"""
+
+import gzip
+import hashlib
+
+import brotli
+from fastapi import Request, Response
+
+from services.etag import etag_matches
+
+
+class StaticContent:
+    """
+    Неизменяемое содержимое, подготовленное к отдаче один раз
+
+    Хранит сжатые варианты br и gzip и сильный ETag для каждого варианта,
+    отвечает 304 на If-None-Match.
+    """
+
+    def __init__(self, body: bytes, media_type: str, cache_control: str):
+        """
+        :param body: Содержимое
+        :param media_type: MIME тип содержимого
+        :param cache_control: Значение заголовка Cache-Control
+        """
+
+        self.media_type = media_type
+        self.cache_control = cache_control
+        self.digest = hashlib.sha256(body).hexdigest()
+
+        self.variants: dict[str, bytes] = {'identity': body}
+        compressed = {
+            'br': brotli.compress(body, quality=11),
+            'gzip': gzip.compress(body, compresslevel=9, mtime=0),
+        }
+
+        # Сжатый вариант хранится, только если он меньше исходного.
+        for encoding, content in compressed.items():
+            if len(content) < len(body):
+                self.variants[encoding] = content
+
+        self.etags = {
+            encoding: f'"{self.digest[:32]}"' if encoding == 'identity' else f'"{self.digest[:32]}-{encoding}"'
+            for encoding in self.variants
+        }
+
+    def select_encoding(self, accept_encoding: str) -> str:
+        """
+        Метод выбора варианта содержимого по заголовку Accept-Encoding
+
+        :param accept_encoding: Значение заголовка Accept-Encoding
+        :return: Кодировка выбранного варианта
+        """
+
+        accepted = set()
+        for item in accept_encoding.split(','):
+            coding, *params = item.split(';')
+            quality = 1.0
+            for param in params:
+                name, _, value = param.strip().partition('=')
+                if name == 'q':
+                    try:
+                        quality = float(value)
+                    except ValueError:
+                        quality = 0.0
+            if quality > 0:
+                accepted.add(coding.strip().lower())
+
+        for encoding in ('br', 'gzip'):
+            if encoding in self.variants and (encoding in accepted or '*' in accepted):
+                return encoding
+
+        return 'identity'
+
+    def is_not_modified(self, if_none_match: str) -> bool:
+        """
+        Метод проверки заголовка If-None-Match
+
+        :param if_none_match: Значение заголовка If-None-Match
+        :return: Клиент уже имеет актуальное содержимое
+        """
+
+        # Любой вариант содержит одинаковые данные.
+        return etag_matches(if_none_match, set(self.etags.values()))
+
+    def response(self, request: Request) -> Response:
+        """
+        Метод формирования ответа на запрос содержимого
+
+        :param request: Запрос клиента
+        :return: Ответ с подходящим вариантом содержимого или 304
+        """
+
+        encoding = self.select_encoding(request.headers.get('accept-encoding', ''))
+        headers = {
+            'ETag': self.etags[encoding],
+            'Cache-Control': self.cache_control,
+            'Vary': 'Accept-Encoding',
+        }
+
+        if_none_match = request.headers.get('if-none-match')
+        if if_none_match and self.is_not_modified(if_none_match):
+            return Response(status_code=304, headers=headers)
+
+        if encoding != 'identity':
+            headers['Content-Encoding'] = encoding
+
+        return Response(content=self.variants[encoding], media_type=self.media_type, headers=headers)
@@ -0,0 +1,83 @@
+"""Модуль постраничного построения таблиц"""
+
+import heapq
+from typing import Any, Callable, Iterable, NamedTuple, Sequence
+
+from fastui import components as c
+from fastui.components.display import DisplayLookup
+from pydantic import BaseModel
+
+
+class TablePage(NamedTuple):
+    """Записи одной страницы таблицы и общее количество записей"""
+
+    rows: list[Any]
+    total: int
+
+
+def select_page(
+        items: Sequence[Any],
+        page: int = 1,
+        page_size: int = 10,
+        key: Callable[[Any], Any] | None = None,
+        reverse: bool = False,
+        predicate: Callable[[Any], bool] | None = None,
+) -> TablePage:
+    """
+    Функция выбора записей страницы
+
+    Фильтрация и сортировка выполняются по исходным записям, без построения
+    строк таблицы. Для первых страниц вместо полной сортировки выбираются
+    только page * page_size наименьших (наибольших) записей через heapq.
+
+    :param items: Исходные записи
+    :param page: Номер страницы пагинации
+    :param page_size: Количество записей на одной странице
+    :param key: Ключ сортировки, None - записи уже упорядочены
+    :param reverse: Обратный порядок сортировки
+    :param predicate: Условие отбора записей, None - без фильтрации
+    :return: Записи страницы и общее количество записей после фильтрации
+    """
+
+    if predicate is not None:
+        items = [item for item in items if predicate(item)]
+
+    start = (page - 1) * page_size
+    stop = page * page_size
+
+    if key is None or start >= len(items):
+        return TablePage(rows=list(items[start:stop]), total=len(items))
+
+    # Порядок совпадает с sorted(...)[:stop], в том числе для равных ключей.
+    if stop * 4 <= len(items):
+        top = heapq.nlargest(stop, items, key=key) if reverse else heapq.nsmallest(stop, items, key=key)
+    else:
+        top = sorted(items, key=key, reverse=reverse)
+
+    return TablePage(rows=top[start:stop], total=len(items))
+
+
+def build_table(
+        rows: Iterable[Any],
+        row_factory: Callable[[Any], BaseModel],
+        data_model: type[BaseModel],
+        columns: list[DisplayLookup],
+) -> c.Table:
+    """
+    Функция построения таблицы из записей страницы
+
+    Строки таблицы (pydantic модели и ссылки) создаются только
+    для переданных записей.
+
+    :param rows: Записи страницы
+    :param row_factory: Функция построения строки таблицы из записи
+    :param data_model: Модель строки таблицы
+    :param columns: Колонки таблицы
+    :return: Таблица FastUI
+    """
+
+    return c.Table(
+        data=[row_factory(row) for row in rows],
+        data_model=data_model,
+        columns=columns,
+    )
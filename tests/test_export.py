@@ -0,0 +1,51 @@
+"""Тесты потоковой выгрузки отчетов"""
+
+import asyncio
+import json
+import unittest
+
+from services.export import ExportRecord, export_vex
+
+
+async def iter_records(records: list[ExportRecord]):
+    for record in records:
+        yield record
+
+
+def collect_vex(records: list[ExportRecord]) -> dict:
+    async def collect() -> str:
+        return ''.join([chunk async for chunk in export_vex(iter_records(records), report_id=1)])
+
+    return json.loads(asyncio.run(collect()))
+
+
+class ExportVexTest(unittest.TestCase):
+
+    def test_bom_refs_unique_for_repeated_package_vulner(self):
+        project = dict(id=7, name='backend', type='python')
+        vulner = dict(global_identifier='BDU:2024-00001', ratings=[])
+        records = [
+            (project, dict(
+                affected=dict(
+                    name='requests', vendor=None, type='python',
+                    start_condition='gte', start_value=start, end_condition='lt', end_value=end,
+                ),
+                vulner=vulner,
+            ))
+            for start, end in (('1.0', '1.5'), ('2.0', '2.3'))
+        ]
+
+        document = collect_vex(records)
+
+        refs = [document['metadata']['component']['bom-ref']]
+        refs += [vulnerability['bom-ref'] for vulnerability in document['vulnerabilities']]
+        refs += [component['bom-ref'] for component in document['components']]
+        self.assertEqual(len(refs), len(set(refs)))
+
+        ranges = [vulnerability['affects'][0]['versions'][0]['range'] for vulnerability in document['vulnerabilities']]
+        self.assertEqual(ranges, ['vers:pypi/>=1.0|<1.5', 'vers:pypi/>=2.0|<2.3'])
+        self.assertEqual([component['purl'] for component in document['components']], ['pkg:pypi/requests'])
+
+
+if __name__ == '__main__':
+    unittest.main()